@@ -2,15 +2,19 @@
 Main file for API.
 """
 # Standard Library Imports
+from contextlib import asynccontextmanager
 from sys import platform
-from typing import Callable
+from typing import AsyncIterator, Callable
 
 # Third Party Imports
 from fastapi import APIRouter, FastAPI
 from fastapi.security import OAuth2PasswordBearer
 
 # Local Imports
+from .db import Database
+from .db.invalidation import INVALIDATION_BUS
 from .routes import *
+from .routes.admin_router import HANDSHAKE_KEYS
 
 # Constants
 __all__ = [
@@ -25,6 +29,28 @@ if platform == "win32":
     set_event_loop_policy(WindowsSelectorEventLoopPolicy())
 
 
+@asynccontextmanager
+async def lifespan(
+        api: FastAPI
+) -> AsyncIterator[None]:
+    """
+    Open process-wide resources on startup and release them on shutdown.
+    """
+    # Open the shared connection pool and start listening for changes made by other processes
+    await Database.open_pool()
+    await INVALIDATION_BUS.start()
+
+    # Encrypt admin handshake tokens in the background
+    await HANDSHAKE_KEYS.start()
+
+    yield
+
+    # Stop listening and close the shared connection pool
+    await HANDSHAKE_KEYS.stop()
+    await INVALIDATION_BUS.stop()
+    await Database.close_pool()
+
+
 def create_app(
         extensions: list[APIRouter] = None,
         middleware: list[Callable] = None
@@ -33,7 +59,7 @@ def create_app(
     Create FastAPI instance.
     """
     # Create FastAPI instance
-    api: FastAPI = FastAPI()
+    api: FastAPI = FastAPI(lifespan=lifespan)
 
     # Register routes
     api.include_router(api_router)
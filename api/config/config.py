@@ -87,7 +87,9 @@ class Config:
         "db",
         "auth",
         "user_security",
-        "server"
+        "server",
+        "cache",
+        "websocket"
     ]
 
     def __init__(
@@ -100,6 +102,8 @@ class Config:
         self.auth = CfAuth(settings)
         self.user_security = CfUserSecurity(settings)
         self.server = CfServer(settings)
+        self.cache = CfCache(settings)
+        self.websocket = CfWebsocket(settings)
 
 
 # Create the config object
@@ -8,9 +8,11 @@ Initializes the models package
 
 # Local Imports
 from .auth import CfAuth
+from .cache import CfCache
 from .database import CfDatabase
 from .user_security import CfUserSecurity
 from .server import CfServer
+from .websocket import CfWebsocket
 
 # Constants
 __all__ = [
@@ -18,4 +20,6 @@ __all__ = [
     "CfUserSecurity",
     "CfAuth",
     "CfServer",
+    "CfCache",
+    "CfWebsocket",
 ]
@@ -23,6 +23,8 @@ class CfAuth:
         "secret_key",
         "key_expires",
         "key_size",
+        "handshake_pool_size",
+        "ticket_ttl",
     ]
 
     def __init__(
@@ -35,3 +37,5 @@ class CfAuth:
         self.secret_key = settings.auth.secret_key
         self.key_expires = settings.auth.key_expires
         self.key_size = settings.auth.key_size
+        self.handshake_pool_size = settings.auth.handshake_pool_size
+        self.ticket_ttl = settings.auth.ticket_ttl
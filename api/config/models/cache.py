@@ -0,0 +1,43 @@
+"""
+Initializes the cache module.
+"""
+
+# Standard Library Imports
+
+# Third Party Imports
+from dynaconf import Dynaconf
+
+# Local Imports
+
+# Constants
+__all__ = [
+    "CfCache"
+]
+
+
+class CfCache:
+    """
+    In-process cache configuration.
+    """
+    __slots__ = [
+        "profile_max_size",
+        "profile_ttl",
+        "bloom_capacity",
+        "bloom_error_rate",
+        "negative_max_size",
+        "negative_ttl",
+    ]
+
+    def __init__(
+            self,
+            settings: Dynaconf
+    ) -> None:
+        """
+        Initialises the Cache object.
+        """
+        self.profile_max_size: int = settings.cache.profile_max_size
+        self.profile_ttl: float = settings.cache.profile_ttl
+        self.bloom_capacity: int = settings.cache.bloom_capacity
+        self.bloom_error_rate: float = settings.cache.bloom_error_rate
+        self.negative_max_size: int = settings.cache.negative_max_size
+        self.negative_ttl: float = settings.cache.negative_ttl
@@ -24,7 +24,13 @@ class CfDatabase:
         "user",
         "password",
         "host",
-        "port"
+        "port",
+        "pool_min_size",
+        "pool_max_size",
+        "pool_timeout",
+        "pool_max_waiting",
+        "pool_max_idle",
+        "pool_max_lifetime",
     ]
 
     def __init__(
@@ -36,3 +42,11 @@ class CfDatabase:
         self.host = settings.database.host
         self.port = settings.database.port
         self.password = settings.database.password
+
+        # Connection pool settings
+        self.pool_min_size: int = settings.database.pool_min_size
+        self.pool_max_size: int = settings.database.pool_max_size
+        self.pool_timeout: float = settings.database.pool_timeout
+        self.pool_max_waiting: int = settings.database.pool_max_waiting
+        self.pool_max_idle: float = settings.database.pool_max_idle
+        self.pool_max_lifetime: float = settings.database.pool_max_lifetime
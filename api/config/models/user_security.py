@@ -26,6 +26,8 @@ class CfUserSecurity:
         "password_require_lowercase",
         "password_require_number",
         "password_require_special_character",
+        "hash_workers",
+        "hash_max_queue",
     ]
 
     def __init__(
@@ -38,3 +40,7 @@ class CfUserSecurity:
         self.password_require_lowercase: int = settings.user_security.password_require_lowercase
         self.password_require_number: int = settings.user_security.password_require_number
         self.password_require_special_character: int = settings.user_security.password_require_special_character
+
+        # Password hasher pool
+        self.hash_workers: int = settings.user_security.hash_workers
+        self.hash_max_queue: int = settings.user_security.hash_max_queue
@@ -0,0 +1,41 @@
+"""
+Initializes the websocket module.
+"""
+
+# Standard Library Imports
+
+# Third Party Imports
+from dynaconf import Dynaconf
+
+# Local Imports
+
+# Constants
+__all__ = [
+    "CfWebsocket"
+]
+
+
+class CfWebsocket:
+    """
+    WebSocket worker configuration.
+    """
+    __slots__ = [
+        "max_in_flight",
+        "send_queue_max_messages",
+        "send_queue_max_bytes",
+        "send_batch_max",
+        "max_frame_size",
+    ]
+
+    def __init__(
+            self,
+            settings: Dynaconf
+    ) -> None:
+        """
+        Initialises the Websocket object.
+        """
+        self.max_in_flight: int = settings.websocket.max_in_flight
+        self.send_queue_max_messages: int = settings.websocket.send_queue_max_messages
+        self.send_queue_max_bytes: int = settings.websocket.send_queue_max_bytes
+        self.send_batch_max: int = settings.websocket.send_batch_max
+        self.max_frame_size: dict[str, int] = dict(settings.websocket.max_frame_size)
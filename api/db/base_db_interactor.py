@@ -18,7 +18,17 @@ __all__ = [
 class BaseDbInteractor:
     """
     Base database interaction class. Implements the connection and handlers properties.
+
+    Listings build one interactor per row, so subclasses declare `__slots__` and keep no per-instance `__dict__`. Handlers are
+    built on first access and kept, so repeated `.users` / `.secure` / `.files` accesses on one object share a handler.
     """
+    __slots__ = [
+        "connection",
+        "_users",
+        "_secure",
+        "_files",
+    ]
+
     connection: AsyncConnection
 
     def __init__(
@@ -33,32 +43,58 @@ class BaseDbInteractor:
         """
         self.connection = connection
 
+    def _fields(self) -> dict[str, any]:
+        """
+        Get the public slot values set on this object, for display.
+
+        Returns:
+            dict[str, any]: Field values by name.
+        """
+        return {
+            name: getattr(self, name)
+            for cls in reversed(type(self).__mro__)
+            for name in getattr(cls, "__slots__", ())
+            if not name.startswith("_") and hasattr(self, name)
+        }
+
     def __repr__(self) -> str:
-        return f"<{self.__class__.__name__} {self.__dict__}>"
+        return f"<{self.__class__.__name__} {self._fields()}>"
 
     def __str__(self) -> str:
-        return f"<{self.__class__.__name__} {self.__dict__}>"
+        return f"<{self.__class__.__name__} {self._fields()}>"
 
     @property
     def users(self):  # This is a great example of how to use a property to create a handler. (I think)
         """
         Get users handler.
         """
-        from .handlers.user_handler import UsersHandler
-        return UsersHandler(self.connection)
+        try:
+            return self._users
+        except AttributeError:
+            from .handlers.user_handler import UsersHandler
+            self._users = UsersHandler(self.connection)
+            return self._users
 
     @property
     def secure(self):
         """
         Get secure handler.
         """
-        from .handlers.secure_handler import SecureHandler
-        return SecureHandler(self.connection)
+        try:
+            return self._secure
+        except AttributeError:
+            from .handlers.secure_handler import SecureHandler
+            self._secure = SecureHandler(self.connection)
+            return self._secure
 
     @property
     def files(self):
         """
         Get files handler.
         """
-        from .handlers.file_handler import FilesHandler
-        return FilesHandler(self.connection)
+        try:
+            return self._files
+        except AttributeError:
+            from .handlers.file_handler import FilesHandler
+            self._files = FilesHandler(self.connection)
+            return self._files
@@ -0,0 +1,244 @@
+"""
+Contains the in-process caches used by the database layer.
+"""
+
+# Standard Library Imports
+from collections import OrderedDict
+from time import monotonic
+from typing import Generic, Hashable, TypeVar
+from uuid import UUID
+
+# Third Party Imports
+from pydantic import BaseModel
+
+# Local Imports
+from ..config.config import CONFIG
+from ..models.user import User as PublicUser
+
+# Constants
+__all__ = [
+    "LruTtlCache",
+    "FragmentCache",
+    "PROFILE_CACHE",
+    "PROFILE_JSON_CACHE",
+]
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LruTtlCache(Generic[K, V]):
+    """
+    Bounded cache that evicts the least recently used entry when full and expires entries after a fixed time to live.
+    """
+    __slots__ = [
+        "_entries",
+        "_max_size",
+        "_ttl",
+        "generation",
+        "hits",
+        "misses",
+        "evictions",
+        "expirations",
+        "invalidations",
+    ]
+
+    def __init__(
+            self,
+            max_size: int,
+            ttl: float
+    ) -> None:
+        """
+        Initialise the cache.
+
+        Args:
+            max_size (int): Maximum number of entries.
+            ttl (float): Seconds an entry stays valid for.
+        """
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._max_size: int = max_size
+        self._ttl: float = ttl
+
+        # Bumped on every invalidation. A read that started before an invalidation must not store its (possibly stale) result
+        self.generation: int = 0
+
+        # Metrics
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.expirations: int = 0
+        self.invalidations: int = 0
+
+    def get(
+            self,
+            key: K
+    ) -> V | None:
+        """
+        Get an entry.
+
+        Args:
+            key (K): Key.
+
+        Returns:
+            V | None: Value, or None if it is missing or expired.
+        """
+        entry: tuple[float, V] | None = self._entries.get(key)
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        if entry[0] < monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(
+            self,
+            key: K,
+            value: V,
+            generation: int
+    ) -> None:
+        """
+        Store an entry, unless something was invalidated since the value was read.
+
+        Args:
+            key (K): Key.
+            value (V): Value.
+            generation (int): The cache's `generation` from before the value was read.
+        """
+        if generation != self.generation or self._max_size <= 0:
+            return
+
+        self._entries[key] = (monotonic() + self._ttl, value)
+        self._entries.move_to_end(key)
+
+        # Evict the least recently used entries
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(
+            self,
+            key: K
+    ) -> None:
+        """
+        Drop an entry.
+
+        Args:
+            key (K): Key.
+        """
+        self.generation += 1
+        self.invalidations += 1
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Drop every entry.
+        """
+        self.generation += 1
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        """
+        Get cache statistics.
+
+        Returns:
+            dict[str, int]: Statistics.
+        """
+        return {
+            "size": len(self._entries),
+            "max_size": self._max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+
+class FragmentCache:
+    """
+    Ready-to-send UTF-8 JSON of models, so that a model read by many sockets is serialized once rather than once per send.
+
+    Entries are keyed by (model ID, visibility) and remember the model instance they were serialized from. A different instance
+    means the data changed (every write drops the cached model, so the next read builds a new one), and is serialized again.
+    The model instance therefore acts as the version, and a fragment can never be served for newer data than it holds.
+    """
+    __slots__ = [
+        "_entries",
+        "serializations",
+    ]
+
+    def __init__(
+            self,
+            max_size: int,
+            ttl: float
+    ) -> None:
+        """
+        Initialise the cache.
+
+        Args:
+            max_size (int): Maximum number of entries.
+            ttl (float): Seconds an entry stays valid for.
+        """
+        self._entries: LruTtlCache[tuple[UUID, str], tuple[BaseModel, bytes]] = LruTtlCache(max_size, ttl)
+
+        # Metrics
+        self.serializations: int = 0
+
+    def fragment(
+            self,
+            model: BaseModel,
+            visibility: str = "public"
+    ) -> bytes:
+        """
+        Get the JSON of a model, serializing it only if this instance has not been serialized before.
+
+        Args:
+            model (BaseModel): Model with an `id` field.
+            visibility (str): Which view of the model this is, so views with different fields do not collide.
+
+        Returns:
+            bytes: UTF-8 JSON.
+        """
+        key: tuple[UUID, str] = (model.id, visibility)
+
+        entry: tuple[BaseModel, bytes] | None = self._entries.get(key)
+        if entry is not None and entry[0] is model:
+            return entry[1]
+
+        fragment: bytes = model.model_dump_json().encode()
+        self.serializations += 1
+        self._entries.set(key, (model, fragment), self._entries.generation)
+
+        return fragment
+
+    def stats(self) -> dict[str, int]:
+        """
+        Get cache statistics.
+
+        Returns:
+            dict[str, int]: Statistics.
+        """
+        return {
+            **self._entries.stats(),
+            "serializations": self.serializations,
+        }
+
+
+# Public user profiles keyed by user ID
+PROFILE_CACHE: LruTtlCache[UUID, PublicUser] = LruTtlCache(
+    CONFIG.cache.profile_max_size,
+    CONFIG.cache.profile_ttl
+)
+
+# Serialized public user profiles, tied to the models in PROFILE_CACHE
+PROFILE_JSON_CACHE: FragmentCache = FragmentCache(
+    CONFIG.cache.profile_max_size,
+    CONFIG.cache.profile_ttl
+)
@@ -3,69 +3,197 @@ Contains database connection information and shared handlers.
 """
 
 # Standard Library Imports
+from contextlib import asynccontextmanager
+from contextvars import ContextVar, Token
+from typing import AsyncIterator
 
 # Third Party Imports
 from psycopg import AsyncConnection
 from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
 
 # Local Imports
 from .handlers import *
+from .handlers.file_handler import FilesHandler
 from .handlers.secure_handler import SecureHandler
 from ..config.config import CONFIG
 
 # Constants
 __all__ = [
     "Database",
+    "connection_kwargs",
 ]
 
+# Connection leased by the current task. Each asyncio task gets its own copy of this, so concurrent leases never share a connection.
+_leased_connection: ContextVar[AsyncConnection | None] = ContextVar("leased_connection", default=None)
+
+
+def connection_kwargs() -> dict[str, any]:
+    """
+    Get the arguments used to open a connection to the configured database.
+
+    Returns:
+        dict[str, any]: Connection arguments.
+    """
+    return {
+        "host": CONFIG.db.host,
+        "port": CONFIG.db.port,
+        "user": CONFIG.db.user,
+        "password": CONFIG.db.password,
+        "dbname": CONFIG.db.name,
+        "row_factory": dict_row,
+        "autocommit": True,
+    }
+
 
 class Database:
     """
     Database connection group.
-    """
-    # Connection
-    _connection: AsyncConnection
 
-    # Handlers
-    users: UsersHandler
-    secure: SecureHandler
+    Connections are drawn from a process-wide pool and are only held while a lease is open, so an idle socket does not hold a
+    server connection.
+    """
+    # Process-wide connection pool
+    _pool: AsyncConnectionPool | None = None
 
     @classmethod
     async def new(
             cls
     ) -> "Database":
-        self = cls()
-
-        try:
-            # Get connection for this instance
-            self._connection = await AsyncConnection.connect(
-                host=CONFIG.db.host,
-                port=CONFIG.db.port,
-                user=CONFIG.db.user,
-                password=CONFIG.db.password,
-                dbname=CONFIG.db.name,
-                row_factory=dict_row
+        """
+        Dependency that provides a database handle. The handle holds no connection until `lease` is entered.
+
+        Returns:
+            Database: Database handle.
+        """
+        # Make sure the pool exists even when the app was started without its lifespan (e.g. a bare TestClient)
+        await cls.open_pool()
+
+        return cls()
+
+    @classmethod
+    async def open_pool(cls) -> AsyncConnectionPool:
+        """
+        Open the shared connection pool if it is not already open.
+
+        Returns:
+            AsyncConnectionPool: Shared connection pool.
+        """
+        if cls._pool is None:
+            cls._pool = AsyncConnectionPool(
+                kwargs=connection_kwargs(),
+                min_size=CONFIG.db.pool_min_size,
+                max_size=CONFIG.db.pool_max_size,
+                timeout=CONFIG.db.pool_timeout,
+                max_waiting=CONFIG.db.pool_max_waiting,
+                max_idle=CONFIG.db.pool_max_idle,
+                max_lifetime=CONFIG.db.pool_max_lifetime,
+                check=AsyncConnectionPool.check_connection,  # Health check every connection before it is handed out
+                name="echo",
+                open=False
             )
-            await self._connection.set_autocommit(True)
-            assert type(self._connection) is AsyncConnection
+            await cls._pool.open()
+
+        return cls._pool
+
+    @classmethod
+    async def close_pool(cls) -> None:
+        """
+        Close the shared connection pool.
+        """
+        if cls._pool is not None:
+            await cls._pool.close()
+            cls._pool = None
 
-            # Connect handlers
-            self.users = UsersHandler(self._connection)
-            self.secure = SecureHandler(self._connection)
+    @classmethod
+    def stats(cls) -> dict[str, int]:
+        """
+        Get the statistics of the shared connection pool.
 
-            # Add handlers to list
-            self.handlers = [
-                self.users,
-                self.secure
-            ]
+        Returns:
+            dict[str, int]: Pool statistics. Empty if the pool is not open.
+        """
+        if cls._pool is None:
+            return {}
 
+        return cls._pool.get_stats()
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator["Database"]:
+        """
+        Lease a connection from the pool for the duration of the context. Nested leases reuse the outer connection.
+
+        Raises:
+            PoolTimeout: No connection became available within the configured timeout.
+
+        Yields:
+            Database: This database handle, bound to the leased connection.
+        """
+        # Reuse the connection if this task already holds one
+        if _leased_connection.get() is not None:
             yield self
-        finally:
-            await self.close()
+            return
+
+        pool: AsyncConnectionPool = await self.open_pool()
+
+        connection: AsyncConnection
+        async with pool.connection() as connection:
+            token: Token = _leased_connection.set(connection)
+            try:
+                yield self
+            finally:
+                _leased_connection.reset(token)
+
+    @asynccontextmanager
+    async def unit_of_work(self) -> AsyncIterator["Database"]:
+        """
+        Group every handler call made inside the context into one transaction on a single leased connection.
+
+        Statements are sent in pipeline mode, so independent statements go out without waiting for each other's replies. Nested
+        units of work become savepoints of the outer one.
+
+        Raises:
+            PoolTimeout: No connection became available within the configured timeout.
+
+        Yields:
+            Database: This database handle.
+        """
+        async with self.lease():
+            async with self.connection.pipeline(), self.connection.transaction():
+                yield self
+
+    @property
+    def connection(self) -> AsyncConnection:
+        """
+        Get the connection leased by the current task.
+
+        Raises:
+            RuntimeError: No connection is leased.
+        """
+        connection: AsyncConnection | None = _leased_connection.get()
+
+        if connection is None:
+            raise RuntimeError("Database accessed outside of a lease. Wrap the call in `async with database.lease():`.")
 
-    async def close(self) -> None:
+        return connection
+
+    @property
+    def users(self) -> UsersHandler:
+        """
+        Get users handler.
+        """
+        return UsersHandler(self.connection)
+
+    @property
+    def secure(self) -> SecureHandler:
         """
-        Close the database connection.
+        Get secure handler.
         """
-        await self._connection.close()
+        return SecureHandler(self.connection)
 
+    @property
+    def files(self) -> FilesHandler:
+        """
+        Get files handler.
+        """
+        return FilesHandler(self.connection)
@@ -7,10 +7,11 @@ Initialises the exceptions module.
 # Third Party Imports
 
 # Local Imports
-from .users import UserDoesNotExist, UserAlreadyExists
+from .users import UserDoesNotExist, UserAlreadyExists, UsernameUnavailable
 
 # Constants
 __all__ = [
     "UserDoesNotExist",
     "UserAlreadyExists",
+    "UsernameUnavailable",
 ]
@@ -15,6 +15,7 @@ from .bases import DatabaseException
 __all__ = [
     "UserDoesNotExist",
     "UserAlreadyExists",
+    "UsernameUnavailable",
 ]
 
 
@@ -48,3 +49,17 @@ class UserAlreadyExists(DatabaseException):
         super().__init__("users", identifier)
         self.message = f"User with ID {identifier} already exists."
 
+
+class UsernameUnavailable(DatabaseException):
+    """
+    Exception for when no free tag can be found for a username.
+    """
+    def __init__(
+            self,
+            identifier: str
+    ) -> None:
+        """
+        Initialise the exception.
+        """
+        super().__init__("users", identifier)
+        self.message = f"No free tag is available for username {identifier}."
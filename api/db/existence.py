@@ -0,0 +1,407 @@
+"""
+Contains the in-memory existence index used to answer definite misses for user ids and emails without a query.
+"""
+
+# Standard Library Imports
+from asyncio import Task, create_task, sleep
+from hashlib import blake2b
+from math import ceil, exp, log
+from typing import Iterator
+from uuid import UUID
+
+# Third Party Imports
+from psycopg import AsyncConnection, AsyncCursor, OperationalError
+from psycopg.rows import DictRow
+from psycopg.sql import SQL
+from psycopg_pool import PoolTimeout
+
+# Local Imports
+from .cache import LruTtlCache
+from ..config.config import CONFIG
+
+# Constants
+__all__ = [
+    "BloomFilter",
+    "ExistenceIndex",
+    "EXISTENCE_INDEX",
+]
+SCAN_BATCH: int = 10000  # Rows fetched per round trip when building the filters
+REBUILD_DELAY_MAX: float = 30.0
+
+
+class BloomFilter:
+    """
+    Set membership filter with no false negatives and a bounded rate of false positives.
+    """
+    __slots__ = [
+        "_bits",
+        "_size",
+        "_hashes",
+        "count",
+    ]
+
+    def __init__(
+            self,
+            capacity: int,
+            error_rate: float
+    ) -> None:
+        """
+        Initialise the filter, sized so that holding `capacity` items gives a false positive rate of about `error_rate`.
+
+        Args:
+            capacity (int): Expected number of items.
+            error_rate (float): Target false positive rate.
+        """
+        self._size: int = max(8, ceil(-capacity * log(error_rate) / log(2) ** 2))
+        self._hashes: int = max(1, round(self._size / capacity * log(2)))
+        self._bits: bytearray = bytearray((self._size + 7) // 8)
+        self.count: int = 0
+
+    def _positions(
+            self,
+            item: str
+    ) -> Iterator[int]:
+        """
+        Get the bit positions of an item, derived from one digest by double hashing.
+
+        Args:
+            item (str): Item.
+
+        Returns:
+            Iterator[int]: Bit positions.
+        """
+        digest: bytes = blake2b(item.encode(), digest_size=16).digest()
+        first: int = int.from_bytes(digest[:8], "little")
+        second: int = int.from_bytes(digest[8:], "little") | 1  # Odd, so every position is reachable
+
+        for index in range(self._hashes):
+            yield (first + index * second) % self._size
+
+    def add(
+            self,
+            item: str
+    ) -> bool:
+        """
+        Add an item. Items already in the filter are not counted again, so `count` tracks distinct items rather than calls.
+
+        Args:
+            item (str): Item.
+
+        Returns:
+            bool: The item was new to the filter. An item that was a false positive is not counted either.
+        """
+        added: bool = False
+
+        for position in self._positions(item):
+            bit: int = 1 << (position & 7)
+            if not self._bits[position >> 3] & bit:
+                self._bits[position >> 3] |= bit
+                added = True
+
+        if added:
+            self.count += 1
+
+        return added
+
+    def __contains__(
+            self,
+            item: str
+    ) -> bool:
+        """
+        Check whether an item might have been added. False is always correct, True may be a false positive.
+        """
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def estimated_error_rate(self) -> float:
+        """
+        Estimate the current false positive rate from the number of items added.
+
+        Returns:
+            float: Estimated false positive rate.
+        """
+        return (1 - exp(-self._hashes * self.count / self._size)) ** self._hashes
+
+
+class ExistenceIndex:
+    """
+    Bloom filters of every user id and email, backed by a short-lived negative cache.
+
+    The filters answer "definitely not" without touching Postgres. A "maybe" falls through to the database, and a miss there is
+    remembered in the negative cache for a few seconds. The filters are built from a streaming scan whenever the invalidation
+    bus (re)connects and are kept current from its insert events, so they are only trusted while the bus is listening.
+
+    A database miss for a key the filters let through is counted in `filter_hits_db_miss`. It is not the false positive
+    count: users deleted since the filters were built are still in them, and once their negative cache entry expires a
+    lookup for one is also a miss. `deleted` counts those users, to tell how much of the count they may account for.
+    """
+    __slots__ = [
+        "_capacity",
+        "_error_rate",
+        "_ids",
+        "_emails",
+        "_building",
+        "_ready",
+        "_build_task",
+        "_negative",
+        "definite_misses",
+        "negative_hits",
+        "lookups",
+        "filter_hits_db_miss",
+        "deleted",
+        "builds",
+    ]
+
+    def __init__(
+            self,
+            capacity: int,
+            error_rate: float,
+            negative_max_size: int,
+            negative_ttl: float
+    ) -> None:
+        """
+        Initialise the index. It answers nothing until it has been built.
+
+        Args:
+            capacity (int): Expected number of users.
+            error_rate (float): Target false positive rate of the filters.
+            negative_max_size (int): Maximum entries in the negative cache.
+            negative_ttl (float): Seconds a negative answer is remembered.
+        """
+        self._capacity: int = capacity
+        self._error_rate: float = error_rate
+        self._ids: BloomFilter = BloomFilter(capacity, error_rate)
+        self._emails: BloomFilter = BloomFilter(capacity, error_rate)
+        self._building: tuple[BloomFilter, BloomFilter] | None = None
+        self._ready: bool = False
+        self._build_task: Task | None = None
+        self._negative: LruTtlCache[tuple[str, str], bool] = LruTtlCache(negative_max_size, negative_ttl)
+
+        # Metrics
+        self.definite_misses: int = 0
+        self.negative_hits: int = 0
+        self.lookups: int = 0
+        self.filter_hits_db_miss: int = 0
+        self.deleted: int = 0  # Users removed since the filters were built, which the filters still hold
+        self.builds: int = 0
+
+    @property
+    def generation(self) -> int:
+        """
+        Generation of the negative cache. Read it before a lookup and pass it to `record` afterwards.
+        """
+        return self._negative.generation
+
+    def might_exist(
+            self,
+            kind: str,
+            value: UUID | str
+    ) -> bool:
+        """
+        Check whether a user might exist.
+
+        Args:
+            kind (str): "id" or "email".
+            value (UUID | str): User ID or email.
+
+        Returns:
+            bool: False if the user definitely does not exist, True if the database has to be asked.
+        """
+        if not self._ready:
+            return True
+
+        key: str = str(value)
+
+        if key not in (self._ids if kind == "id" else self._emails):
+            self.definite_misses += 1
+            return False
+
+        if self._negative.get((kind, key)) is not None:
+            self.negative_hits += 1
+            return False
+
+        return True
+
+    def record(
+            self,
+            kind: str,
+            value: UUID | str,
+            exists: bool,
+            generation: int
+    ) -> None:
+        """
+        Record the database's answer to a lookup the filters could not rule out.
+
+        Args:
+            kind (str): "id" or "email".
+            value (UUID | str): User ID or email.
+            exists (bool): Whether the user exists.
+            generation (int): `generation` from before the lookup.
+        """
+        if not self._ready:
+            return
+
+        self.lookups += 1
+        if not exists:
+            self.filter_hits_db_miss += 1
+            self._negative.set((kind, str(value)), True, generation)
+
+    def add(
+            self,
+            id: UUID | str,
+            email: str | None
+    ) -> None:
+        """
+        Add a user that has just been created (or changed email). Adding a user that is already in the filters, e.g. the
+        change event echoing a local add, leaves the counts unchanged.
+
+        Args:
+            id (UUID | str): User ID.
+            email (str | None): User email.
+        """
+        filters: list[tuple[BloomFilter, BloomFilter]] = [(self._ids, self._emails)]
+        if self._building is not None:
+            filters.append(self._building)
+
+        for ids, emails in filters:
+            ids.add(str(id))
+            if email is not None:
+                emails.add(email)
+
+        # The user exists now, whatever the negative cache says
+        self._negative.invalidate(("id", str(id)))
+        if email is not None:
+            self._negative.invalidate(("email", email))
+
+    def remove(
+            self,
+            id: UUID | str,
+            email: str | None
+    ) -> None:
+        """
+        Remember a deleted user as missing. Bloom filters cannot forget, so this goes into the negative cache.
+
+        Args:
+            id (UUID | str): User ID.
+            email (str | None): User email.
+        """
+        self.deleted += 1
+
+        generation: int = self._negative.generation
+        self._negative.set(("id", str(id)), True, generation)
+        if email is not None:
+            self._negative.set(("email", email), True, generation)
+
+    def apply_event(
+            self,
+            event: dict
+    ) -> None:
+        """
+        Apply a users change event from the invalidation bus.
+
+        Updates carry only the new email, so they are added too. An unchanged email is already in the filters and is not
+        counted again.
+
+        Args:
+            event (dict): Event.
+        """
+        match event.get("op"):
+            case "insert" | "update":
+                self.add(event["id"], event.get("email"))
+            case "delete":
+                self.remove(event["id"], event.get("email"))
+
+    def rebuild(self) -> None:
+        """
+        Stop trusting the filters and rebuild them in the background.
+        """
+        self.reset()
+        self._build_task = create_task(self._build())
+
+    def reset(self) -> None:
+        """
+        Stop trusting the filters, e.g. because change events may be missed from now on.
+        """
+        self._ready = False
+        if self._build_task is not None:
+            self._build_task.cancel()
+            self._build_task = None
+
+    async def _build(self) -> None:
+        """
+        Build fresh filters from a streaming scan of the users table, retrying with backoff until it succeeds.
+        """
+        # Imported here as the database module imports the handlers, which use this index
+        from .database import Database
+
+        delay: float = 1.0
+
+        while True:
+            ids: BloomFilter = BloomFilter(self._capacity, self._error_rate)
+            emails: BloomFilter = BloomFilter(self._capacity, self._error_rate)
+
+            # Users created during the scan are added to the new filters as well
+            self._building = (ids, emails)
+
+            try:
+                database: Database = Database()
+                async with database.lease():
+                    connection: AsyncConnection = database.connection
+
+                    # Named cursors stream rows from the server in batches, and must run inside a transaction
+                    cursor: AsyncCursor
+                    async with connection.transaction(), connection.cursor(name="existence_scan") as cursor:
+                        cursor.itersize = SCAN_BATCH
+                        await cursor.execute(SQL(r"SELECT id, email FROM users;"))
+
+                        row: DictRow
+                        async for row in cursor:
+                            ids.add(str(row["id"]))
+                            emails.add(row["email"])
+                break
+            except (OperationalError, PoolTimeout):
+                await sleep(delay)
+                delay = min(delay * 2, REBUILD_DELAY_MAX)
+            finally:
+                self._building = None
+
+        # Swap in the new filters
+        self._ids = ids
+        self._emails = emails
+        self._negative.clear()
+        self.deleted = 0
+        self._ready = True
+        self.builds += 1
+
+    def stats(self) -> dict[str, int | float | bool]:
+        """
+        Get index statistics.
+
+        Returns:
+            dict[str, int | float | bool]: Statistics. `filter_hit_db_miss_rate` is the share of missing keys the filters
+                let through, an upper bound on their false positive rate as it includes deleted users.
+                `estimated_false_positive_rate` is computed from how full the filters are.
+        """
+        negatives: int = self.definite_misses + self.filter_hits_db_miss
+
+        return {
+            "ready": self._ready,
+            "builds": self.builds,
+            "ids": self._ids.count,
+            "emails": self._emails.count,
+            "definite_misses": self.definite_misses,
+            "negative_hits": self.negative_hits,
+            "lookups": self.lookups,
+            "filter_hits_db_miss": self.filter_hits_db_miss,
+            "filter_hit_db_miss_rate": self.filter_hits_db_miss / negatives if negatives else 0.0,
+            "deleted": self.deleted,
+            "estimated_false_positive_rate": max(self._ids.estimated_error_rate(), self._emails.estimated_error_rate()),
+        }
+
+
+# Process-wide existence index
+EXISTENCE_INDEX: ExistenceIndex = ExistenceIndex(
+    CONFIG.cache.bloom_capacity,
+    CONFIG.cache.bloom_error_rate,
+    CONFIG.cache.negative_max_size,
+    CONFIG.cache.negative_ttl
+)
@@ -3,6 +3,8 @@ Contains the base handler.
 """
 
 # Standard Library Imports
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 
 # Third Party Imports
 
@@ -19,9 +21,24 @@ class BaseHandler(BaseDbInteractor):
     """
     Base handler.
     """
+    __slots__ = []
 
     async def close(self) -> None:
         """
         Close connection.
         """
         await self.connection.close()
+
+    @asynccontextmanager
+    async def unit_of_work(self) -> AsyncIterator["BaseHandler"]:
+        """
+        Group the statements run inside the context into one transaction.
+
+        Statements are sent in pipeline mode, so independent statements go out without waiting for each other's replies. Nested
+        units of work become savepoints of the outer one.
+
+        Yields:
+            BaseHandler: This handler.
+        """
+        async with self.connection.pipeline(), self.connection.transaction():
+            yield self
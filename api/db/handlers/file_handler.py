@@ -24,6 +24,7 @@ class FilesHandler(BaseHandler):
     """
     Files handler.
     """
+    __slots__ = []
 
     async def id_get(
             self,
@@ -13,51 +13,67 @@ from psycopg.sql import SQL
 # Local Imports
 from .base_handler import BaseHandler
 from ..types.secured.verification_code import VerificationCode
+from ...config.config import CONFIG
 from ...models.secure import Password, Token
-from ...security.scheme import crypt_context
+from ...models.user import User as PublicUser
+from ...security.hashing import PasswordHasher
 
 # Constants
 __all__ = [
     "SecureHandler",
+    "password_hasher",
 ]
 
+# Process-wide password hasher
+password_hasher: PasswordHasher = PasswordHasher(
+    CONFIG.user_security.hash_workers,
+    CONFIG.user_security.hash_max_queue
+)
+
 
 class SecureHandler(BaseHandler):
     """
     Secure handler.
     """
+    __slots__ = []
 
     @staticmethod
-    def hash_password(
+    async def hash_password(
             password: str
     ) -> str:
         """
-        Hash a password.
+        Hash a password off the event loop.
 
         Args:
             password (str): Password.
 
+        Raises:
+            HasherBusy: Too many hashes are already queued.
+
         Returns:
             str: Hashed password.
         """
-        return crypt_context.hash(password)
+        return await password_hasher.hash(password)
 
     @staticmethod
-    def verify_password(
+    async def verify_password(
             password: str,
             hashed_password: str
     ) -> bool:
         """
-        Verify a password.
+        Verify a password off the event loop.
 
         Args:
             password (str): Password.
             hashed_password (str): Hashed password.
 
+        Raises:
+            HasherBusy: Too many hashes are already queued.
+
         Returns:
             bool: Verification.
         """
-        return crypt_context.verify(password, hashed_password)
+        return await password_hasher.verify(password, hashed_password)
 
     async def set_password(
             self,
@@ -73,11 +89,25 @@ class SecureHandler(BaseHandler):
         """
 
         # Hash password
-        password: str = self.hash_password(password)  # Overwrite password with hashed password
+        password: str = await self.hash_password(password)  # Overwrite password with hashed password
+
+        await self.set_password_hash(user_id, password)
+
+    async def set_password_hash(
+            self,
+            user_id: UUID,
+            password_hash: str
+    ) -> None:
+        """
+        Sets a user's password from an already computed hash.
 
-        # Get cursor
+        Args:
+            user_id (UUID): User ID.
+            password_hash (str): Hashed password.
+        """
+        # Replace the password in one pipelined transaction so the user is never left without one
         cursor: AsyncCursor
-        async with self.connection.cursor() as cursor:
+        async with self.unit_of_work(), self.connection.cursor() as cursor:
             # Remove old password
             await cursor.execute(
                 SQL(
@@ -95,7 +125,7 @@ class SecureHandler(BaseHandler):
                 ),
                 [
                     user_id,
-                    password,
+                    password_hash,
                 ]
             )
 
@@ -149,13 +179,15 @@ class SecureHandler(BaseHandler):
 
     async def get_tokens(
             self,
-            user_id: UUID
+            user_id: UUID,
+            user: PublicUser | None = None
     ) -> list[Token]:
         """
         Gets the tokens of a user.
 
         Args:
             user_id (UUID): User ID.
+            user (PublicUser | None): Public model of the owner, if the caller already has it. Fetched once otherwise.
 
         Returns:
             list[str]: Tokens.
@@ -172,9 +204,18 @@ class SecureHandler(BaseHandler):
 
             token_data: list[DictRow] = await cursor.fetchall()
 
+        if not token_data:
+            return []
+
+        # Every token belongs to the same user, so resolve them once
+        if user is None:
+            user = await self.users.id_get_public(user_id)
+
         return [
             Token(
-                user=await self.users.id_get(user_id),
+                id=token["id"],
+                created_at=token["created_at"],
+                user=user,
                 token=token["token"],
                 last_used=token["last_used"]
             ) for token in token_data
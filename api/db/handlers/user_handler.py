@@ -3,31 +3,81 @@ Contains the Users handler.
 """
 
 # Standard Library Imports
-from hashlib import sha1
-from os import urandom
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+from typing import Awaitable, Callable, Hashable
 from uuid import UUID
 
 # Third Party Imports
 from psycopg import AsyncCursor
+from psycopg.pq import TransactionStatus
+from psycopg.errors import UniqueViolation
 from psycopg.rows import DictRow
 from psycopg.sql import SQL
 
 # Local Imports
-from ..exceptions.users import UserAlreadyExists, UserDoesNotExist
+from ..exceptions.users import UserAlreadyExists, UserDoesNotExist, UsernameUnavailable
 from .base_handler import BaseHandler
+from ..cache import PROFILE_CACHE
+from ..existence import EXISTENCE_INDEX
+from ..single_flight import SingleFlight
 from .secure_handler import SecureHandler
-from ..types.user import User
+from ..types.user import PROFILE_COLUMNS, PROFILE_TABLES, User
+from ...models.user import User as PublicUser
 
 # Constants
 __all__ = [
     "UsersHandler",
 ]
+TAG_PROBES: int = 16  # Random tags tried per attempt when registering
+TAG_ATTEMPTS: int = 5  # Attempts before a username is considered full
+
+# Coalesces concurrent identical user reads, so a burst of lookups for one user costs a single query. Only reads made outside
+# a transaction are coalesced, see `UsersHandler._shared_read`
+USER_READS: SingleFlight = SingleFlight()
+
+
+def encode_cursor(
+        created_at: datetime,
+        id: UUID
+) -> str:
+    """
+    Encodes a position in the users listing into an opaque continuation token.
+
+    Args:
+        created_at (datetime): Creation time of the last user on the page.
+        id (UUID): ID of the last user on the page.
+
+    Returns:
+        str: Continuation token.
+    """
+    return urlsafe_b64encode(f"{created_at.isoformat()}|{id}".encode()).decode()
+
+
+def decode_cursor(
+        cursor: str
+) -> tuple[datetime, UUID]:
+    """
+    Decodes a continuation token made by `encode_cursor`.
+
+    Args:
+        cursor (str): Continuation token.
+
+    Raises:
+        ValueError: The token is malformed.
+
+    Returns:
+        tuple[datetime, UUID]: Creation time and ID of the last user on the previous page.
+    """
+    created_at, id = urlsafe_b64decode(cursor.encode()).decode().split("|")
+    return datetime.fromisoformat(created_at), UUID(id)
 
 
 class UsersHandler(BaseHandler):
     """
     Users handler.
     """
+    __slots__ = []
 
     async def id_exists(
             self,
@@ -42,6 +92,11 @@ class UsersHandler(BaseHandler):
         Returns:
             bool: User exists.
         """
+        # Answer definite misses without a round trip
+        if not EXISTENCE_INDEX.might_exist("id", id):
+            return False
+        generation: int = EXISTENCE_INDEX.generation
+
         # Create a cursor
         async with self.connection.cursor() as cursor:
             # Execute
@@ -53,7 +108,10 @@ class UsersHandler(BaseHandler):
                     str(id),
                 ]
             )
-            return bool(await cursor.fetchone())
+            exists: bool = bool(await cursor.fetchone())
+
+        EXISTENCE_INDEX.record("id", id, exists, generation)
+        return exists
 
     async def email_exists(
             self,
@@ -68,6 +126,11 @@ class UsersHandler(BaseHandler):
         Returns:
             bool: User exists.
         """
+        # Answer definite misses without a round trip
+        if not EXISTENCE_INDEX.might_exist("email", email):
+            return False
+        generation: int = EXISTENCE_INDEX.generation
+
         # Create a cursor
         async with self.connection.cursor() as cursor:
             # Execute
@@ -79,7 +142,10 @@ class UsersHandler(BaseHandler):
                     email,
                 ]
             )
-            return bool(await cursor.fetchone())
+            exists: bool = bool(await cursor.fetchone())
+
+        EXISTENCE_INDEX.record("email", email, exists, generation)
+        return exists
 
     async def id_get(
             self,
@@ -97,18 +163,16 @@ class UsersHandler(BaseHandler):
         Returns:
             User: User.
         """
-        # Create a cursor
-        cursor: AsyncCursor
-        with self.connection.cursor() as cursor:
-            await cursor.execute(
+        # Share the query with any identical read already in flight
+        row: DictRow | None = await self._shared_read(
+            ("id", str(id)),
+            lambda: self._fetch_one(
                 SQL(
                     r"SELECT id, created_at FROM users WHERE id = %s;  /* Only select the unchanging columns, everything else is grabbed on-request */",
                 ),
-                [
-                    str(id),
-                ]
+                str(id)
             )
-            row: DictRow = await cursor.fetchone()
+        )
 
         if row is None:
             raise UserDoesNotExist(id)
@@ -132,22 +196,16 @@ class UsersHandler(BaseHandler):
         Returns:
             User: User.
         """
-        cursor: AsyncCursor
-        # Create a cursor
-        async with self.connection.cursor() as cursor:
-            # Execute
-            await cursor.execute(
+        # Share the query with any identical read already in flight
+        row: DictRow | None = await self._shared_read(
+            ("email", email),
+            lambda: self._fetch_one(
                 SQL(
                     r"SELECT id, created_at FROM users WHERE email = %s;  /* Only select the unchanging columns, everything else is grabbed on-request */",
                 ),
-                [
-                    email
-                ]
+                email
             )
-            row: DictRow = await cursor.fetchone()
-
-        # Kill the cursor
-        await cursor.close()
+        )
 
         if row is None:
             raise UserDoesNotExist(email)
@@ -155,6 +213,65 @@ class UsersHandler(BaseHandler):
         # Return
         return User(self.connection, row)
 
+    def _in_transaction(self) -> bool:
+        """
+        Check whether the connection is inside a transaction.
+
+        Returns:
+            bool: The connection is inside a transaction, or busy running one.
+        """
+        return self.connection.info.transaction_status != TransactionStatus.IDLE
+
+    async def _shared_read(
+            self,
+            key: Hashable,
+            function: Callable[[], Awaitable[any]]
+    ) -> any:
+        """
+        Run a read through `USER_READS`, sharing it with any identical read already in flight.
+
+        Reads inside a transaction always run on their own. A flight started on another connection cannot see this
+        transaction's uncommitted writes, and a flight started here would hand them to callers outside it.
+
+        Args:
+            key (Hashable): Key identifying the read.
+            function (Callable[[], Awaitable[any]]): Read to run.
+
+        Returns:
+            any: Result of the read.
+        """
+        if self._in_transaction():
+            return await function()
+
+        return await USER_READS.run(key, function)
+
+    async def _fetch_one(
+            self,
+            query: SQL,
+            value: any
+    ) -> DictRow | None:
+        """
+        Run a single parameter query and fetch the first row.
+
+        Args:
+            query (SQL): Query.
+            value (any): Parameter value.
+
+        Returns:
+            DictRow | None: Row, or None if nothing matched.
+        """
+        # Create a cursor
+        cursor: AsyncCursor
+        async with self.connection.cursor() as cursor:
+            # Execute
+            await cursor.execute(
+                query,
+                [
+                    value,
+                ]
+            )
+            return await cursor.fetchone()
+
     async def delete(
             self,
             id: UUID
@@ -171,22 +288,27 @@ class UsersHandler(BaseHandler):
         Returns:
             None
         """
-        # Check if the user exists
-        if not await self.id_exists(id):
-            raise UserDoesNotExist(id)
-
         # Create a cursor
         async with self.connection.cursor() as cursor:
-            # Execute
+            # Execute. The returned row doubles as the existence check, so this is a single round trip
             await cursor.execute(
                 SQL(
-                    r"DELETE FROM users WHERE id = %s;",
+                    r"DELETE FROM users WHERE id = %s RETURNING id, email;",
                 ),
                 [
                     str(id),
                 ]
             )
 
+            # Check if the user existed
+            row: DictRow | None = await cursor.fetchone()
+            if row is None:
+                raise UserDoesNotExist(id)
+
+        # Drop the cached profile and remember the user as missing
+        PROFILE_CACHE.invalidate(row["id"])
+        EXISTENCE_INDEX.remove(row["id"], row["email"])
+
     async def new(
             self,
             email: str,
@@ -203,70 +325,67 @@ class UsersHandler(BaseHandler):
 
         Raises:
             UserAlreadyExists: A user already exists with that email.
+            UsernameUnavailable: No free tag could be found for the username.
 
         Returns:
             User: Live user view.
         """
-        # Hash the password
-        password = SecureHandler.hash_password(password)  # This overwrites the value in memory
-
-        # Check if the user exists by email
+        # Check if the user exists by email before paying for a hash
         if await self.email_exists(email):
             raise UserAlreadyExists(email)
 
-        # Calculate the user's tag (this is a 6 digit number added to the end of their username)
-        #
-        # The initial tag is calculated by creating a sha1 hash of the user's username and email and taking the first 6 digits
-        # If the tag is already in use, rehash the hash with an extra 16 random bytes and try again
-        #
-        # This is done to prevent users from having the same tag
-        tag: int = int.from_bytes(sha1((email + username).encode()).digest())
-
-        # Strip tag digits
-        tag = int(str(tag)[:6])
+        # Hash the password. This is the only hash computed for a registration
+        password = await SecureHandler.hash_password(password)  # This overwrites the value in memory
 
-        # Check if the tag is already in use
+        # Claim a tag for the user (this is a 6 digit number added to the end of their username) and insert the user and their
+        # password hash in a single statement, so both rows are written in one transaction.
+        #
+        # Each attempt draws a batch of random tags in Postgres and claims the first one that is not already held for this
+        # username. The (username, tag) unique constraint turns a race with a concurrent signup into a no-op rather than a
+        # duplicate, in which case nothing is returned and another batch is drawn.
+        row: DictRow | None = None
         async with self.connection.cursor() as cursor:
             cursor: AsyncCursor
-            while True:
-                await cursor.execute(
-                    SQL(
-                        "SELECT 1 FROM users WHERE username = %s AND tag = %s;"
-                    ),
-                    [
-                        username,
-                        tag,
-                    ]
-                )
-                if await cursor.fetchone():
-                    # Tag is in use, rehash
-                    tag = int.from_bytes(sha1((email + username + str(urandom(16))).encode()).digest())
-
-                    # Strip tag digits
-                    tag = int(str(tag)[:6])
-                else:
+            for _ in range(TAG_ATTEMPTS):
+                try:
+                    await cursor.execute(
+                        SQL(
+                            r"""
+                            WITH new_user AS (
+                                INSERT INTO users (email, username, tag)
+                                SELECT %(email)s, %(username)s, candidate.tag
+                                FROM (
+                                    SELECT (100000 + FLOOR(RANDOM() * 900000))::INT AS tag FROM GENERATE_SERIES(1, %(probes)s)
+                                ) AS candidate
+                                WHERE NOT EXISTS (SELECT 1 FROM users WHERE username = %(username)s AND tag = candidate.tag)
+                                LIMIT 1
+                                ON CONFLICT (username, tag) DO NOTHING
+                                RETURNING *
+                            ), new_password AS (
+                                INSERT INTO secured.passwords (user_id, hash) SELECT id, %(hash)s FROM new_user
+                            )
+                            SELECT * FROM new_user;
+                            """
+                        ),
+                        {
+                            "email": email,
+                            "username": username,
+                            "probes": TAG_PROBES,
+                            "hash": password,
+                        }
+                    )
+                except UniqueViolation:  # Another registration claimed the email after the check above
+                    raise UserAlreadyExists(email)
+
+                row = await cursor.fetchone()
+                if row is not None:
                     break
 
-        # Execute
-        async with self.connection.cursor() as cursor:
-            cursor: AsyncCursor
-            await cursor.execute(
-                SQL(
-                    "INSERT INTO users (email, username, tag) VALUES (%s, %s, %s) RETURNING *;"
-                ),
-                [
-                    email,
-                    username,
-                    tag
-                ]
-            )
-            row: DictRow = await cursor.fetchone()
+        if row is None:
+            raise UsernameUnavailable(username)
 
-        # Add user password
-        await self.secure.set_password(
-            row["id"],
-            password
-        )
+        # Known to exist from now on in this process, ahead of the change event
+        EXISTENCE_INDEX.add(row["id"], row["email"])
 
         # Return
         return User(self.connection, row)
@@ -308,7 +427,7 @@ class UsersHandler(BaseHandler):
             # Execute
             await cursor.execute(
                 SQL(
-                    r"SELECT id, created_at FROM users ORDER BY created_at DESC LIMIT %s OFFSET %s;",
+                    r"SELECT id, created_at FROM users ORDER BY created_at DESC, id DESC LIMIT %s OFFSET %s;",
                 ),
                 [
                     page_size,
@@ -319,3 +438,169 @@ class UsersHandler(BaseHandler):
 
         # Return
         return [User(self.connection, row) for row in rows]
+
+    async def get_after(
+            self,
+            cursor: str | None,
+            page_size: int
+    ) -> tuple[list[User], str | None]:
+        """
+        Get users using keyset pagination. Unlike `get`, the cost of a page does not grow with how deep into the listing it is.
+
+        Args:
+            cursor (str | None): Continuation token from the previous page, or None for the first page.
+            page_size (int): Page size.
+
+        Raises:
+            ValueError: The continuation token is malformed, or the page size is not positive.
+
+        Returns:
+            tuple[list[User], str | None]: Users and the continuation token for the next page, which is None on the last page.
+        """
+        if page_size < 1:
+            raise ValueError("Page size must be positive.")
+
+        # Fetch one extra row to find out if there is another page
+        limit: int = page_size + 1
+
+        # Create a cursor
+        db_cursor: AsyncCursor
+        async with self.connection.cursor() as db_cursor:
+            # Execute
+            if cursor is None:
+                await db_cursor.execute(
+                    SQL(
+                        r"SELECT id, created_at FROM users ORDER BY created_at DESC, id DESC LIMIT %s;",
+                    ),
+                    [
+                        limit,
+                    ]
+                )
+            else:
+                created_at, id = decode_cursor(cursor)
+                await db_cursor.execute(
+                    SQL(
+                        r"SELECT id, created_at FROM users WHERE (created_at, id) < (%s, %s) ORDER BY created_at DESC, id DESC LIMIT %s;",
+                    ),
+                    [
+                        created_at,
+                        id,
+                        limit,
+                    ]
+                )
+            rows: list[DictRow] = await db_cursor.fetchall()
+
+        # Build the continuation token from the last row on this page
+        next_cursor: str | None = None
+        if page_size < len(rows):
+            rows = rows[:page_size]
+            next_cursor = encode_cursor(rows[-1]["created_at"], rows[-1]["id"])
+
+        # Return
+        return [User(self.connection, row) for row in rows], next_cursor
+
+    async def to_public_many(
+            self,
+            users: list[User]
+    ) -> list[PublicUser]:
+        """
+        Convert many users to public models. Cached profiles are served from the profile cache and the rest are fetched in a
+        single query.
+
+        Users deleted since they were fetched are left out of the result.
+
+        Args:
+            users (list[User]): Users to convert.
+
+        Returns:
+            list[PublicUser]: User models, in the same order as `users`.
+        """
+        if not users:
+            return []
+
+        # Serve what we can from the profile cache
+        cached: dict[UUID, PublicUser] = {}
+        missing: list[UUID] = []
+        for user in users:
+            public: PublicUser | None = PROFILE_CACHE.get(user.id)
+            if public is None:
+                missing.append(user.id)
+            else:
+                cached[user.id] = public
+
+        # Fetch the rest in one query
+        if missing:
+            generation: int = PROFILE_CACHE.generation
+            for row in await self._get_profile_rows(missing):
+                public = cached[row["id"]] = User.public_from_row(row)
+                PROFILE_CACHE.set(row["id"], public, generation)
+
+        # Keep the order of the input list
+        return [cached[user.id] for user in users if user.id in cached]
+
+    async def id_get_public(
+            self,
+            id: UUID
+    ) -> PublicUser:
+        """
+        Get the public model of a user by ID. Served from the profile cache when possible, otherwise a single query.
+
+        Args:
+            id (UUID): User ID.
+
+        Raises:
+            UserDoesNotExist: Requested user does not exist.
+
+        Returns:
+            PublicUser: User model.
+        """
+        # Inside a transaction the shared cache may not match what this connection sees, and must not be filled from it
+        if not self._in_transaction():
+            public: PublicUser | None = PROFILE_CACHE.get(id)
+            if public is not None:
+                return public
+
+        # Share the query with any identical read already in flight
+        generation: int = PROFILE_CACHE.generation
+        rows: list[DictRow] = await self._shared_read(
+            ("profile", str(id)),
+            lambda: self._get_profile_rows([id])
+        )
+        if not rows:
+            raise UserDoesNotExist(id)
+
+        public = User.public_from_row(rows[0])
+        if not self._in_transaction():
+            PROFILE_CACHE.set(id, public, generation)
+
+        return public
+
+    async def _get_profile_rows(
+            self,
+            ids: list[UUID]
+    ) -> list[DictRow]:
+        """
+        Get the profile rows of many users in one query.
+
+        Args:
+            ids (list[UUID]): User IDs.
+
+        Returns:
+            list[DictRow]: Profile rows, in no particular order. Missing users are left out.
+        """
+        # Create a cursor
+        cursor: AsyncCursor
+        async with self.connection.cursor() as cursor:
+            # Execute
+            await cursor.execute(
+                SQL(
+                    r"SELECT {} FROM {} WHERE users.id = ANY(%s);"
+                ).format(
+                    PROFILE_COLUMNS,
+                    PROFILE_TABLES
+                ),
+                [
+                    ids,
+                ]
+            )
+            return await cursor.fetchall()
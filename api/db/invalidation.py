@@ -0,0 +1,272 @@
+"""
+Contains the cross-process cache invalidation bus.
+"""
+
+# Standard Library Imports
+from asyncio import CancelledError, Task, create_task, sleep
+from json import JSONDecodeError, loads
+from logging import Logger, getLogger
+from typing import Callable
+from uuid import UUID
+
+# Third Party Imports
+from psycopg import AsyncConnection, OperationalError
+from psycopg.sql import Identifier, SQL
+
+# Local Imports
+from .cache import LruTtlCache, PROFILE_CACHE
+from .database import connection_kwargs
+from .existence import EXISTENCE_INDEX
+
+# Constants
+__all__ = [
+    "InvalidationBus",
+    "INVALIDATION_BUS",
+    "CHANNEL",
+]
+CHANNEL: str = "echo_invalidation"  # Must match the channel used by notify_invalidation() in schema.sql
+RECONNECT_DELAY_MAX: float = 30.0
+logger: Logger = getLogger(__name__)
+
+
+class InvalidationBus:
+    """
+    Listens for change events published by Postgres and drops the matching entries from the caches in this process.
+
+    Every insert, update or delete on a watched table fires a trigger (see `notify_invalidation` in schema.sql) that sends a
+    `{"table", "op", "id", "version", "email"}` event on `CHANNEL`. Each worker process listens on its own dedicated
+    connection, so a write made by any process reaches every other process's caches as soon as it commits, without polling.
+    """
+    __slots__ = [
+        "_subscribers",
+        "_listeners",
+        "_connect_callbacks",
+        "_disconnect_callbacks",
+        "_connection",
+        "_listening",
+        "_task",
+        "received",
+        "invalid",
+        "reconnects",
+        "failures",
+        "callback_errors",
+        "last_version",
+    ]
+
+    def __init__(self) -> None:
+        """
+        Initialise the bus.
+        """
+        self._subscribers: dict[str, list[LruTtlCache]] = {}
+        self._listeners: dict[str, list[Callable[[dict], None]]] = {}
+        self._connect_callbacks: list[Callable[[], None]] = []
+        self._disconnect_callbacks: list[Callable[[], None]] = []
+        self._connection: AsyncConnection | None = None
+        self._listening: bool = False
+        self._task: Task | None = None
+
+        # Metrics
+        self.received: int = 0
+        self.invalid: int = 0
+        self.reconnects: int = 0
+        self.failures: int = 0
+        self.callback_errors: int = 0
+        self.last_version: int = 0
+
+    def subscribe(
+            self,
+            table: str,
+            cache: LruTtlCache
+    ) -> None:
+        """
+        Drop entries from a cache when rows of a table change. The cache must be keyed by the row ID.
+
+        Args:
+            table (str): Table name.
+            cache (LruTtlCache): Cache.
+        """
+        self._subscribers.setdefault(table, []).append(cache)
+
+    def listen(
+            self,
+            table: str,
+            callback: Callable[[dict], None]
+    ) -> None:
+        """
+        Call a function with every change event for a table.
+
+        Args:
+            table (str): Table name.
+            callback (Callable[[dict], None]): Function called with the decoded event.
+        """
+        self._listeners.setdefault(table, []).append(callback)
+
+    def on_connect(
+            self,
+            callback: Callable[[], None]
+    ) -> None:
+        """
+        Call a function every time the bus (re)starts listening. Events sent while it was not listening are lost, so this is
+        where state kept current by events should be rebuilt.
+
+        Args:
+            callback (Callable[[], None]): Function to call.
+        """
+        self._connect_callbacks.append(callback)
+
+    def on_disconnect(
+            self,
+            callback: Callable[[], None]
+    ) -> None:
+        """
+        Call a function every time the bus stops listening, from which point events may be missed.
+
+        Args:
+            callback (Callable[[], None]): Function to call.
+        """
+        self._disconnect_callbacks.append(callback)
+
+    @property
+    def connected(self) -> bool:
+        """
+        Whether the bus is currently listening, i.e. no events are being missed.
+        """
+        return self._listening
+
+    async def start(self) -> None:
+        """
+        Start listening in the background. Does not wait for the database, so the app can start while it is unavailable.
+        """
+        if self._task is None:
+            self._task = create_task(self._listen())
+
+    async def stop(self) -> None:
+        """
+        Stop listening and close the dedicated connection.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except CancelledError:
+                pass
+            self._task = None
+
+    def dispatch(
+            self,
+            payload: str
+    ) -> None:
+        """
+        Apply a change event to the subscribed caches.
+
+        Args:
+            payload (str): JSON event sent by the trigger.
+        """
+        self.received += 1
+
+        try:
+            event: dict = loads(payload)
+            table: str = event["table"]
+            id: UUID = UUID(event["id"])
+            self.last_version = max(self.last_version, int(event["version"]))
+        except (JSONDecodeError, KeyError, TypeError, ValueError):
+            self.invalid += 1
+            return
+
+        for cache in self._subscribers.get(table, []):
+            cache.invalidate(id)
+
+        for callback in self._listeners.get(table, []):
+            self._run_callback(callback, event)
+
+    def _run_callback(
+            self,
+            callback: Callable[..., None],
+            *args: dict
+    ) -> None:
+        """
+        Run a callback, logging and counting its failure so one bad callback cannot stop the bus or the others.
+
+        Args:
+            callback (Callable[..., None]): Callback.
+            *args (dict): Arguments for the callback.
+        """
+        try:
+            callback(*args)
+        except Exception:
+            self.callback_errors += 1
+            logger.exception("Invalidation bus callback %r failed.", callback)
+
+    def _clear_all(self) -> None:
+        """
+        Clear every subscribed cache. Used when events may have been missed while disconnected.
+        """
+        for caches in self._subscribers.values():
+            for cache in caches:
+                cache.clear()
+
+    async def _listen(self) -> None:
+        """
+        Listen for events, reconnecting with backoff whenever the connection is lost.
+        """
+        delay: float = 1.0
+
+        while True:
+            try:
+                self._connection = await AsyncConnection.connect(**connection_kwargs())
+                await self._connection.execute(SQL("LISTEN {};").format(Identifier(CHANNEL)))
+
+                # Anything could have changed while we were not listening
+                self._listening = True
+                self._clear_all()
+                for callback in self._connect_callbacks:
+                    self._run_callback(callback)
+                delay = 1.0
+
+                async for notify in self._connection.notifies():
+                    self.dispatch(notify.payload)
+            except OperationalError:
+                self.reconnects += 1
+            except Exception:
+                # Anything else must not end the task for good, or the caches would silently stop being invalidated
+                self.failures += 1
+                logger.exception("Invalidation bus failed, reconnecting.")
+            finally:
+                if self._listening:
+                    self._listening = False
+                    for callback in self._disconnect_callbacks:
+                        self._run_callback(callback)
+                if self._connection is not None:
+                    await self._connection.close()
+                    self._connection = None
+
+            # Back off before reconnecting
+            await sleep(delay)
+            delay = min(delay * 2, RECONNECT_DELAY_MAX)
+
+    def stats(self) -> dict[str, int | bool]:
+        """
+        Get bus statistics.
+
+        Returns:
+            dict[str, int | bool]: Statistics.
+        """
+        return {
+            "connected": self._listening,
+            "received": self.received,
+            "invalid": self.invalid,
+            "reconnects": self.reconnects,
+            "failures": self.failures,
+            "callback_errors": self.callback_errors,
+            "last_version": self.last_version,
+        }
+
+
+# Process-wide invalidation bus
+INVALIDATION_BUS: InvalidationBus = InvalidationBus()
+INVALIDATION_BUS.subscribe("users", PROFILE_CACHE)
+
+# The existence index is only trusted while no events can be missed
+INVALIDATION_BUS.listen("users", EXISTENCE_INDEX.apply_event)
+INVALIDATION_BUS.on_connect(EXISTENCE_INDEX.rebuild)
+INVALIDATION_BUS.on_disconnect(EXISTENCE_INDEX.reset)
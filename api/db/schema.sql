@@ -160,7 +160,12 @@ CREATE TABLE secured.verification_codes
     expires    TIMESTAMP    NOT NULL
 );
 
+/* Create indexes */
+CREATE INDEX users_created_at_id_idx ON public.users (created_at DESC, id DESC); /* Keyset pagination of the users listing */
+
 /* Create checks */
+ALTER TABLE public.users
+    ADD CONSTRAINT users_username_tag_key UNIQUE (username, tag); /* Tags are allocated per username, see UsersHandler.new */
 ALTER TABLE public.channels
     ADD CONSTRAINT channel_type_check CHECK (type >= 0 AND type <= 2);
 
@@ -179,6 +184,34 @@ $$
 SELECT ('x' || SUBSTR(MD5($1), 1, 16))::BIT(64)::BIGINT;
 $$ LANGUAGE sql;
 
+/* Tells every API process to drop its cached copy of a changed row. See api/db/invalidation.py */
+CREATE OR REPLACE FUNCTION notify_invalidation()
+    RETURNS TRIGGER AS
+$$
+DECLARE
+    changed RECORD;
+BEGIN
+    IF tg_op = 'DELETE' THEN
+        changed = old;
+    ELSE
+        changed = new;
+    END IF;
+
+    /* email is only present for tables that have one, it keeps the existence filters in api/db/existence.py current */
+    PERFORM pg_notify(
+            'echo_invalidation',
+            json_build_object(
+                    'table', tg_table_name,
+                    'op', LOWER(tg_op),
+                    'id', changed.id,
+                    'version', txid_current(),
+                    'email', TO_JSONB(changed) ->> 'email'
+                )::TEXT
+        );
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
 
 /* Create triggers */
 CREATE TRIGGER set_default_profile_picture
@@ -186,6 +219,12 @@ CREATE TRIGGER set_default_profile_picture
     ON public.guild_members
 EXECUTE FUNCTION set_default_profile_picture();
 
+CREATE TRIGGER users_notify_invalidation
+    AFTER INSERT OR UPDATE OR DELETE
+    ON public.users
+    FOR EACH ROW
+EXECUTE FUNCTION notify_invalidation();
+
 /* Create Rules */
 CREATE OR REPLACE RULE update_last_updated AS
     ON UPDATE TO secured.passwords
@@ -0,0 +1,150 @@
+"""
+Contains the single-flight request coalescer.
+"""
+
+# Standard Library Imports
+from asyncio import CancelledError, Future, get_running_loop, shield
+from collections import OrderedDict
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+# Third Party Imports
+
+# Local Imports
+
+# Constants
+__all__ = [
+    "SingleFlight",
+]
+T = TypeVar("T")
+TRACKED_KEYS: int = 1024  # Keys kept in the per-key metrics, least recently coalesced are dropped first
+TOP_KEYS: int = 10  # Keys reported in the stats
+
+
+class SingleFlight(Generic[T]):
+    """
+    Coalesces concurrent calls for the same key, so that they share one in-flight call and its result.
+
+    The first caller for a key runs the call. Anyone who asks for the same key before it finishes waits for that call instead
+    of starting their own. Results are not kept once the call finishes; this caps concurrency, it is not a cache.
+    """
+    __slots__ = [
+        "_in_flight",
+        "_coalesced_by_key",
+        "executed",
+        "coalesced",
+    ]
+
+    def __init__(self) -> None:
+        """
+        Initialise the coalescer.
+        """
+        self._in_flight: dict[Hashable, Future[T]] = {}
+        self._coalesced_by_key: OrderedDict[Hashable, int] = OrderedDict()
+
+        # Metrics
+        self.executed: int = 0
+        self.coalesced: int = 0
+
+    async def run(
+            self,
+            key: Hashable,
+            function: Callable[[], Awaitable[T]]
+    ) -> T:
+        """
+        Run a call, or wait for the identical call already in flight.
+
+        Args:
+            key (Hashable): Key identifying the call.
+            function (Callable[[], Awaitable[T]]): Call to run if none is in flight.
+
+        Returns:
+            T: Result of the call. Exceptions raised by the call are raised to every waiter.
+        """
+        while True:
+            future: Future[T] | None = self._in_flight.get(key)
+
+            # Nothing in flight, so run the call ourselves
+            if future is None:
+                return await self._lead(key, function)
+
+            self._record_coalesced(key)
+
+            try:
+                # Shield so that one waiter being cancelled does not cancel the call for everyone else
+                return await shield(future)
+            except CancelledError:
+                # The leader was cancelled rather than us, so try again
+                if future.cancelled():
+                    continue
+                raise
+
+    async def _lead(
+            self,
+            key: Hashable,
+            function: Callable[[], Awaitable[T]]
+    ) -> T:
+        """
+        Run the call and publish its outcome to the waiters.
+
+        Args:
+            key (Hashable): Key identifying the call.
+            function (Callable[[], Awaitable[T]]): Call to run.
+
+        Returns:
+            T: Result of the call.
+        """
+        future: Future[T] = get_running_loop().create_future()
+
+        # Mark exceptions as retrieved so that a failed call nobody waited on does not log a warning
+        future.add_done_callback(lambda done: done.cancelled() or done.exception())
+
+        self._in_flight[key] = future
+        self.executed += 1
+
+        try:
+            result: T = await function()
+        except CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exception:
+            future.set_exception(exception)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._in_flight[key]
+
+    def _record_coalesced(
+            self,
+            key: Hashable
+    ) -> None:
+        """
+        Count a coalesced waiter against its key.
+
+        Args:
+            key (Hashable): Key.
+        """
+        self.coalesced += 1
+        self._coalesced_by_key[key] = self._coalesced_by_key.get(key, 0) + 1
+        self._coalesced_by_key.move_to_end(key)
+
+        # Bound the per-key metrics
+        if len(self._coalesced_by_key) > TRACKED_KEYS:
+            self._coalesced_by_key.popitem(last=False)
+
+    def stats(self) -> dict[str, int | dict[str, int]]:
+        """
+        Get coalescer statistics.
+
+        Returns:
+            dict[str, int | dict[str, int]]: Statistics, including the keys with the most coalesced waiters.
+        """
+        top: list[tuple[Hashable, int]] = sorted(self._coalesced_by_key.items(), key=lambda item: item[1], reverse=True)[:TOP_KEYS]
+
+        return {
+            "in_flight": len(self._in_flight),
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+            "top_keys": {str(key): count for key, count in top},
+        }
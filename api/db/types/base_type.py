@@ -9,7 +9,9 @@ from uuid import UUID
 # Third Party Imports
 from psycopg import AsyncConnection, AsyncCursor
 from psycopg.rows import DictRow
-from psycopg.sql import Identifier, SQL
+from psycopg.sql import Composed, Identifier, SQL
+from psycopg.types.json import Jsonb
+from pydantic import BaseModel
 
 # Local Imports
 from ..base_db_interactor import BaseDbInteractor
@@ -17,16 +19,153 @@ from ..base_db_interactor import BaseDbInteractor
 # Constants
 __all__ = [
     "BaseType",
+    "StatementCache",
+    "STATEMENT_CACHE",
 ]
 
 
+class StatementCache:
+    """
+    Cache of the single column statements used by `BaseType.get` and `BaseType.set`.
+
+    Statements are composed and rendered to a string once per (statement, table, column, key), so the hot per-column reads skip
+    composition. Names are plain strings, so they key the cache directly and are only quoted on a miss. Statements are then
+    executed as server-side prepared statements, so Postgres skips parsing and planning too.
+    """
+    __slots__ = [
+        "_statements",
+        "hits",
+        "misses",
+    ]
+
+    def __init__(self) -> None:
+        """
+        Initialise the cache.
+        """
+        self._statements: dict[tuple[str, tuple[str, ...], str | tuple[str, ...], str], str] = {}
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def get(
+            self,
+            template: str,
+            table: tuple[str, ...],
+            column: str,
+            key: str,
+            connection: AsyncConnection
+    ) -> str:
+        """
+        Get a rendered statement, composing it on the first request.
+
+        Args:
+            template (str): Statement template with placeholders for the table, column and key, in that order.
+            table (tuple[str, ...]): Table name, with its schema if it has one.
+            column (str): Column name.
+            key (str): Key column name.
+            connection (AsyncConnection): Connection used to quote the identifiers on a miss.
+
+        Returns:
+            str: Rendered statement.
+        """
+        cache_key: tuple[str, tuple[str, ...], str, str] = (template, table, column, key)
+
+        statement: str | None = self._statements.get(cache_key)
+        if statement is not None:
+            self.hits += 1
+            return statement
+
+        self.misses += 1
+        composed: Composed = SQL(template).format(Identifier(*table), Identifier(column), Identifier(key))
+        statement = self._statements[cache_key] = composed.as_string(connection)
+        return statement
+
+    def get_update_many(
+            self,
+            table: tuple[str, ...],
+            columns: tuple[str, ...],
+            key: str,
+            connection: AsyncConnection
+    ) -> str:
+        """
+        Get a rendered statement that updates several columns and returns the new row, composing it on the first request.
+
+        Args:
+            table (tuple[str, ...]): Table name, with its schema if it has one.
+            columns (tuple[str, ...]): Column names, in the order their values will be passed.
+            key (str): Key column name.
+            connection (AsyncConnection): Connection used to quote the identifiers on a miss.
+
+        Returns:
+            str: Rendered statement.
+        """
+        cache_key: tuple[str, tuple[str, ...], tuple[str, ...], str] = (UPDATE_MANY_TEMPLATE, table, columns, key)
+
+        statement: str | None = self._statements.get(cache_key)
+        if statement is not None:
+            self.hits += 1
+            return statement
+
+        self.misses += 1
+        composed: Composed = SQL(UPDATE_MANY_TEMPLATE).format(
+            Identifier(*table),
+            SQL(", ").join(SQL("{} = %s").format(Identifier(column)) for column in columns),
+            Identifier(key)
+        )
+        statement = self._statements[cache_key] = composed.as_string(connection)
+        return statement
+
+    def stats(self) -> dict[str, int]:
+        """
+        Get cache statistics.
+
+        Returns:
+            dict[str, int]: Statistics.
+        """
+        return {
+            "size": len(self._statements),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+# Process-wide statement cache
+STATEMENT_CACHE: StatementCache = StatementCache()
+SELECT_TEMPLATE: str = r"SELECT {1} FROM {0} WHERE {2} = %s;"
+UPDATE_TEMPLATE: str = r"UPDATE {0} SET {1} = %s WHERE {2} = %s;"
+UPDATE_MANY_TEMPLATE: str = r"UPDATE {0} SET {1} WHERE {2} = %s RETURNING *;"
+
+
+def adapt(
+        value: any
+) -> any:
+    """
+    Adapt a value for writing. Models (such as a user's status) are stored as jsonb.
+
+    Args:
+        value (any): Value.
+
+    Returns:
+        any: Value psycopg can send.
+    """
+    if isinstance(value, BaseModel):
+        return Jsonb(value.model_dump(mode="json"))
+
+    return value
+
+
 class BaseType(BaseDbInteractor):
     """
     Base DB type.
 
-    Provides the connection attribute.
+    Provides the connection attribute. Subclasses set `_table_name` on the class, as it is the same for every row. It is a tuple
+    of the schema, if any, and table name.
     """
-    _table_name: Identifier
+    __slots__ = [
+        "id",
+        "created_at",
+    ]
+
+    _table_name: tuple[str, ...]
 
     id: UUID
     created_at: datetime
@@ -46,16 +185,21 @@ class BaseType(BaseDbInteractor):
         self.id = row["id"]
         self.created_at = row["created_at"]
 
+    def invalidate(self) -> None:
+        """
+        Drop any cached views of this row. Called after every write made through this object; types with a cache override it.
+        """
+
     async def id_get(
             self,
-            column: Identifier,
+            column: str,
             id: any
     ) -> DictRow:
         """
         Gets a the value present in a column from the database using the current object's ID.
 
         Args:
-            column (Identifier): Column name.
+            column (str): Column name.
             id (any): ID.
 
         Returns:
@@ -63,23 +207,23 @@ class BaseType(BaseDbInteractor):
         """
         row: DictRow = await self.get(
             column=column,
-            key=Identifier("id"),
+            key="id",
             key_value=id
         )
         return row
 
     async def get(
             self,
-            column: Identifier,
-            key: Identifier,
+            column: str,
+            key: str,
             key_value: any
     ) -> DictRow:
         """
         Gets the value of a column from the database.
 
         Args:
-            column (Identifier): Column name.
-            key (Identifier): Key column name.
+            column (str): Column name.
+            key (str): Key column name.
             key_value (any): Key column value.
 
         Returns:
@@ -89,16 +233,17 @@ class BaseType(BaseDbInteractor):
         cursor: AsyncCursor
         async with self.connection.cursor() as cursor:
             await cursor.execute(
-                SQL(
-                    r"SELECT {} FROM {} WHERE {} = %s;"
-                ).format(
-                    column,
+                STATEMENT_CACHE.get(
+                    SELECT_TEMPLATE,
                     self._table_name,
-                    key
+                    column,
+                    key,
+                    self.connection
                 ),
                 [
                     str(key_value),
-                ]
+                ],
+                prepare=True
             )
 
             # Get the row
@@ -108,7 +253,7 @@ class BaseType(BaseDbInteractor):
 
     async def id_set(
             self,
-            column: Identifier,
+            column: str,
             value: any,
             id: any
     ) -> None:
@@ -116,7 +261,7 @@ class BaseType(BaseDbInteractor):
         Sets the value of a column in the database using the current object's ID.
 
         Args:
-            column (Identifier): Column name.
+            column (str): Column name.
             value (any): Value.
             id (any): ID.
 
@@ -126,24 +271,24 @@ class BaseType(BaseDbInteractor):
         await self.set(
             column=column,
             value=value,
-            key=Identifier("id"),
+            key="id",
             key_value=id
         )
 
     async def set(
             self,
-            column: Identifier,
+            column: str,
             value: any,
-            key: Identifier,
+            key: str,
             key_value: any
     ) -> None:
         """
         Sets the value of a column in the database.
 
         Args:
-            column (Identifier): Column name.
+            column (str): Column name.
             value (any): Value.
-            key (Identifier): Key column name.
+            key (str): Key column name.
             key_value (any): Key column value.
 
         Returns:
@@ -152,15 +297,86 @@ class BaseType(BaseDbInteractor):
         cursor: AsyncCursor
         async with self.connection.cursor() as cursor:
             await cursor.execute(
-                SQL(
-                    r"UPDATE {} SET {} = %s WHERE {} = %s;"
-                ).format(
+                STATEMENT_CACHE.get(
+                    UPDATE_TEMPLATE,
                     self._table_name,
                     column,
-                    key
+                    key,
+                    self.connection
                 ),
                 [
-                    value,
+                    adapt(value),
                     key_value
-                ]
+                ],
+                prepare=True
             )
+
+        self.invalidate()
+
+    async def id_set_many(
+            self,
+            values: dict[str, any],
+            id: any
+    ) -> DictRow | None:
+        """
+        Sets the values of several columns in a single statement using the current object's ID.
+
+        Args:
+            values (dict[str, any]): New values keyed by column name.
+            id (any): ID.
+
+        Returns:
+            DictRow | None: Updated row, or None if no row has that ID.
+        """
+        return await self.set_many(
+            values=values,
+            key="id",
+            key_value=id
+        )
+
+    async def set_many(
+            self,
+            values: dict[str, any],
+            key: str,
+            key_value: any
+    ) -> DictRow | None:
+        """
+        Sets the values of several columns in a single statement and returns the updated row, so it does not have to be read
+        again.
+
+        Args:
+            values (dict[str, any]): New values keyed by column name.
+            key (str): Key column name.
+            key_value (any): Key column value.
+
+        Raises:
+            ValueError: No values were given.
+
+        Returns:
+            DictRow | None: Updated row, or None if no row matched the key.
+        """
+        if not values:
+            raise ValueError("At least one column must be set.")
+
+        cursor: AsyncCursor
+        async with self.connection.cursor() as cursor:
+            await cursor.execute(
+                STATEMENT_CACHE.get_update_many(
+                    self._table_name,
+                    tuple(values),
+                    key,
+                    self.connection
+                ),
+                [
+                    *map(adapt, values.values()),
+                    key_value
+                ],
+                prepare=True
+            )
+
+            # Get the updated row
+            row: DictRow | None = await cursor.fetchone()
+
+        self.invalidate()
+
+        return row
@@ -8,11 +8,9 @@ from uuid import UUID
 # Third Party Imports
 from psycopg import AsyncConnection
 from psycopg.rows import DictRow
-from psycopg.sql import Identifier
 
 # Local Imports
 from .base_type import BaseType
-from .user import User
 from ...models.file import File as FileModel
 from ...models.user import User as UserModel
 
@@ -26,6 +24,9 @@ class File(BaseType):
     """
     File datatype.
     """
+    __slots__ = []
+
+    _table_name = ("files",)
 
     def __init__(
             self,
@@ -42,8 +43,6 @@ class File(BaseType):
         # Initialize BaseType
         super().__init__(connection, row)
 
-        self._table_name = Identifier("files")
-
     async def to_model(self) -> FileModel:
         """
         Convert to model.
@@ -54,7 +53,7 @@ class File(BaseType):
         return FileModel(
             id=self.id,
             created_at=self.created_at,
-            created_by=await self.get_created_by(),
+            created_by=await self.get_created_by_id(),
         )
 
     async def get_created_by_id(self) -> UUID:
@@ -66,7 +65,7 @@ class File(BaseType):
         """
         # Get created_by
         row: DictRow = await self.id_get(
-            column=Identifier("created_by"),
+            column="created_by",
             id=self.id
         )
         return row["created_by"]
@@ -78,6 +77,5 @@ class File(BaseType):
         Returns:
             User: User.
         """
-        # Get user object
-        user: User = await self.users.id_get(await self.get_created_by_id())
-        return await user.to_public()
+        # Get user model, from the profile cache when possible
+        return await self.users.id_get_public(await self.get_created_by_id())
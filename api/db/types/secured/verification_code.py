@@ -8,11 +8,9 @@ from uuid import UUID
 # Third Party Imports
 from psycopg import AsyncConnection
 from psycopg.rows import DictRow
-from psycopg.sql import Identifier
 
 # Local Imports
 from ..base_type import BaseType
-from ..user import User
 from ....models.secure import VerificationCode as VerificationCodeModel
 from ....models.user import User as UserModel
 
@@ -26,6 +24,9 @@ class VerificationCode(BaseType):
     """
     Verification code datatype.
     """
+    __slots__ = []
+
+    _table_name = ("secured", "verification_codes")
 
     def __init__(
             self,
@@ -42,8 +43,6 @@ class VerificationCode(BaseType):
         # Initialize BaseType
         super().__init__(connection, row)
 
-        self._table_name = Identifier("secured.verification_codes")
-
     async def to_model(self) -> VerificationCodeModel:
         """
         Convert to model.
@@ -68,7 +67,7 @@ class VerificationCode(BaseType):
         """
         # Get user id
         row: DictRow = await self.id_get(
-            column=Identifier("user_id"),
+            column="user_id",
             id=self.id
         )
         return row["user_id"]
@@ -83,6 +82,5 @@ class VerificationCode(BaseType):
         # Get user
         user_id: UUID = await self.get_user_id()
 
-        # Get user object
-        user: User = await self.users.id_get(user_id)
-        return await user.to_public()
+        # Get user model, from the profile cache when possible
+        return await self.users.id_get_public(user_id)
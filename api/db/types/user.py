@@ -8,10 +8,13 @@ from uuid import UUID
 # Third Party Imports
 from psycopg import AsyncConnection, AsyncCursor
 from psycopg.rows import DictRow
-from psycopg.sql import Identifier
+from psycopg.sql import SQL
 
 # Local Imports
 from .base_type import BaseType
+from ..cache import PROFILE_CACHE
+from ..exceptions.users import UserDoesNotExist
+from ...models.base import from_row
 from ...models.secure import PrivateUser
 from ...models.user import Status, User as PublicUser
 
@@ -20,11 +23,42 @@ __all__ = [
     "User",
 ]
 
+# Every column needed to build the public and private user models. The icon is joined against files so that a dangling icon
+# reference resolves to None, and the password is joined for its last updated time.
+PROFILE_COLUMNS: SQL = SQL(
+    r"""
+    users.id,
+    users.created_at,
+    users.email,
+    users.username,
+    files.id AS icon,
+    users.bio,
+    users.status,
+    users.last_online,
+    users.is_online,
+    users.is_banned,
+    users.is_verified,
+    passwords.last_updated AS password_last_updated
+    """
+)
+
+# Tables the profile columns are selected from
+PROFILE_TABLES: SQL = SQL(
+    r"""
+    users
+    LEFT JOIN files ON files.id = users.icon
+    LEFT JOIN secured.passwords AS passwords ON passwords.user_id = users.id
+    """
+)
+
 
 class User(BaseType):
     """
     User datatype.
     """
+    __slots__ = []
+
+    _table_name = ("users",)
 
     def __init__(
             self,
@@ -41,28 +75,74 @@ class User(BaseType):
         # Initialize BaseType
         super().__init__(connection, row)
 
-        self._table_name = Identifier("users")
+    async def get_profile_row(self) -> DictRow:
+        """
+        Get every column needed to build the user models in a single query.
+
+        Raises:
+            UserDoesNotExist: The user has been deleted.
+
+        Returns:
+            DictRow: Profile row.
+        """
+        cursor: AsyncCursor
+        async with self.connection.cursor() as cursor:
+            await cursor.execute(
+                SQL(
+                    r"SELECT {} FROM {} WHERE users.id = %s;"
+                ).format(
+                    PROFILE_COLUMNS,
+                    PROFILE_TABLES
+                ),
+                [
+                    self.id,
+                ]
+            )
+            row: DictRow = await cursor.fetchone()
+
+        if row is None:
+            raise UserDoesNotExist(self.id)
+
+        return row
+
+    @staticmethod
+    def public_from_row(
+            row: DictRow
+    ) -> PublicUser:
+        """
+        Build the public model from a profile row.
+
+        Args:
+            row (DictRow): Profile row.
+
+        Returns:
+            PublicUser: User model.
+        """
+        return from_row(PublicUser, row)
+
+    def invalidate(self) -> None:
+        """
+        Drop the cached public profile of this user.
+        """
+        PROFILE_CACHE.invalidate(self.id)
 
     async def to_public(self) -> PublicUser:
         """
-        Convert to model.
+        Convert to model. Served from the profile cache when possible.
 
         Returns:
             UserModel: User model.
         """
-        return PublicUser(
-            id=self.id,
-            created_at=self.created_at,
-            email=await self.get_email(),
-            username=await self.get_username(),
-            icon=await self.get_icon(),
-            bio=await self.get_bio(),
-            status=await self.get_status(),
-            last_online=await self.get_last_online(),
-            is_online=await self.get_is_online(),
-            is_banned=await self.get_is_banned(),
-            is_verified=await self.get_is_verified()
-        )
+        user: PublicUser | None = PROFILE_CACHE.get(self.id)
+        if user is not None:
+            return user
+
+        # Read the profile and cache it
+        generation: int = PROFILE_CACHE.generation
+        user = self.public_from_row(await self.get_profile_row())
+        PROFILE_CACHE.set(self.id, user, generation)
+
+        return user
 
     async def to_private(self) -> PrivateUser:
         """
@@ -71,22 +151,44 @@ class User(BaseType):
         Returns:
             UserModel: User model.
         """
-        return PrivateUser(
-            id=self.id,
-            created_at=self.created_at,
-            email=await self.get_email(),
-            username=await self.get_username(),
-            icon=await self.get_icon(),
-            bio=await self.get_bio(),
-            status=await self.get_status(),
-            last_online=await self.get_last_online(),
-            is_online=await self.get_is_online(),
-            is_banned=await self.get_is_banned(),
-            is_verified=await self.get_is_verified(),
-            tokens=await self.secure.get_tokens(user_id=self.id),
-            password_last_updated=await self.get_password_last_updated()
+        generation: int = PROFILE_CACHE.generation
+        row: DictRow = await self.get_profile_row()
+
+        # Cache the public part of the profile while we have it
+        public: PublicUser = self.public_from_row(row)
+        PROFILE_CACHE.set(self.id, public, generation)
+
+        return from_row(
+            PrivateUser,
+            {
+                **row,
+                "tokens": await self.secure.get_tokens(user_id=self.id, user=public),
+            }
         )
 
+    async def patch(
+            self,
+            **values: any
+    ) -> DictRow:
+        """
+        Set several profile columns with a single UPDATE, for saves that change more than one field.
+
+        Args:
+            **values (any): New values keyed by column name, e.g. `bio="..."`, `status=Status(...)`.
+
+        Raises:
+            UserDoesNotExist: The user has been deleted.
+
+        Returns:
+            DictRow: Updated user row.
+        """
+        row: DictRow | None = await self.id_set_many(values, self.id)
+
+        if row is None:
+            raise UserDoesNotExist(self.id)
+
+        return row
+
     async def get_email(self) -> str:
         """
         Get email.
@@ -96,7 +198,7 @@ class User(BaseType):
         """
         # Get email
         row: DictRow = await self.id_get(
-            column=Identifier("email"),
+            column="email",
             id=str(self.id)
         )
         return row["email"]
@@ -116,7 +218,7 @@ class User(BaseType):
         """
         # Set email
         await self.id_set(
-            column=Identifier("email"),
+            column="email",
             id=str(self.id),
             value=value
         )
@@ -130,7 +232,7 @@ class User(BaseType):
         """
         # Get username
         row: DictRow = await self.id_get(
-            column=Identifier("username"),
+            column="username",
             id=str(self.id)
         )
         return row["username"]
@@ -150,7 +252,7 @@ class User(BaseType):
         """
         # Set username
         await self.id_set(
-            column=Identifier("username"),
+            column="username",
             id=str(self.id),
             value=value
         )
@@ -164,7 +266,7 @@ class User(BaseType):
         """
         # Get icon
         row: DictRow = await self.id_get(
-            column=Identifier("icon"),
+            column="icon",
             id=str(self.id)
         )
         return row["icon"]
@@ -184,7 +286,7 @@ class User(BaseType):
         """
         # Set icon
         await self.id_set(
-            column=Identifier("icon"),
+            column="icon",
             id=str(self.id),
             value=value
         )
@@ -210,7 +312,7 @@ class User(BaseType):
         """
         # Get bio
         row: DictRow = await self.id_get(
-            column=Identifier("bio"),
+            column="bio",
             id=self.id
         )
         return row["bio"]
@@ -227,7 +329,7 @@ class User(BaseType):
         """
         # Set bio
         await self.id_set(
-            column=Identifier("bio"),
+            column="bio",
             id=self.id,
             value=value
         )
@@ -241,12 +343,10 @@ class User(BaseType):
         """
         # Get status
         row: DictRow = await self.id_get(
-            column=Identifier("status"),
+            column="status",
             id=self.id
         )
-        return Status(
-            **row["status"]
-        )
+        return from_row(Status, row["status"])
 
     async def set_status(
             self,
@@ -260,7 +360,7 @@ class User(BaseType):
         """
         # Set status
         await self.id_set(
-            column=Identifier("status"),
+            column="status",
             id=self.id,
             value=value
         )
@@ -274,7 +374,7 @@ class User(BaseType):
         """
         # Get last_online
         row: DictRow = await self.id_get(
-            column=Identifier("last_online"),
+            column="last_online",
             id=self.id
         )
         return row["last_online"]
@@ -291,7 +391,7 @@ class User(BaseType):
         """
         # Set last_online
         await self.id_set(
-            column=Identifier("last_online"),
+            column="last_online",
             id=self.id,
             value=value
         )
@@ -305,7 +405,7 @@ class User(BaseType):
         """
         # Get is_online
         row: DictRow = await self.id_get(
-            column=Identifier("is_online"),
+            column="is_online",
             id=self.id
         )
         return row["is_online"]
@@ -322,7 +422,7 @@ class User(BaseType):
         """
         # Set is_online
         await self.id_set(
-            column=Identifier("is_online"),
+            column="is_online",
             id=self.id,
             value=value
         )
@@ -335,7 +435,7 @@ class User(BaseType):
             bool: Ban status.
         """
         row: DictRow = await self.id_get(
-            column=Identifier("is_banned"),
+            column="is_banned",
             id=self.id
         )
         return row["is_banned"]
@@ -352,7 +452,7 @@ class User(BaseType):
         """
         # Set is_banned
         await self.id_set(
-            column=Identifier("is_banned"),
+            column="is_banned",
             id=self.id,
             value=value
         )
@@ -366,7 +466,7 @@ class User(BaseType):
         """
         # Get is_verified
         row: DictRow = await self.id_get(
-            column=Identifier("is_verified"),
+            column="is_verified",
             id=self.id
         )
         return row["is_verified"]
@@ -380,7 +480,7 @@ class User(BaseType):
         """
         # Set is_verified
         await self.id_set(
-            column=Identifier("is_verified"),
+            column="is_verified",
             id=self.id,
             value=value
         )
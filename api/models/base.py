@@ -5,6 +5,7 @@ Contains the base model that all top level table models inherit from.
 # Standard Library Imports
 from uuid import UUID
 from datetime import datetime
+from typing import Mapping, TypeVar
 
 # Third Party Imports
 from pydantic import BaseModel
@@ -14,7 +15,9 @@ from pydantic import BaseModel
 # Constants
 __all__ = [
     "BaseTableModel",
+    "from_row",
 ]
+M = TypeVar("M", bound=BaseModel)
 
 
 class BaseTableModel(BaseModel):
@@ -23,3 +26,25 @@ class BaseTableModel(BaseModel):
     """
     id: UUID
     created_at: datetime
+
+
+def from_row(
+        model: type[M],
+        row: Mapping[str, any]
+) -> M:
+    """
+    Build a model from a row read from our own database, in a single call into the compiled validator.
+
+    The whole row, nested JSONB values included, is handed to `model_validate`, instead of building nested models and keyword
+    arguments in Python first. Columns the model does not declare are ignored. This still validates, but in compiled code,
+    and `tools/benchmarks/model_construction.py` measures it at over twice the speed of the unvalidated `model_construct`
+    path, which has to build nested models and convert enums in Python.
+
+    Args:
+        model (type[M]): Model class.
+        row (Mapping[str, any]): Row, or any mapping of field values.
+
+    Returns:
+        M: Model instance.
+    """
+    return model.model_validate(row)
@@ -6,7 +6,7 @@ from typing import Optional
 # Standard Library Imports
 
 # Third Party Imports
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 # Local Imports
 from .bases import BaseMessage
@@ -18,15 +18,21 @@ __all__ = [
     "GetUsersInput",
     "DeleteUserInputData",
     "DeleteUserInput",
+    "DeleteUserOutputData",
+    "TicketOutputData",
 ]
+PAGE_SIZE_MAX: int = 1000
 
 
 class GetUsersInputData(BaseModel):
     """
     Model for getting users.
+
+    Either `page` for offset pagination or `cursor` for keyset pagination. Leaving both out fetches the first keyset page.
     """
-    page: int
-    page_size: int
+    page: Optional[int] = Field(default=None, ge=0)
+    page_size: int = Field(ge=1, le=PAGE_SIZE_MAX)
+    cursor: Optional[str] = None
 
 
 class GetUsersInput(BaseMessage):
@@ -48,3 +54,18 @@ class DeleteUserInput(BaseMessage):
     Model for deleting a user.
     """
     data: DeleteUserInputData
+
+
+class DeleteUserOutputData(BaseModel):
+    """
+    Model for the result of deleting a user.
+    """
+    success: bool
+
+
+class TicketOutputData(BaseModel):
+    """
+    Model for a session ticket.
+    """
+    ticket: str
+    expires_in: int
@@ -3,24 +3,33 @@ Administrator WS API Router
 """
 # Standard Library Imports
 from hashlib import md5
-from secrets import token_bytes
 from typing import Annotated
 
 # Third Party Imports
-from fastapi import APIRouter, WebSocket, Depends
-from rsa import encrypt
+from fastapi import APIRouter, WebSocket, Depends, Header
 from starlette.websockets import WebSocketDisconnect
 
 # Local Imports
 from ..db import Database
 from ..config import CONFIG
+from ..security.key_material import KeyMaterialPool
 from ..ws_workers import AdminWorker
+from ..ws_workers.admin_worker import ADMIN_TICKETS
+from ..ws_workers.encoding import Codec, accept
 
 # Constants
 __all__ = [
-    "administrator_router"
+    "administrator_router",
+    "HANDSHAKE_KEYS",
 ]
 
+# Handshake tokens, encrypted for the server owner ahead of time so a connect never waits on RSA
+HANDSHAKE_KEYS: KeyMaterialPool = KeyMaterialPool(
+    CONFIG.server.owner_public_key,
+    32,
+    CONFIG.auth.handshake_pool_size
+)
+
 # Create API router
 administrator_router: APIRouter = APIRouter(
     prefix="/admin",
@@ -32,45 +41,50 @@ administrator_router: APIRouter = APIRouter(
 @administrator_router.websocket("/")
 async def admin_ws(
         websocket: WebSocket,
-        database: Annotated[Database, Depends(Database.new)]
+        database: Annotated[Database, Depends(Database.new)],
+        ticket: Annotated[str | None, Header(alias="X-Admin-Ticket")] = None
 ) -> None:
     """
     Route to establish a WebSocket connection for the administrator.
+
+    A session ticket from an earlier connection, sent in the `X-Admin-Ticket` header, skips the handshake while it is valid.
     """
-    await websocket.accept()
+    codec: Codec = await accept(websocket)
 
-    # Generate a token for the connection
-    token: bytes = token_bytes(32)
+    # Messages after the key exchange use the codec agreed with the client
+    worker: AdminWorker = AdminWorker(
+        websocket,
+        database,
+        codec
+    )
 
-    # Encrypt the token using the public key
-    encrypted_token: bytes = encrypt(token, CONFIG.server.owner_public_key)
+    # A valid ticket shows the client passed the handshake recently. Without one, or with an expired one, do the handshake
+    if ticket is None or not ADMIN_TICKETS.verify(ticket):
+        # Take a token for the connection, already encrypted using the public key
+        token, encrypted_token = await HANDSHAKE_KEYS.take()
 
-    # Send the token to the client
-    await websocket.send_bytes(encrypted_token)
+        # Send the token to the client
+        await websocket.send_bytes(encrypted_token)
 
-    # Calculate the expected token
-    client_expected: bytes = md5(token).digest()
+        # Calculate the expected token
+        client_expected: bytes = md5(token).digest()
 
-    # Receive the token back from the client
-    try:
-        client_actual: bytes = await websocket.receive_bytes()  # This is causing an error
-    except WebSocketDisconnect:
-        return  # Gracefully handle disconnect
+        # Receive the token back from the client
+        try:
+            client_actual: bytes = await websocket.receive_bytes()  # This is causing an error
+        except WebSocketDisconnect:
+            return  # Gracefully handle disconnect
 
-    # Check if the response is exactly what was expected
-    if client_actual != client_expected:
-        await websocket.send_json({"message": "Authentication failed."})
-        await websocket.close()
-        return
+        # Check if the response is exactly what was expected
+        if client_actual != client_expected:
+            await worker.send({"message": "Authentication failed."})
+            await worker.close()  # Sends the queued message first
+            return
 
     # Send the client a message to say that they are authenticated
-    await websocket.send_json(
+    await worker.send(
         {"message": "Authenticated."}
     )
 
     # We now know that the user is authenticated for this session we will accept the event loop and hand it off to the processor
-    worker: AdminWorker = AdminWorker(
-        websocket,
-        database
-    )
     await worker.run()
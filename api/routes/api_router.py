@@ -11,6 +11,17 @@ from fastapi.requests import Request
 from fastapi.responses import HTMLResponse
 
 # Local Imports
+from ..db import Database
+from ..db.cache import PROFILE_CACHE, PROFILE_JSON_CACHE
+from ..db.existence import EXISTENCE_INDEX
+from ..db.invalidation import INVALIDATION_BUS
+from ..db.handlers.secure_handler import password_hasher
+from ..db.handlers.user_handler import USER_READS
+from ..db.types.base_type import STATEMENT_CACHE
+from ..ws_workers import BaseWorker
+from ..ws_workers.admin_worker import ADMIN_TICKETS
+from .admin_router import HANDSHAKE_KEYS
+from ..ws_workers.actions import action_stats
 
 # Constants
 __all__ = [
@@ -57,3 +68,24 @@ async def teapot() -> dict:
     Teapot route.
     """
     raise HTTPException(status_code=418, detail="I'm a teapot.")
+
+
+@api_router.get("/metrics", include_in_schema=False)
+async def metrics() -> dict:
+    """
+    Route to expose runtime statistics for monitoring.
+    """
+    return {
+        "database": Database.stats(),
+        "password_hasher": password_hasher.stats(),
+        "statement_cache": STATEMENT_CACHE.stats(),
+        "profile_cache": PROFILE_CACHE.stats(),
+        "profile_json_cache": PROFILE_JSON_CACHE.stats(),
+        "invalidation_bus": INVALIDATION_BUS.stats(),
+        "existence_index": EXISTENCE_INDEX.stats(),
+        "handshake_keys": HANDSHAKE_KEYS.stats(),
+        "admin_tickets": ADMIN_TICKETS.stats(),
+        "user_reads": USER_READS.stats(),
+        "websockets": BaseWorker.stats(),
+        "ws_actions": action_stats()
+    }
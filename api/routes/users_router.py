@@ -24,6 +24,7 @@ __all__ = [
     "users_router"
 ]
 
+from ..ws_workers.encoding import Codec, accept
 from ..ws_workers.users_worker import UsersWorker
 
 # Create API router
@@ -58,10 +59,10 @@ async def users_ws(
     """
     Route to establish a users websocket.
     """
-    await websocket.accept()
+    codec: Codec = await accept(websocket)
 
     # Pass off to the worker
-    worker: UsersWorker = UsersWorker(websocket, database)
+    worker: UsersWorker = UsersWorker(websocket, database, codec)
     await worker.run()
 
 
@@ -73,17 +74,19 @@ async def verify_user(
     """
     Verifies a user's email address.
     """
-    # Get user
-    user: VerificationCode = await database.secure.get_verification_code(verification_code)
+    # Lease a connection for the duration of the request
+    async with database.lease():
+        # Get user
+        user: VerificationCode = await database.secure.get_verification_code(verification_code)
 
-    if user is None:
-        raise HTTPException(status_code=404, detail="User not found")
+        if user is None:
+            raise HTTPException(status_code=404, detail="User not found")
 
-    # Check if the validation code is expired
+        # Check if the validation code is expired
 
 
 
-    await user.set_is_verified(True)
+        await user.set_is_verified(True)
 
     # Return user
 
@@ -108,7 +111,7 @@ async def verify_user(
 #     password: Password = await db.secure.get_password(user.id)
 #
 #     # Check password
-#     if not db.secure.verify_password(data.password, password.hash):
+#     if not await db.secure.verify_password(data.password, password.hash):
 #         raise HTTPException(status_code=403, detail="Incorrect password")
 #
 #     # Build a new access token
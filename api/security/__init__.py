@@ -7,6 +7,8 @@ Initialises the security module
 # Third Party Imports
 
 # Local Imports
+from .hashing import HasherBusy, PasswordHasher
+from .password_policy import PasswordPolicy, count_character_classes
 from .scheme import crypt_context, decode_access_token, encode_access_token, generate_keypair, oauth2_scheme
 
 # Constants
@@ -16,4 +18,8 @@ __all__ = [
     "encode_access_token",
     "decode_access_token",
     "generate_keypair",
+    "PasswordHasher",
+    "HasherBusy",
+    "PasswordPolicy",
+    "count_character_classes",
 ]
@@ -0,0 +1,175 @@
+"""
+Contains the password hasher that runs argon2 off the event loop.
+"""
+
+# Standard Library Imports
+from asyncio import get_running_loop
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from typing import Callable, TypeVar
+
+# Third Party Imports
+
+# Local Imports
+from .scheme import crypt_context
+
+# Constants
+__all__ = [
+    "PasswordHasher",
+    "HasherBusy",
+]
+T = TypeVar("T")
+
+
+class HasherBusy(RuntimeError):
+    """
+    Raised when the hasher queue is full and the request is shed instead of queued.
+    """
+
+
+class PasswordHasher:
+    """
+    Runs password hashing and verification in a bounded thread pool.
+
+    argon2 releases the GIL while it computes, so threads are enough to keep the event loop free without the pickling and
+    startup cost of a process pool.
+    """
+    __slots__ = [
+        "_executor",
+        "_max_queue",
+        "_pending",
+        "_completed",
+        "_rejected",
+        "_wait_total",
+        "_wait_max",
+        "_compute_total",
+        "_compute_max",
+    ]
+
+    def __init__(
+            self,
+            workers: int,
+            max_queue: int
+    ) -> None:
+        """
+        Initialise the hasher.
+
+        Args:
+            workers (int): Number of hashing threads.
+            max_queue (int): Maximum number of requests waiting or running at once. Further requests raise `HasherBusy`.
+        """
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password_hasher")
+        self._max_queue: int = max_queue
+        self._pending: int = 0
+
+        # Metrics
+        self._completed: int = 0
+        self._rejected: int = 0
+        self._wait_total: float = 0.0
+        self._wait_max: float = 0.0
+        self._compute_total: float = 0.0
+        self._compute_max: float = 0.0
+
+    async def hash(
+            self,
+            password: str
+    ) -> str:
+        """
+        Hash a password.
+
+        Args:
+            password (str): Password.
+
+        Raises:
+            HasherBusy: The queue is full.
+
+        Returns:
+            str: Hashed password.
+        """
+        return await self._run(crypt_context.hash, password)
+
+    async def verify(
+            self,
+            password: str,
+            hashed_password: str
+    ) -> bool:
+        """
+        Verify a password.
+
+        Args:
+            password (str): Password.
+            hashed_password (str): Hashed password.
+
+        Raises:
+            HasherBusy: The queue is full.
+
+        Returns:
+            bool: Verification.
+        """
+        return await self._run(crypt_context.verify, password, hashed_password)
+
+    async def _run(
+            self,
+            function: Callable[..., T],
+            *args: str
+    ) -> T:
+        """
+        Run a function in the pool and record how long it queued and how long it computed.
+
+        Args:
+            function (Callable[..., T]): Function to run.
+            *args (str): Arguments for the function.
+
+        Raises:
+            HasherBusy: The queue is full.
+
+        Returns:
+            T: Function result.
+        """
+        # Shed load rather than queue without bound
+        if self._pending >= self._max_queue:
+            self._rejected += 1
+            raise HasherBusy("Password hasher queue is full.")
+
+        def timed() -> tuple[T, float, float]:
+            """
+            Run the function, returning its result along with the start and end times.
+            """
+            started: float = perf_counter()
+            result: T = function(*args)
+            return result, started, perf_counter()
+
+        self._pending += 1
+        submitted: float = perf_counter()
+        try:
+            result, started, finished = await get_running_loop().run_in_executor(self._executor, timed)
+        finally:
+            self._pending -= 1
+
+        # Record metrics
+        wait: float = started - submitted
+        compute: float = finished - started
+        self._completed += 1
+        self._wait_total += wait
+        self._wait_max = max(self._wait_max, wait)
+        self._compute_total += compute
+        self._compute_max = max(self._compute_max, compute)
+
+        return result
+
+    def stats(self) -> dict[str, int | float]:
+        """
+        Get hasher statistics. Times are in seconds.
+
+        Returns:
+            dict[str, int | float]: Statistics.
+        """
+        return {
+            "pending": self._pending,
+            "completed": self._completed,
+            "rejected": self._rejected,
+            "wait_avg": self._wait_total / self._completed if self._completed else 0.0,
+            "wait_max": self._wait_max,
+            "compute_avg": self._compute_total / self._completed if self._completed else 0.0,
+            "compute_max": self._compute_max,
+        }
@@ -0,0 +1,156 @@
+"""
+Contains the pool of pre-generated key material for the admin handshakes.
+"""
+
+# Standard Library Imports
+from asyncio import Task, create_task, gather, get_running_loop
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from secrets import token_bytes
+
+# Third Party Imports
+from rsa import PublicKey, encrypt
+
+# Local Imports
+
+# Constants
+__all__ = [
+    "KeyMaterialPool",
+]
+
+
+def generate_key_material(
+        public_key: PublicKey,
+        size: int
+) -> tuple[bytes, bytes]:
+    """
+    Generate a random secret and encrypt it with a public key.
+
+    Args:
+        public_key (PublicKey): Key to encrypt the secret with.
+        size (int): Secret length in bytes.
+
+    Returns:
+        tuple[bytes, bytes]: Secret, and the secret encrypted with the public key.
+    """
+    secret: bytes = token_bytes(size)
+
+    return secret, encrypt(secret, public_key)
+
+
+class KeyMaterialPool:
+    """
+    Keeps random secrets, already encrypted with a public key, ready to hand out.
+
+    RSA is pure Python big integer math that would hold up every socket on the event loop, so it runs in a worker thread. The
+    pool is refilled in the background whenever secrets are taken, and only falls back to generating one on demand, still in
+    the thread, when it runs dry.
+    """
+    __slots__ = [
+        "_public_key",
+        "_size",
+        "_capacity",
+        "_ready",
+        "_executor",
+        "_refill",
+        "_taken",
+        "_misses",
+    ]
+
+    def __init__(
+            self,
+            public_key: PublicKey,
+            size: int,
+            capacity: int
+    ) -> None:
+        """
+        Initialise the pool. It starts empty, call `start` to fill it.
+
+        Args:
+            public_key (PublicKey): Key to encrypt the secrets with.
+            size (int): Secret length in bytes.
+            capacity (int): Number of secrets to keep ready.
+        """
+        self._public_key: PublicKey = public_key
+        self._size: int = size
+        self._capacity: int = capacity
+        self._ready: deque[tuple[bytes, bytes]] = deque()
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="key_material")
+        self._refill: Task | None = None
+
+        # Metrics
+        self._taken: int = 0
+        self._misses: int = 0
+
+    async def start(self) -> None:
+        """
+        Start filling the pool in the background.
+        """
+        self._schedule_refill()
+
+    async def stop(self) -> None:
+        """
+        Stop filling the pool and drop the secrets it holds, so they are never used by another run of the app.
+        """
+        if self._refill is not None:
+            self._refill.cancel()
+            await gather(self._refill, return_exceptions=True)
+            self._refill = None
+
+        self._ready.clear()
+
+    async def take(self) -> tuple[bytes, bytes]:
+        """
+        Take a secret. Each secret is handed out once.
+
+        Returns:
+            tuple[bytes, bytes]: Secret, and the secret encrypted with the public key.
+        """
+        self._taken += 1
+
+        if self._ready:
+            material: tuple[bytes, bytes] = self._ready.popleft()
+        else:
+            self._misses += 1
+            material: tuple[bytes, bytes] = await self._generate()
+
+        self._schedule_refill()
+
+        return material
+
+    async def _generate(self) -> tuple[bytes, bytes]:
+        """
+        Generate a secret in the worker thread.
+
+        Returns:
+            tuple[bytes, bytes]: Secret, and the secret encrypted with the public key.
+        """
+        return await get_running_loop().run_in_executor(self._executor, generate_key_material, self._public_key, self._size)
+
+    def _schedule_refill(self) -> None:
+        """
+        Start refilling the pool unless it is full or already refilling.
+        """
+        if len(self._ready) < self._capacity and (self._refill is None or self._refill.done()):
+            self._refill = create_task(self._fill())
+
+    async def _fill(self) -> None:
+        """
+        Generate secrets until the pool is full.
+        """
+        while len(self._ready) < self._capacity:
+            self._ready.append(await self._generate())
+
+    def stats(self) -> dict[str, int]:
+        """
+        Get pool statistics.
+
+        Returns:
+            dict[str, int]: Statistics.
+        """
+        return {
+            "ready": len(self._ready),
+            "capacity": self._capacity,
+            "taken": self._taken,
+            "misses": self._misses,
+        }
@@ -0,0 +1,143 @@
+"""
+Contains the password policy checked before a password is hashed.
+"""
+
+# Standard Library Imports
+from collections import Counter
+
+# Third Party Imports
+
+# Local Imports
+
+# Constants
+__all__ = [
+    "PasswordPolicy",
+    "count_character_classes",
+]
+
+# Maps every ASCII byte to the byte naming its class, so a single `bytes.translate` classifies a whole password
+_ASCII_CLASSES: bytes = bytes(
+    ord("U") if chr(byte).isupper() else
+    ord("L") if chr(byte).islower() else
+    ord("N") if chr(byte).isdigit() else
+    ord("S")
+    for byte in range(256)
+)
+
+
+def count_character_classes(
+        password: str
+) -> tuple[int, int, int, int]:
+    """
+    Count the uppercase, lowercase, number and special characters in a password.
+
+    Characters are never visited one at a time in Python. ASCII passwords are classified by one `bytes.translate` and
+    counted with `bytes.count`. Others are tallied by `Counter` in one pass, and only the distinct characters are classified.
+
+    Args:
+        password (str): Password.
+
+    Returns:
+        tuple[int, int, int, int]: Uppercase, lowercase, number and special character counts.
+    """
+    if password.isascii():
+        classes: bytes = password.encode("ascii").translate(_ASCII_CLASSES)
+        uppercase: int = classes.count(b"U")
+        lowercase: int = classes.count(b"L")
+        number: int = classes.count(b"N")
+    else:
+        tally: Counter[str] = Counter(password)
+        uppercase: int = sum(count for char, count in tally.items() if char.isupper())
+        lowercase: int = sum(count for char, count in tally.items() if char.islower())
+        number: int = sum(count for char, count in tally.items() if char.isdigit())
+
+    # A character is in at most one of the classes above, anything else is special
+    return uppercase, lowercase, number, len(password) - uppercase - lowercase - number
+
+
+class PasswordPolicy:
+    """
+    Password length and complexity requirements.
+    """
+    __slots__ = [
+        "minimum_length",
+        "maximum_length",
+        "require_uppercase",
+        "require_lowercase",
+        "require_number",
+        "require_special",
+    ]
+
+    def __init__(
+            self,
+            minimum_length: int,
+            maximum_length: int,
+            require_uppercase: int,
+            require_lowercase: int,
+            require_number: int,
+            require_special: int
+    ) -> None:
+        """
+        Initialise the policy.
+
+        Args:
+            minimum_length (int): Minimum number of characters.
+            maximum_length (int): Maximum number of characters.
+            require_uppercase (int): Minimum number of uppercase characters.
+            require_lowercase (int): Minimum number of lowercase characters.
+            require_number (int): Minimum number of number characters.
+            require_special (int): Minimum number of special characters.
+        """
+        self.minimum_length = minimum_length
+        self.maximum_length = maximum_length
+        self.require_uppercase = require_uppercase
+        self.require_lowercase = require_lowercase
+        self.require_number = require_number
+        self.require_special = require_special
+
+    def check(
+            self,
+            password: str
+    ) -> list[dict[str, str | dict[str, int | str]]]:
+        """
+        Check a password against the policy.
+
+        The length is checked first, and a password of the wrong length is rejected without counting its characters.
+
+        Args:
+            password (str): Password.
+
+        Returns:
+            list[dict[str, str | dict[str, int | str]]]: Errors, each with an `error` code and its `data`. Empty if the
+                password meets the policy.
+        """
+        if not self.minimum_length <= len(password) <= self.maximum_length:
+            return [
+                {
+                    "error": "password_length_invalid",
+                    "data": {
+                        "max_len": self.maximum_length,
+                        "min_len": self.minimum_length
+                    }
+                }
+            ]
+
+        counts: tuple[int, int, int, int] = count_character_classes(password)
+        requirements: tuple[tuple[str, int], ...] = (
+            ("uppercase", self.require_uppercase),
+            ("lowercase", self.require_lowercase),
+            ("number", self.require_number),
+            ("special", self.require_special),
+        )
+
+        return [
+            {
+                "error": f"password_{name}_invalid",
+                "data": {
+                    "condition": f"{name}_count",
+                    "minimum_value": minimum
+                }
+            }
+            for (name, minimum), count in zip(requirements, counts)
+            if count < minimum
+        ]
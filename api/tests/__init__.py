@@ -7,9 +7,39 @@ Initialises the tests module.
 # Third Party Imports
 
 # Local Imports
+from .tests_cache import TestFragmentCache, TestLruTtlCache, TestStatementCache
+from .tests_codecs import TestCodecs
+from .tests_existence import TestBloomFilter, TestExistenceIndex
+from .tests_invalidation import TestInvalidationBus
+from .tests_key_material import TestKeyMaterialPool
+from .tests_models import TestModelsFromRows
+from .tests_password_policy import TestPasswordPolicy
+from .tests_single_flight import TestSingleFlight, TestUserReads
+from .tests_tickets import TestSessionTickets
+from .tests_types import TestSetMany
+from .tests_ws_actions import TestActions
 from .tests_ws_admin import TestAdminWs
+from .tests_ws_concurrency import TestConcurrentWorker
+from .tests_ws_send_queue import TestSendQueue
 
 # Constants
 __all__ = [
+    "TestActions",
     "TestAdminWs",
+    "TestConcurrentWorker",
+    "TestSendQueue",
+    "TestLruTtlCache",
+    "TestFragmentCache",
+    "TestStatementCache",
+    "TestSetMany",
+    "TestCodecs",
+    "TestBloomFilter",
+    "TestExistenceIndex",
+    "TestInvalidationBus",
+    "TestKeyMaterialPool",
+    "TestModelsFromRows",
+    "TestPasswordPolicy",
+    "TestSingleFlight",
+    "TestUserReads",
+    "TestSessionTickets",
 ]
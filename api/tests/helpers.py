@@ -0,0 +1,63 @@
+"""
+Contains the helpers shared by the tests that run workers without a database.
+"""
+
+# Standard Library Imports
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+# Third Party Imports
+from fastapi import WebSocket
+
+# Local Imports
+from api.ws_workers.base_worker import BaseWorker
+from api.ws_workers.encoding import Codec, accept
+
+# Constants
+__all__ = [
+    "NoDatabase",
+    "run_worker",
+]
+
+
+class NoDatabase:
+    """
+    Database handle for workers that never query. Leases hold no connection.
+    """
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator["NoDatabase"]:
+        """
+        Lease nothing, as no query is ever made.
+
+        Yields:
+            NoDatabase: This handle.
+        """
+        yield self
+
+
+async def run_worker(
+        websocket: WebSocket,
+        worker_class: type[BaseWorker],
+        codec: Codec | None = None,
+        **settings: any
+) -> None:
+    """
+    Accept a connection and run a worker on it until the client disconnects, as the app's routes do, but with no database.
+
+    Args:
+        websocket (WebSocket): Connection to accept.
+        worker_class (type[BaseWorker]): Worker to run.
+        codec (Codec | None): Codec to use. None agrees on one with the client, as the app does.
+        **settings (any): Worker attributes to override, e.g. `send_queue_max_messages=8`.
+    """
+    if codec is None:
+        codec = await accept(websocket)
+    else:
+        await websocket.accept()
+
+    worker: BaseWorker = worker_class(websocket, NoDatabase(), codec)
+    for name, value in settings.items():
+        setattr(worker, name, value)
+
+    await worker.run()
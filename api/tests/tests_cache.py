@@ -0,0 +1,156 @@
+"""
+Contains the tests for the in-process caches.
+"""
+
+# Standard Library Imports
+from json import loads
+from time import sleep
+from unittest import TestCase
+
+# Third Party Imports
+
+# Local Imports
+from api.db.cache import FragmentCache, LruTtlCache
+from api.db.types.base_type import SELECT_TEMPLATE, StatementCache
+from api.db.types.user import User
+from api.models.user import User as PublicUser
+from api.tests.tests_models import profile_row
+from api.ws_workers.encoding import JsonCodec, json_array
+
+# Constants
+__all__ = [
+    "TestLruTtlCache",
+    "TestFragmentCache",
+    "TestStatementCache",
+]
+
+
+class TestLruTtlCache(TestCase):
+    """
+    Test the LRU + TTL cache.
+    """
+
+    def test_hit_and_miss(self) -> None:
+        """
+        Test that stored entries are returned and missing entries are counted.
+        """
+        cache: LruTtlCache[str, int] = LruTtlCache(10, 60)
+        cache.set("a", 1, cache.generation)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_lru_eviction(self) -> None:
+        """
+        Test that the least recently used entry is evicted when the cache is full.
+        """
+        cache: LruTtlCache[str, int] = LruTtlCache(2, 60)
+        cache.set("a", 1, cache.generation)
+        cache.set("b", 2, cache.generation)
+
+        # Touch a so that b is the least recently used
+        cache.get("a")
+        cache.set("c", 3, cache.generation)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats()["evictions"] == 1
+
+    def test_ttl_expiry(self) -> None:
+        """
+        Test that entries expire after their time to live.
+        """
+        cache: LruTtlCache[str, int] = LruTtlCache(10, 0.01)
+        cache.set("a", 1, cache.generation)
+        sleep(0.02)
+
+        assert cache.get("a") is None
+        assert cache.stats()["expirations"] == 1
+
+    def test_stale_write_dropped(self) -> None:
+        """
+        Test that a value read before an invalidation is not stored after it.
+        """
+        cache: LruTtlCache[str, int] = LruTtlCache(10, 60)
+        generation: int = cache.generation
+
+        # A write lands while the read is in flight
+        cache.invalidate("a")
+        cache.set("a", 1, generation)
+
+        assert cache.get("a") is None
+
+
+class TestFragmentCache(TestCase):
+    """
+    Test the serialized fragment cache.
+    """
+
+    def test_serialized_once_per_instance(self) -> None:
+        """
+        Test that a model is serialized once, and again only when a new instance replaces it.
+        """
+        cache: FragmentCache = FragmentCache(10, 60)
+        row: dict = profile_row()
+        user: PublicUser = User.public_from_row(row)
+
+        assert cache.fragment(user) is cache.fragment(user)
+        assert cache.serializations == 1
+
+        # A write produces a new model instance
+        changed: PublicUser = User.public_from_row({**row, "bio": "Changed"})
+
+        assert loads(cache.fragment(changed))["bio"] == "Changed"
+        assert cache.serializations == 2
+
+    def test_spliced_message_matches_json(self) -> None:
+        """
+        Test that a message built from fragments decodes to the same value as one encoded in one go.
+        """
+        cache: FragmentCache = FragmentCache(10, 60)
+        users: list[PublicUser] = [User.public_from_row(profile_row()) for _ in range(3)]
+
+        payload: bytes = JsonCodec().encode_message(
+            {"action": "users", "cursor": None},
+            data=json_array(cache.fragment(user) for user in users)
+        )
+
+        assert loads(payload) == {
+            "action": "users",
+            "cursor": None,
+            "data": [user.model_dump(mode="json") for user in users],
+        }
+
+
+class TestStatementCache(TestCase):
+    """
+    Tests the rendered statement cache.
+    """
+
+    def test_plain_names(self) -> None:
+        """
+        Test that statements are keyed on plain names, and quoted once when first rendered.
+        """
+        cache: StatementCache = StatementCache()
+
+        first: str = cache.get(SELECT_TEMPLATE, ("secured", "verification_codes"), "user_id", "id", None)
+        second: str = cache.get(SELECT_TEMPLATE, ("secured", "verification_codes"), "user_id", "id", None)
+
+        assert first == second == 'SELECT "user_id" FROM "secured"."verification_codes" WHERE "id" = %s;'
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_update_many(self) -> None:
+        """
+        Test that multi-column updates are keyed on the column names.
+        """
+        cache: StatementCache = StatementCache()
+
+        statement: str = cache.get_update_many(("users",), ("bio", "icon"), "id", None)
+        cache.get_update_many(("users",), ("bio", "icon"), "id", None)
+        cache.get_update_many(("users",), ("icon", "bio"), "id", None)
+
+        assert statement == 'UPDATE "users" SET "bio" = %s, "icon" = %s WHERE "id" = %s RETURNING *;'
+        assert (cache.hits, cache.misses) == (1, 2)
@@ -0,0 +1,90 @@
+"""
+Contains the tests for the WebSocket message codecs.
+"""
+
+# Standard Library Imports
+from json import loads
+from unittest import TestCase, skipUnless
+
+# Third Party Imports
+
+# Local Imports
+from api.ws_workers.encoding import CODECS, DEFAULT_CODEC, JsonCodec, MsgPackCodec, OrjsonCodec, json_array, msgpack, negotiate_codec
+
+# Constants
+__all__ = [
+    "TestCodecs",
+]
+MESSAGE: dict = {
+    "action": "users",
+    "data": [{"id": "b8a0c4d2-2e0f-4f55-9d4c-0d6f7c1c8f7e", "bio": "Ünïcödé bio", "is_online": True, "icon": None}],
+    "cursor": None,
+}
+
+
+class TestCodecs(TestCase):
+    """
+    Test the codecs.
+    """
+
+    def test_json_codecs_match(self) -> None:
+        """
+        Test that the fast JSON codec produces exactly what the standard library codec (and so Starlette) produces.
+        """
+        assert OrjsonCodec().encode(MESSAGE) == JsonCodec().encode(MESSAGE)
+        assert OrjsonCodec().decode(JsonCodec().encode(MESSAGE)) == MESSAGE
+
+    def test_spliced_message(self) -> None:
+        """
+        Test that splicing encoded fragments gives the same message as encoding it whole.
+        """
+        fragments: bytes = json_array(JsonCodec().encode(user) for user in MESSAGE["data"])
+
+        for codec in (JsonCodec(), OrjsonCodec()):
+            assert loads(codec.encode_message({"action": "users", "cursor": None}, data=fragments)) == MESSAGE
+
+    def test_invalid_frame(self) -> None:
+        """
+        Test that undecodable frames raise ValueError.
+        """
+        for codec in CODECS.values():
+            with self.assertRaises(ValueError):
+                codec.decode(b"\xc1" if codec.binary else "{")
+
+    @skipUnless(msgpack is not None, "msgpack is not installed")
+    def test_msgpack_round_trip(self) -> None:
+        """
+        Test that MessagePack messages survive a round trip, including ones built from JSON fragments.
+        """
+        codec: MsgPackCodec = MsgPackCodec()
+        fragments: bytes = json_array(JsonCodec().encode(user) for user in MESSAGE["data"])
+
+        assert codec.decode(codec.encode(MESSAGE)) == MESSAGE
+        assert codec.decode(codec.encode_message({"action": "users", "cursor": None}, data=fragments)) == MESSAGE
+
+    def test_batch(self) -> None:
+        """
+        Test that a batch of encoded messages decodes to the array of the messages.
+        """
+        messages: list[dict] = [MESSAGE, {"action": "pong"}]
+
+        for codec in CODECS.values():
+            assert codec.decode(codec.encode_batch([codec.encode(message) for message in messages])) == messages
+
+    @skipUnless(msgpack is not None, "msgpack is not installed")
+    def test_msgpack_large_batch(self) -> None:
+        """
+        Test that MessagePack batches too long for a fixarray header still decode.
+        """
+        codec: MsgPackCodec = MsgPackCodec()
+
+        for count in (15, 16, 70000):
+            assert codec.decode(codec.encode_batch([codec.encode(index) for index in range(count)])) == list(range(count))
+
+    def test_negotiation(self) -> None:
+        """
+        Test that the first supported subprotocol is chosen, and the default codec otherwise.
+        """
+        assert negotiate_codec(["echo.unknown", "echo.json"]) is CODECS["echo.json"]
+        assert negotiate_codec(["echo.unknown"]) is DEFAULT_CODEC
+        assert negotiate_codec([]) is DEFAULT_CODEC
@@ -0,0 +1,146 @@
+"""
+Contains the tests for the existence index.
+"""
+
+# Standard Library Imports
+from unittest import TestCase
+from uuid import uuid4
+
+# Third Party Imports
+
+# Local Imports
+from api.db.existence import BloomFilter, ExistenceIndex
+
+# Constants
+__all__ = [
+    "TestBloomFilter",
+    "TestExistenceIndex",
+]
+
+
+class TestBloomFilter(TestCase):
+    """
+    Test the bloom filter.
+    """
+
+    def test_no_false_negatives(self) -> None:
+        """
+        Test that every added item is reported as present.
+        """
+        bloom: BloomFilter = BloomFilter(1000, 0.01)
+        items: list[str] = [str(uuid4()) for _ in range(1000)]
+        for item in items:
+            bloom.add(item)
+
+        assert all(item in bloom for item in items)
+
+    def test_count_distinct(self) -> None:
+        """
+        Test that adding an item again does not count it twice.
+        """
+        bloom: BloomFilter = BloomFilter(1000, 0.01)
+
+        assert bloom.add("a")
+        assert not bloom.add("a")
+        assert bloom.count == 1
+
+    def test_false_positive_rate(self) -> None:
+        """
+        Test that the false positive rate at capacity stays near the target.
+        """
+        bloom: BloomFilter = BloomFilter(1000, 0.01)
+        for _ in range(1000):
+            bloom.add(str(uuid4()))
+
+        false_positives: int = sum(str(uuid4()) in bloom for _ in range(10000))
+
+        assert false_positives < 300  # 3%, well clear of the 1% target to keep the test stable
+        assert bloom.estimated_error_rate() < 0.02
+
+
+class TestExistenceIndex(TestCase):
+    """
+    Test the existence index.
+    """
+
+    def test_unbuilt_index_defers_to_database(self) -> None:
+        """
+        Test that an index which has not been built never claims a user is missing.
+        """
+        index: ExistenceIndex = ExistenceIndex(1000, 0.01, 100, 60)
+
+        assert index.might_exist("id", uuid4())
+        assert index.might_exist("email", "nobody@example.com")
+        assert index.stats()["definite_misses"] == 0
+
+    def ready_index(self) -> ExistenceIndex:
+        """
+        Create an index that trusts its filters without being built from the database.
+        """
+        index: ExistenceIndex = ExistenceIndex(1000, 0.01, 100, 60)
+        index._ready = True
+
+        return index
+
+    def test_definite_miss(self) -> None:
+        """
+        Test that a ready index rules out users it has never seen, and defers to the database for those it has.
+        """
+        index: ExistenceIndex = self.ready_index()
+        known: str = str(uuid4())
+        index.add(known, "known@example.com")
+
+        assert not index.might_exist("id", uuid4())
+        assert not index.might_exist("email", "nobody@example.com")
+        assert index.might_exist("id", known)
+        assert index.might_exist("email", "known@example.com")
+        assert index.stats()["definite_misses"] == 2
+
+    def test_negative_cache(self) -> None:
+        """
+        Test that removed users and database misses are remembered as missing, until the user is added again.
+        """
+        index: ExistenceIndex = self.ready_index()
+        user: str = str(uuid4())
+        index.add(user, "user@example.com")
+
+        index.remove(user, "user@example.com")
+        assert not index.might_exist("id", user)
+        assert not index.might_exist("email", "user@example.com")
+        assert index.stats()["negative_hits"] == 2
+        assert index.stats()["deleted"] == 1
+
+        index.add(user, "user@example.com")
+        assert index.might_exist("id", user)
+        assert index.might_exist("email", "user@example.com")
+
+        # A key the filters let through, answered as missing by the database
+        index.record("email", "user@example.com", False, index.generation)
+        assert not index.might_exist("email", "user@example.com")
+        assert index.stats()["filter_hits_db_miss"] == 1
+
+    def test_events(self) -> None:
+        """
+        Test that updates and echoes of local adds do not change the counts, while a changed email is added.
+        """
+        index: ExistenceIndex = self.ready_index()
+        user: str = str(uuid4())
+
+        # Added locally, then the change event for the same insert arrives
+        index.add(user, "old@example.com")
+        index.apply_event({"op": "insert", "id": user, "email": "old@example.com"})
+        assert (index.stats()["ids"], index.stats()["emails"]) == (1, 1)
+
+        # A profile or password update
+        for _ in range(3):
+            index.apply_event({"op": "update", "id": user, "email": "old@example.com"})
+        assert (index.stats()["ids"], index.stats()["emails"]) == (1, 1)
+
+        # An email change
+        index.apply_event({"op": "update", "id": user, "email": "new@example.com"})
+        assert (index.stats()["ids"], index.stats()["emails"]) == (1, 2)
+        assert index.might_exist("email", "new@example.com")
+
+        index.apply_event({"op": "delete", "id": user, "email": "new@example.com"})
+        assert not index.might_exist("id", user)
+        assert (index.stats()["ids"], index.stats()["emails"]) == (1, 2)
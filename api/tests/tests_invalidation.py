@@ -0,0 +1,89 @@
+"""
+Contains the cross-process cache invalidation tests.
+"""
+
+# Standard Library Imports
+from asyncio import sleep
+from unittest import IsolatedAsyncioTestCase
+from uuid import UUID
+
+# Third Party Imports
+from psycopg import AsyncConnection
+
+# Local Imports
+from api.db.cache import LruTtlCache
+from api.db.database import connection_kwargs
+from api.db.invalidation import InvalidationBus
+
+# Constants
+__all__ = [
+    "TestInvalidationBus"
+]
+
+
+class TestInvalidationBus(IsolatedAsyncioTestCase):
+    """
+    Test that a write made by one app instance invalidates the caches of every other instance sharing the database.
+    """
+
+    async def test_cross_instance_invalidation(self) -> None:
+        """
+        Test that updating a user drops it from the caches of two independent instances.
+        """
+        # Two instances, each with their own bus and cache, as two worker processes would have
+        caches: list[LruTtlCache[UUID, str]] = [LruTtlCache(10, 60), LruTtlCache(10, 60)]
+        buses: list[InvalidationBus] = [InvalidationBus(), InvalidationBus()]
+        for bus, cache in zip(buses, caches):
+            bus.subscribe("users", cache)
+            await bus.start()
+
+        # Wait for both buses to be listening
+        for _ in range(100):
+            if all(bus.stats()["connected"] for bus in buses):
+                break
+            await sleep(0.01)
+
+        writer: AsyncConnection
+        async with await AsyncConnection.connect(**connection_kwargs()) as writer:
+            # Cache a user in both instances
+            user_id: UUID = (await (await writer.execute("SELECT id FROM users LIMIT 1;")).fetchone())["id"]
+            for cache in caches:
+                cache.set(user_id, "cached", cache.generation)
+
+            # Write to the user outside of either instance
+            await writer.execute("UPDATE users SET bio = bio WHERE id = %s;", [user_id])
+
+        # Both instances should drop the user within milliseconds
+        for _ in range(100):
+            if all(cache.get(user_id) is None for cache in caches):
+                break
+            await sleep(0.01)
+
+        for bus in buses:
+            await bus.stop()
+
+        assert all(cache.get(user_id) is None for cache in caches)
+
+    async def test_failing_listener(self) -> None:
+        """
+        Test that a listener that raises is logged and counted, and does not stop the other listeners or the caches.
+        """
+        bus: InvalidationBus = InvalidationBus()
+        cache: LruTtlCache[UUID, str] = LruTtlCache(10, 60)
+        seen: list[dict] = []
+        user_id: UUID = UUID(int=1)
+
+        def failing(event: dict) -> None:
+            raise RuntimeError("broken listener")
+
+        bus.subscribe("users", cache)
+        bus.listen("users", failing)
+        bus.listen("users", seen.append)
+        cache.set(user_id, "cached", cache.generation)
+
+        with self.assertLogs("api.db.invalidation", "ERROR"):
+            bus.dispatch(f'{{"table": "users", "op": "update", "id": "{user_id}", "version": 1}}')
+
+        assert cache.get(user_id) is None
+        assert len(seen) == 1
+        assert bus.stats()["callback_errors"] == 1
@@ -0,0 +1,71 @@
+"""
+Contains the tests for the pool of pre-generated handshake key material.
+"""
+
+# Standard Library Imports
+from asyncio import sleep
+from time import monotonic
+from unittest import IsolatedAsyncioTestCase
+
+# Third Party Imports
+from rsa import PrivateKey, PublicKey, decrypt, newkeys
+
+# Local Imports
+from api.security.key_material import KeyMaterialPool
+
+# Constants
+__all__ = [
+    "TestKeyMaterialPool",
+]
+
+# Small keys keep the test quick, the pool does not depend on the size
+KEYS: tuple[PublicKey, PrivateKey] = newkeys(512)
+
+
+class TestKeyMaterialPool(IsolatedAsyncioTestCase):
+    """
+    Test the key material pool.
+    """
+
+    async def wait_until_full(
+            self,
+            pool: KeyMaterialPool
+    ) -> None:
+        """
+        Wait for the pool to fill in the background.
+        """
+        deadline: float = monotonic() + 5
+        while pool.stats()["ready"] < pool.stats()["capacity"] and monotonic() < deadline:
+            await sleep(0.01)
+
+    async def test_secret_decrypts(self) -> None:
+        """
+        Test that the encrypted secret decrypts to the secret, and that an empty pool still hands one out.
+        """
+        pool: KeyMaterialPool = KeyMaterialPool(KEYS[0], 32, 2)
+
+        secret, encrypted = await pool.take()
+
+        assert len(secret) == 32
+        assert decrypt(encrypted, KEYS[1]) == secret
+        assert pool.stats()["misses"] == 1
+
+        await pool.stop()
+
+    async def test_refilled(self) -> None:
+        """
+        Test that the pool fills in the background, hands each secret out once and refills after a take.
+        """
+        pool: KeyMaterialPool = KeyMaterialPool(KEYS[0], 32, 4)
+        await pool.start()
+        await self.wait_until_full(pool)
+
+        secrets: set[bytes] = {(await pool.take())[0] for _ in range(4)}
+        assert len(secrets) == 4
+        assert pool.stats()["misses"] == 0
+
+        await self.wait_until_full(pool)
+        assert pool.stats()["ready"] == 4
+
+        await pool.stop()
+        assert pool.stats()["ready"] == 0
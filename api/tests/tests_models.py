@@ -0,0 +1,89 @@
+"""
+Contains the tests for building models from database rows.
+"""
+
+# Standard Library Imports
+from datetime import datetime, timezone
+from unittest import TestCase
+from uuid import uuid4
+
+# Third Party Imports
+
+# Local Imports
+from api.db.types.user import User
+from api.models.base import from_row
+from api.models.secure import PrivateUser
+from api.models.user import Status, StatusType, User as PublicUser
+
+# Constants
+__all__ = [
+    "TestModelsFromRows",
+]
+
+
+def profile_row() -> dict:
+    """
+    Build a profile row shaped like the ones returned by `User.get_profile_row`.
+
+    Returns:
+        dict: Profile row.
+    """
+    now: datetime = datetime.now(timezone.utc)
+
+    return {
+        "id": uuid4(),
+        "created_at": now,
+        "email": "test@example.com",
+        "username": "test",
+        "icon": None,
+        "bio": "Hello",
+        "status": {"type": 1, "text": "Testing"},
+        "last_online": now,
+        "is_online": True,
+        "is_banned": False,
+        "is_verified": True,
+        "password_last_updated": now,
+    }
+
+
+class TestModelsFromRows(TestCase):
+    """
+    Test that models built from rows match the ones built field by field.
+    """
+
+    def test_public_user_matches_keyword_construction(self) -> None:
+        """
+        Test that a public user built from a row equals one built from keyword arguments.
+        """
+        row: dict = profile_row()
+        expected: PublicUser = PublicUser(
+            id=row["id"],
+            created_at=row["created_at"],
+            email=row["email"],
+            username=row["username"],
+            icon=row["icon"],
+            bio=row["bio"],
+            status=Status(**row["status"]),
+            last_online=row["last_online"],
+            is_online=row["is_online"],
+            is_banned=row["is_banned"],
+            is_verified=row["is_verified"]
+        )
+
+        assert User.public_from_row(row) == expected
+
+    def test_extra_columns_ignored(self) -> None:
+        """
+        Test that columns the model does not declare are ignored.
+        """
+        private: PrivateUser = from_row(PrivateUser, {**profile_row(), "tokens": []})
+
+        assert private.model_dump() == {"tokens": []}
+
+    def test_status_from_row(self) -> None:
+        """
+        Test that a stored status is converted to the enum.
+        """
+        status: Status = from_row(Status, {"type": 3, "text": "Busy"})
+
+        assert status.type is StatusType.dnd
@@ -0,0 +1,117 @@
+"""
+Contains the tests for the password policy.
+"""
+
+# Standard Library Imports
+from unittest import TestCase
+
+# Third Party Imports
+from fastapi import FastAPI, WebSocket
+from fastapi.testclient import TestClient
+
+# Local Imports
+from api.security.password_policy import PasswordPolicy, count_character_classes
+from api.tests.helpers import run_worker
+from api.ws_workers.users_worker import UsersWorker
+
+# Constants
+__all__ = [
+    "TestPasswordPolicy",
+]
+
+
+def count_with_loop(
+        password: str
+) -> tuple[int, int, int, int]:
+    """
+    Count character classes the way `UsersWorker.new_user` used to, one character at a time.
+    """
+    uppercase: int = 0
+    lowercase: int = 0
+    number: int = 0
+    special: int = 0
+
+    for char in password:
+        if char.isupper():
+            uppercase += 1
+        elif char.islower():
+            lowercase += 1
+        elif char.isdigit():
+            number += 1
+        else:
+            special += 1
+
+    return uppercase, lowercase, number, special
+
+
+app: FastAPI = FastAPI()
+
+
+@app.websocket("/")
+async def users_ws(
+        websocket: WebSocket
+) -> None:
+    """
+    Run a users worker with no database, so any attempt to create a user fails loudly.
+
+    Args:
+        websocket (WebSocket): Connection.
+    """
+    await run_worker(websocket, UsersWorker)
+
+
+class TestPasswordPolicy(TestCase):
+    """
+    Test the password policy.
+    """
+
+    def test_counts_match_loop(self) -> None:
+        """
+        Test that the counts match a per-character loop, for ASCII and non-ASCII passwords.
+        """
+        for password in ("", "Abc.123 xyz!", "".join(map(chr, range(128))), "ÄbÇ.١٢٣ ẞß_Ωω", "x\U0001F600Y"):
+            assert count_character_classes(password) == count_with_loop(password), password
+
+    def test_length_checked_first(self) -> None:
+        """
+        Test that a password of the wrong length only fails on length.
+        """
+        policy: PasswordPolicy = PasswordPolicy(10, 20, 2, 2, 2, 2)
+
+        for password in ("short", "a" * 21):
+            assert [failure["error"] for failure in policy.check(password)] == ["password_length_invalid"]
+
+    def test_complexity(self) -> None:
+        """
+        Test that every unmet requirement is reported, and a valid password passes.
+        """
+        policy: PasswordPolicy = PasswordPolicy(10, 20, 2, 2, 2, 2)
+
+        assert [failure["error"] for failure in policy.check("abcdefghij1")] == [
+            "password_uppercase_invalid",
+            "password_number_invalid",
+            "password_special_invalid",
+        ]
+        assert policy.check("ABcd12!?xyz") == []
+
+    def test_registration_rejected(self) -> None:
+        """
+        Test that registering with a password failing the complexity checks reports every failure and creates no user.
+        """
+        with TestClient(app) as client, client.websocket_connect("/") as connection:
+            connection.send_json(
+                {
+                    "action": "new",
+                    "data": {"username": "weak", "email": "weak@example.com", "password": "abcdefghijkl"},
+                }
+            )
+
+            assert [connection.receive_json()["error"] for _ in range(3)] == [
+                "password_uppercase_invalid",
+                "password_number_invalid",
+                "password_special_invalid",
+            ]
+
+            # The handler returned without reaching the database, so the next message is answered normally
+            connection.send_json({"action": "ping"})
+            assert connection.receive_json() == {"action": "pong"}
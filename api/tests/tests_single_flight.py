@@ -0,0 +1,114 @@
+"""
+Contains the single-flight coalescer tests.
+"""
+
+# Standard Library Imports
+from asyncio import Event, Task, create_task, gather, sleep
+from unittest import IsolatedAsyncioTestCase
+from uuid import UUID, uuid4
+
+# Third Party Imports
+from psycopg import AsyncConnection
+from psycopg.rows import DictRow
+
+# Local Imports
+from api.db.database import connection_kwargs
+from api.db.handlers.user_handler import USER_READS, UsersHandler
+from api.db.single_flight import SingleFlight
+from api.db.types.user import User
+from api.models.user import User as PublicUser
+
+# Constants
+__all__ = [
+    "TestSingleFlight",
+    "TestUserReads",
+]
+
+
+class TestSingleFlight(IsolatedAsyncioTestCase):
+    """
+    Test the single-flight coalescer.
+    """
+
+    async def test_concurrent_calls_coalesced(self) -> None:
+        """
+        Test that concurrent calls for one key share a single execution.
+        """
+        single_flight: SingleFlight[int] = SingleFlight()
+        executions: list[int] = []
+
+        async def query() -> int:
+            """
+            Slow stand-in for a database query.
+            """
+            executions.append(1)
+            await sleep(0.01)
+            return 42
+
+        results: list[int] = await gather(*[single_flight.run("user", query) for _ in range(20)])
+
+        assert results == [42] * 20
+        assert len(executions) == 1
+        assert single_flight.stats()["coalesced"] == 19
+
+    async def test_exception_shared(self) -> None:
+        """
+        Test that every waiter sees the exception raised by the shared call.
+        """
+        single_flight: SingleFlight[int] = SingleFlight()
+
+        async def query() -> int:
+            """
+            Failing stand-in for a database query.
+            """
+            await sleep(0.01)
+            raise LookupError("missing")
+
+        results: list = await gather(*[single_flight.run("user", query) for _ in range(3)], return_exceptions=True)
+
+        assert all(isinstance(result, LookupError) for result in results)
+
+
+class TestUserReads(IsolatedAsyncioTestCase):
+    """
+    Test that coalesced user reads keep read-your-writes inside transactions.
+    """
+
+    async def test_read_own_write_during_flight(self) -> None:
+        """
+        Test that a read inside a transaction sees its own uncommitted write, rather than joining a flight for the same key
+        started elsewhere.
+        """
+        email: str = f"{uuid4()}@example.com"
+        release: Event = Event()
+
+        async def outside() -> None:
+            """
+            Stand-in for the same read in flight on another connection, which cannot see the write.
+            """
+            await release.wait()
+            return None
+
+        connection: AsyncConnection
+        async with await AsyncConnection.connect(**connection_kwargs()) as connection:
+            async with connection.transaction(force_rollback=True):
+                row: DictRow = await (await connection.execute("SELECT id FROM users LIMIT 1;")).fetchone()
+                user_id: UUID = row["id"]
+                await connection.execute("UPDATE users SET email = %s, bio = %s WHERE id = %s;", [email, email, user_id])
+
+                flights: list[Task] = [
+                    create_task(USER_READS.run(("email", email), outside)),
+                    create_task(USER_READS.run(("profile", str(user_id)), outside)),
+                ]
+                await sleep(0)
+
+                handler: UsersHandler = UsersHandler(connection)
+                try:
+                    found: User = await handler.email_get(email)
+                    public: PublicUser = await handler.id_get_public(user_id)
+                finally:
+                    release.set()
+                    await gather(*flights)
+
+                assert found.id == user_id
+                assert public.bio == email
@@ -0,0 +1,53 @@
+"""
+Contains the tests for the admin session tickets.
+"""
+
+# Standard Library Imports
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from unittest import TestCase
+
+# Third Party Imports
+
+# Local Imports
+from api.security.tickets import SessionTickets
+
+# Constants
+__all__ = [
+    "TestSessionTickets",
+]
+
+
+class TestSessionTickets(TestCase):
+    """
+    Test the session tickets.
+    """
+
+    def test_round_trip(self) -> None:
+        """
+        Test that a ticket verifies until it expires, and is unique.
+        """
+        tickets: SessionTickets = SessionTickets(b"key", 300)
+        ticket: str = tickets.issue(now=1000)
+
+        assert tickets.verify(ticket, now=1000)
+        assert tickets.verify(ticket, now=1299)
+        assert not tickets.verify(ticket, now=1300)
+        assert tickets.issue(now=1000) != ticket
+        assert tickets.stats() == {"issued": 2, "accepted": 2, "rejected": 1}
+
+    def test_forged(self) -> None:
+        """
+        Test that tickets signed with another key, tampered with or malformed are rejected.
+        """
+        tickets: SessionTickets = SessionTickets(b"key", 300)
+        ticket: str = tickets.issue(now=1000)
+
+        assert not SessionTickets(b"other", 300).verify(ticket, now=1000)
+
+        # Push the expiry forward without re-signing
+        raw: bytearray = bytearray(urlsafe_b64decode(ticket))
+        raw[0] = 0xff
+        assert not tickets.verify(urlsafe_b64encode(bytes(raw)).decode(), now=1000)
+
+        for malformed in ("", "not base64!", ticket[:-8], urlsafe_b64encode(b"short").decode()):
+            assert not tickets.verify(malformed, now=1000)
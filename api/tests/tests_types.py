@@ -0,0 +1,66 @@
+"""
+Contains the tests for writing rows through the DB types.
+"""
+
+# Standard Library Imports
+from unittest import IsolatedAsyncioTestCase
+
+# Third Party Imports
+from psycopg import AsyncConnection
+from psycopg.rows import DictRow
+
+# Local Imports
+from api.db.cache import PROFILE_CACHE
+from api.db.database import connection_kwargs
+from api.db.types.user import User
+from api.models.user import Status, StatusType, User as PublicUser
+
+# Constants
+__all__ = [
+    "TestSetMany",
+]
+
+
+class TestSetMany(IsolatedAsyncioTestCase):
+    """
+    Test setting several columns in a single statement.
+    """
+
+    async def test_patch(self) -> None:
+        """
+        Test that patching a user updates every column, returns the new row, and drops the stale cached profile.
+        """
+        connection: AsyncConnection
+        async with await AsyncConnection.connect(**connection_kwargs()) as connection:
+            # Roll back the update so the test user is left as it was
+            async with connection.transaction(force_rollback=True):
+                row: DictRow = await (await connection.execute("SELECT id, created_at FROM users LIMIT 1;")).fetchone()
+                user: User = User(connection, row)
+
+                # Cache the profile as it is before the update
+                before: PublicUser = await user.to_public()
+                status: Status = Status(type=StatusType.dnd, text="Patched")
+
+                updated: DictRow = await user.patch(bio="Patched bio", status=status)
+
+                assert updated["id"] == user.id
+                assert updated["bio"] == "Patched bio"
+                assert updated["status"] == {"type": StatusType.dnd.value, "text": "Patched"}
+                assert updated["username"] == before.username
+
+                after: PublicUser = await user.to_public()
+                assert after is not before
+                assert after.bio == "Patched bio"
+                assert after.status == status
+
+            # The cached profile holds the rolled back values
+            PROFILE_CACHE.invalidate(user.id)
+
+    async def test_no_values(self) -> None:
+        """
+        Test that an update with no columns is refused before reaching the database.
+        """
+        user: User = User(None, {"id": None, "created_at": None})
+
+        with self.assertRaises(ValueError):
+            await user.id_set_many({}, user.id)
@@ -0,0 +1,177 @@
+"""
+Contains the tests for the worker action registry.
+"""
+
+# Standard Library Imports
+from asyncio import run
+from unittest import TestCase
+
+# Third Party Imports
+from fastapi import FastAPI, WebSocket
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+# Local Imports
+from api.models.validation.bases import BaseMessage
+from api.tests.helpers import NoDatabase, run_worker
+from api.ws_workers.actions import ACTIONS, action, action_stats
+from api.ws_workers.base_worker import BaseWorker
+
+# Constants
+__all__ = [
+    "TestActions",
+]
+
+
+class AddInputData(BaseModel):
+    """
+    Model for the numbers to add.
+    """
+    a: int
+    b: int
+
+
+class AddInput(BaseMessage):
+    """
+    Model for adding numbers.
+    """
+    data: AddInputData
+
+
+class AddOutputData(BaseModel):
+    """
+    Model for the sum.
+    """
+    total: int
+
+
+class AddWorker(BaseWorker):
+    """
+    Worker with a validated action, an unvalidated one and one that fails.
+    """
+
+    @action("add", AddInput, AddOutputData, response_action="sum")
+    async def add(
+            self,
+            data: AddInput
+    ) -> None:
+        """
+        Add two numbers, refusing negative ones.
+
+        Args:
+            data (AddInput): Message.
+        """
+        if data.data.a < 0:
+            await self.send({"action": "sum", "error": "negative"})
+            return
+
+        await self.reply(AddOutputData(total=data.data.a + data.data.b))
+
+    @action("echo")
+    async def echo(
+            self,
+            data: dict
+    ) -> None:
+        """
+        Send the message data back.
+
+        Args:
+            data (dict): Message.
+        """
+        await self.reply(data.get("data"))
+
+
+class EchoWorker(AddWorker):
+    """
+    Worker that inherits its parent's actions and overrides one.
+    """
+
+    @action("echo")
+    async def shout(
+            self,
+            data: dict
+    ) -> None:
+        """
+        Send the message data back in uppercase.
+
+        Args:
+            data (dict): Message.
+        """
+        await self.send({"action": "echo", "data": str(data.get("data")).upper()})
+
+
+app: FastAPI = FastAPI()
+
+
+@app.websocket("/")
+async def add_ws(
+        websocket: WebSocket
+) -> None:
+    """
+    Run the worker.
+
+    Args:
+        websocket (WebSocket): Connection.
+    """
+    await run_worker(websocket, AddWorker)
+
+
+class TestActions(TestCase):
+    """
+    Test the action registry.
+    """
+
+    def test_registry(self) -> None:
+        """
+        Test that subclasses inherit actions and can override them without changing their parent's.
+        """
+        assert set(AddWorker.actions) == {"add", "echo"}
+        assert set(EchoWorker.actions) == {"add", "echo"}
+        assert EchoWorker.actions["add"] is AddWorker.actions["add"]
+        assert EchoWorker.actions["echo"].handler is EchoWorker.shout
+        assert AddWorker.actions["echo"].handler is AddWorker.echo
+        assert ACTIONS["AddWorker"] is AddWorker.actions
+
+    def test_dispatch(self) -> None:
+        """
+        Test that messages are validated, handled and answered with the response model.
+        """
+        with TestClient(app) as client, client.websocket_connect("/") as connection:
+            connection.send_json({"action": "add", "data": {"a": 1, "b": 2}, "request_id": 1})
+            assert connection.receive_json() == {"action": "sum", "request_id": 1, "data": {"total": 3}}
+
+            connection.send_json({"action": "echo", "data": "hi"})
+            assert connection.receive_json() == {"action": "echo", "data": "hi"}
+
+            connection.send_json({"action": "add", "data": {"a": "one"}})
+            assert connection.receive_json() == {"error": "Invalid data."}
+
+            connection.send_json({"action": "unknown"})
+            assert connection.receive_json() == {"error": "Invalid action."}
+
+    def test_reply_outside_action(self) -> None:
+        """
+        Test that replying with no action being handled fails with a descriptive error.
+        """
+        worker: AddWorker = AddWorker(None, NoDatabase())
+
+        with self.assertRaisesRegex(RuntimeError, "outside an action handler"):
+            run(worker.reply({"total": 3}))
+
+    def test_counters(self) -> None:
+        """
+        Test that calls, invalid messages and error responses are counted per action.
+        """
+        before: dict[str, int | float] = action_stats()["AddWorker"]["add"]
+
+        with TestClient(app) as client, client.websocket_connect("/") as connection:
+            for message in ({"a": 1, "b": 1}, {"a": -1, "b": 1}, {}):
+                connection.send_json({"action": "add", "data": message})
+                connection.receive_json()
+
+        after: dict[str, int | float] = action_stats()["AddWorker"]["add"]
+        assert after["calls"] - before["calls"] == 3
+        assert after["invalid"] - before["invalid"] == 1
+        assert after["error_responses"] - before["error_responses"] == 2  # The invalid message is answered with an error too
+        assert after["exceptions"] == before["exceptions"]
+        assert after["latency_max_ms"] > 0
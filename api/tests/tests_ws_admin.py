@@ -28,12 +28,9 @@ def run_authenticated_test(
     """
     Runs a test with data to send and expected responses.
     """
-    # Create test client
-    client: TestClient = TestClient(app)
-
-    # Connect to the endpoint
+    # Create a test client and connect to the endpoint
     connection: WebSocketTestSession
-    with client.websocket_connect("/admin/") as connection:
+    with TestClient(app) as client, client.websocket_connect("/admin/") as connection:
         # Get the challenge
         challenge: bytes = connection.receive_bytes()
 
@@ -57,31 +54,27 @@ def run_authenticated_test(
 class TestAdminWs(IsolatedAsyncioTestCase):
     """
     Test the admin WS endpoints.
+
+    Each test enters its `TestClient`, so that the app lifespan opens the connection pool before connecting.
     """
 
     def test_admin_connect(self) -> None:
         """
         Test the admin WS connection.
         """
-        # Create a test client
-        client: TestClient = TestClient(app)
-
-        # Make the request
+        # Create a test client and connect to the endpoint
         connection: WebSocketTestSession
 
-        with client.websocket_connect("/admin/") as connection:
+        with TestClient(app) as client, client.websocket_connect("/admin/") as connection:
             return
 
     def test_admin_auth_success(self) -> None:
         """
         Tests the auth flow for admin connection with a successful auth attempt.
         """
-        # Create test client
-        client: TestClient = TestClient(app)
-
-        # Connect to the endpoint
+        # Create a test client and connect to the endpoint
         connection: WebSocketTestSession
-        with client.websocket_connect("/admin/") as connection:
+        with TestClient(app) as client, client.websocket_connect("/admin/") as connection:
             # Get the challenge
             challenge: bytes = connection.receive_bytes()
 
@@ -101,12 +94,9 @@ class TestAdminWs(IsolatedAsyncioTestCase):
         """
         Tests the auth flow for admin connection with a failed auth attempt.
         """
-        # Create test client
-        client: TestClient = TestClient(app)
-
-        # Connect to the endpoint
+        # Create a test client and connect to the endpoint
         connection: WebSocketTestSession
-        with client.websocket_connect("/admin/") as connection:
+        with TestClient(app) as client, client.websocket_connect("/admin/") as connection:
             # Get the challenge
             challenge: bytes = connection.receive_bytes()
 
@@ -155,6 +145,25 @@ class TestAdminWs(IsolatedAsyncioTestCase):
         assert isinstance(data["data"], list)
         assert len(data["data"]) == 10
 
+    def test_admin_get_users_cursor(self) -> None:
+        """
+        Test the admin WS get_users action with cursor pagination.
+        """
+        # Get the first two pages
+        first: dict = run_authenticated_test({"action": "get_users", "data": {"page_size": 5}})
+        second: dict = run_authenticated_test({"action": "get_users", "data": {"page_size": 5, "cursor": first["cursor"]}})
+
+        # Check the pages do not overlap
+        assert len(first["data"]) == 5
+        assert not {user["id"] for user in first["data"]} & {user["id"] for user in second["data"]}
+
+    def test_admin_get_users_bad_cursor(self) -> None:
+        """
+        Test the admin WS get_users action rejects a malformed cursor.
+        """
+        # Run authenticated test
+        assert run_authenticated_test({"action": "get_users", "data": {"page_size": 5, "cursor": "garbage"}}) == {"error": "Invalid cursor."}
+
     def test_admin_delete_user_bad_data(self) -> None:
         """
         Test the admin WS delete_user action raises bad data when no data is provided.
@@ -172,3 +181,27 @@ class TestAdminWs(IsolatedAsyncioTestCase):
 
         # Run authenticated test
         assert run_authenticated_test({"action": "delete_user", "data": {"id": user_id}}) == {"action": "delete_user", "data": {"success": True}}
+
+    def test_admin_ticket_resume(self) -> None:
+        """
+        Test that a session ticket lets a reconnect skip the handshake, and that a bad ticket falls back to it.
+        """
+        # Get a ticket from an authenticated session
+        data: dict = run_authenticated_test({"action": "ticket"})
+        assert data["action"] == "ticket"
+        assert data["data"]["expires_in"] == CONFIG.auth.ticket_ttl
+
+        # Reconnect with the ticket
+        connection: WebSocketTestSession
+        with TestClient(app) as client:
+            with client.websocket_connect("/admin/", headers={"X-Admin-Ticket": data["data"]["ticket"]}) as connection:
+                assert connection.receive_json() == {"message": "Authenticated."}
+
+                connection.send_json({"action": "ping"})
+                assert connection.receive_json() == {"action": "pong"}
+
+            # A forged ticket gets the challenge instead
+            with client.websocket_connect("/admin/", headers={"X-Admin-Ticket": "forged"}) as connection:
+                challenge: bytes = decrypt(connection.receive_bytes(), CONFIG.server.owner_private_key)
+                connection.send_bytes(md5(challenge).digest())
+                assert connection.receive_json() == {"message": "Authenticated."}
@@ -0,0 +1,161 @@
+"""
+Contains the tests for concurrent message handling in the base worker.
+"""
+
+# Standard Library Imports
+from asyncio import Event, sleep
+from time import monotonic, sleep as blocking_sleep
+from unittest import TestCase
+
+# Third Party Imports
+from fastapi import FastAPI, WebSocket
+from fastapi.testclient import TestClient
+
+# Local Imports
+from api.tests.helpers import run_worker
+from api.ws_workers.base_worker import BaseWorker
+
+# Constants
+__all__ = [
+    "TestConcurrentWorker",
+]
+
+
+class GateWorker(BaseWorker):
+    """
+    Worker whose `wait` action blocks until an `open` action arrives.
+    """
+    ordered_actions = frozenset({"step"})
+
+    # Shared with the test, as the worker lives in the app
+    gate: Event | None = None
+    cancelled: list[str] = []
+    steps: list[int] = []
+
+    async def handle_message(
+            self,
+            data: dict
+    ) -> None:
+        """
+        Handle a message.
+
+        Args:
+            data (dict): Message.
+        """
+        match data["action"]:
+            case "wait":
+                try:
+                    await self.gate.wait()
+                except BaseException:
+                    GateWorker.cancelled.append(data["request_id"])
+                    raise
+                await self.send({"action": "waited"})
+            case "open":
+                self.gate.set()
+                await self.send({"action": "opened"})
+            case "step":
+                # Later steps finish sooner, so only the lock keeps them in order
+                await sleep(0.01 * (5 - data["step"]))
+                GateWorker.steps.append(data["step"])
+                await self.send({"action": "stepped", "step": data["step"]})
+
+
+app: FastAPI = FastAPI()
+
+
+@app.websocket("/")
+async def gate_ws(
+        websocket: WebSocket
+) -> None:
+    """
+    Run a worker with a fresh gate.
+
+    Args:
+        websocket (WebSocket): Connection.
+    """
+    GateWorker.gate = Event()
+    await run_worker(websocket, GateWorker, max_in_flight=4, max_frame_size=256)
+
+
+class TestConcurrentWorker(TestCase):
+    """
+    Test concurrent message handling.
+    """
+
+    def setUp(self) -> None:
+        """
+        Forget what earlier tests recorded.
+        """
+        GateWorker.cancelled = []
+        GateWorker.steps = []
+
+    def test_slow_message_does_not_block(self) -> None:
+        """
+        Test that a ping and later messages are handled while an earlier message is still in flight.
+        """
+        with TestClient(app) as client, client.websocket_connect("/") as connection:
+            connection.send_json({"action": "wait", "request_id": "a"})
+            connection.send_json({"action": "ping"})
+            assert connection.receive_json() == {"action": "pong"}
+
+            connection.send_json({"action": "open", "request_id": 7})
+            responses: list[dict] = [connection.receive_json(), connection.receive_json()]
+
+            assert {"action": "opened", "request_id": 7} in responses
+            assert {"action": "waited", "request_id": "a"} in responses
+
+    def test_ordered_actions(self) -> None:
+        """
+        Test that ordered actions are handled in arrival order even when sent concurrently.
+        """
+        with TestClient(app) as client, client.websocket_connect("/") as connection:
+            for step in range(4):
+                connection.send_json({"action": "step", "step": step, "request_id": step})
+
+            responses: list[dict] = [connection.receive_json() for _ in range(4)]
+
+            assert [response["step"] for response in responses] == [0, 1, 2, 3]
+            assert all(response["request_id"] == response["step"] for response in responses)
+
+    def test_cancelled_on_close(self) -> None:
+        """
+        Test that messages still in flight are cancelled when the socket closes.
+        """
+        with TestClient(app) as client:
+            with client.websocket_connect("/") as connection:
+                connection.send_json({"action": "wait", "request_id": "stuck"})
+                connection.send_json({"action": "ping"})
+                assert connection.receive_json() == {"action": "pong"}
+
+            # The app finishes on the client's event loop thread, so give it a moment
+            deadline: float = monotonic() + 2
+            while not GateWorker.cancelled and monotonic() < deadline:
+                blocking_sleep(0.01)
+
+            assert GateWorker.cancelled == ["stuck"]
+
+    def test_invalid_request_id(self) -> None:
+        """
+        Test that request IDs which are not short strings or integers are rejected.
+        """
+        with TestClient(app) as client, client.websocket_connect("/") as connection:
+            connection.send_json({"action": "ping", "request_id": ["a"]})
+            assert connection.receive_json() == {"error": "Invalid request id."}
+
+            connection.send_json({"action": "ping", "request_id": 1})
+            assert connection.receive_json() == {"action": "pong", "request_id": 1}
+
+    def test_frame_too_large(self) -> None:
+        """
+        Test that frames larger than the endpoint accepts are rejected, counting the bytes of non-ASCII text.
+        """
+        with TestClient(app) as client, client.websocket_connect("/") as connection:
+            connection.send_json({"action": "ping", "padding": "a" * 256})
+            assert connection.receive_json() == {"error": "Message too large."}
+
+            # Fewer than 256 characters, but more than 256 bytes
+            connection.send_json({"action": "ping", "padding": "é" * 200})
+            assert connection.receive_json() == {"error": "Message too large."}
+
+            connection.send_json({"action": "ping", "padding": "é" * 100})
+            assert connection.receive_json() == {"action": "pong"}
@@ -0,0 +1,201 @@
+"""
+Contains the tests for the base worker's outbound send queue.
+"""
+
+# Standard Library Imports
+from asyncio import Event
+from unittest import TestCase
+
+# Third Party Imports
+from fastapi import FastAPI, WebSocket
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+# Local Imports
+from api.tests.helpers import run_worker
+from api.ws_workers.base_worker import BaseWorker
+from api.ws_workers.encoding import OrjsonCodec
+
+# Constants
+__all__ = [
+    "TestSendQueue",
+]
+
+
+class BurstWorker(BaseWorker):
+    """
+    Worker whose `burst` action sends several messages without yielding, as `UsersWorker.new_user` does with password errors.
+    """
+
+    async def handle_message(
+            self,
+            data: dict
+    ) -> None:
+        """
+        Handle a message.
+
+        Args:
+            data (dict): Message.
+        """
+        match data["action"]:
+            case "burst":
+                for index in range(data["count"]):
+                    await self.send({"action": "burst", "index": index})
+            case "stats":
+                await self.send(BaseWorker.stats())
+
+
+class BrokenBatchCodec(OrjsonCodec):
+    """
+    Codec that fails to encode batches, to break the writer.
+    """
+
+    def encode_batch(
+            self,
+            payloads: list[bytes]
+    ) -> bytes:
+        """
+        Fail to encode a batch.
+
+        Args:
+            payloads (list[bytes]): Encoded messages.
+
+        Raises:
+            ValueError: Always.
+        """
+        raise ValueError("Broken codec.")
+
+
+app: FastAPI = FastAPI()
+
+
+@app.websocket("/broken")
+async def broken_ws(
+        websocket: WebSocket
+) -> None:
+    """
+    Run a worker whose codec fails to encode batches.
+
+    Args:
+        websocket (WebSocket): Connection.
+    """
+    await run_worker(websocket, BurstWorker, BrokenBatchCodec(), send_batch_max=2)
+
+
+@app.websocket("/stalled")
+async def stalled_ws(
+        websocket: WebSocket
+) -> None:
+    """
+    Run a worker for a client that never reads what it is sent.
+
+    Args:
+        websocket (WebSocket): Connection.
+    """
+    async def stalled_send(data: str) -> None:
+        """
+        Never finish sending, like a client that has stopped reading.
+
+        Args:
+            data (str): Frame.
+        """
+        await Event().wait()
+
+    websocket.send_text = stalled_send
+
+    await run_worker(websocket, BurstWorker, send_queue_max_messages=8)
+
+
+@app.websocket("/{batch}")
+async def burst_ws(
+        websocket: WebSocket,
+        batch: int
+) -> None:
+    """
+    Run a worker that batches up to `batch` messages per frame.
+
+    Args:
+        websocket (WebSocket): Connection.
+        batch (int): Messages per frame.
+    """
+    await run_worker(websocket, BurstWorker, send_batch_max=batch, send_queue_max_messages=8)
+
+
+class TestSendQueue(TestCase):
+    """
+    Test the outbound send queue.
+    """
+
+    def test_unbatched(self) -> None:
+        """
+        Test that without batching every message is sent in its own frame, in order.
+        """
+        with TestClient(app) as client, client.websocket_connect("/1") as connection:
+            connection.send_json({"action": "burst", "count": 4})
+
+            assert [connection.receive_json() for _ in range(4)] == [{"action": "burst", "index": index} for index in range(4)]
+
+    def test_batched(self) -> None:
+        """
+        Test that messages queued together are sent as one array, up to the batch size.
+        """
+        with TestClient(app) as client, client.websocket_connect("/3") as connection:
+            connection.send_json({"action": "burst", "count": 4})
+
+            assert connection.receive_json() == [{"action": "burst", "index": index} for index in range(3)]
+            assert connection.receive_json() == {"action": "burst", "index": 3}
+
+            # A lone message is still sent on its own
+            connection.send_json({"action": "ping"})
+            assert connection.receive_json() == {"action": "pong"}
+
+    def test_slow_consumer(self) -> None:
+        """
+        Test that a client whose queue grows past the limit is disconnected.
+        """
+        with TestClient(app) as client, client.websocket_connect("/stalled") as connection:
+            connection.send_json({"action": "burst", "count": 20})
+
+            with self.assertRaises(WebSocketDisconnect) as context:
+                connection.receive_json()
+
+            assert context.exception.code == 1008
+
+    def test_fast_burst(self) -> None:
+        """
+        Test that a handler sending far more than the queue limit without yielding does not disconnect a client that keeps up.
+        """
+        with TestClient(app) as client, client.websocket_connect("/1") as connection:
+            connection.send_json({"action": "burst", "count": 300})
+
+            assert [connection.receive_json()["index"] for _ in range(300)] == list(range(300))
+
+            connection.send_json({"action": "burst", "count": 1})
+            assert connection.receive_json() == {"action": "burst", "index": 0}
+
+    def test_stats(self) -> None:
+        """
+        Test that open sockets are listed in the statistics.
+        """
+        with TestClient(app) as client, client.websocket_connect("/1") as connection:
+            connection.send_json({"action": "stats"})
+            stats: dict = connection.receive_json()
+
+            assert stats["sockets"] >= 1
+            assert any(socket["worker"] == "BurstWorker" for socket in stats["deepest"])
+
+    def test_writer_error(self) -> None:
+        """
+        Test that an unexpected error in the writer is logged and closes the socket with 1011.
+        """
+        errors: int = BaseWorker.writer_errors
+
+        with TestClient(app) as client, client.websocket_connect("/broken") as connection:
+            with self.assertLogs("api.ws_workers.base_worker", "ERROR"):
+                connection.send_json({"action": "burst", "count": 2})
+
+                with self.assertRaises(WebSocketDisconnect) as context:
+                    connection.receive_json()
+
+            assert context.exception.code == 1011
+            assert BaseWorker.writer_errors == errors + 1
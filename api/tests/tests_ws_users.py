@@ -82,28 +82,24 @@ def generate_password(
 class TestUserWs(IsolatedAsyncioTestCase):
     """
     Test the user WS endpoints.
+
+    Each test enters its `TestClient`, so that the app lifespan opens the connection pool before connecting.
     """
 
     def test_user_ws(self) -> None:
         """
         Test that the user endpoint can be connected to.
         """
-        # Create test client
-        client: TestClient = TestClient(app)
-
-        # Connect to the endpoint
-        with client.websocket_connect("/users/") as connection:
+        # Create a test client and connect to the endpoint
+        with TestClient(app) as client, client.websocket_connect("/users/") as connection:
             return
 
     def test_user_new_valid(self) -> None:
         """
         Test that a new valid user can be created.
         """
-        # Create test client
-        client: TestClient = TestClient(app)
-
-        # Connect to the endpoint
-        with client.websocket_connect("/users/") as connection:
+        # Create a test client and connect to the endpoint
+        with TestClient(app) as client, client.websocket_connect("/users/") as connection:
             # Generate the user data
             user_id: UUID = uuid4()
             password: str = generate_password(
@@ -150,11 +146,33 @@ class TestUserWs(IsolatedAsyncioTestCase):
         """
         Test that the application correctly validates the passed data by sending a garbled message.
         """
-        # Create test client
-        client: TestClient = TestClient(app)
-
-        # Connect to the endpoint
-        with client.websocket_connect("/users/") as connection:
+        # Create a test client and connect to the endpoint
+        with TestClient(app) as client, client.websocket_connect("/users/") as connection:
             # Send random bytes
             connection.send_bytes(randbytes(100))
             assert connection.receive_json() == {"error": "Invalid data."}
+
+    def test_json_subprotocol(self) -> None:
+        """
+        Test that a client requesting the JSON subprotocol gets it echoed back and is served JSON text frames.
+        """
+        # Create a test client and connect to the endpoint
+        with TestClient(app) as client, client.websocket_connect("/users/", subprotocols=["echo.unknown", "echo.json"]) as connection:
+            assert connection.accepted_subprotocol == "echo.json"
+
+            connection.send_json({"action": "ping"})
+            assert connection.receive_json() == {"action": "pong"}
+
+    def test_no_subprotocol(self) -> None:
+        """
+        Test that clients which request no subprotocol keep the original JSON text protocol.
+        """
+        # Create a test client and connect to the endpoint
+        with TestClient(app) as client, client.websocket_connect("/users/") as connection:
+            assert connection.accepted_subprotocol is None
+
+            connection.send_text("not json")
+            assert connection.receive_json() == {"error": "Invalid data."}
+
+            connection.send_json({"action": "ping"})
+            assert connection.receive_json() == {"action": "pong"}
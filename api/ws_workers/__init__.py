@@ -8,8 +8,10 @@ Initialises the WS workers module.
 
 # Local Imports
 from .admin_worker import AdminWorker
+from .base_worker import BaseWorker
 
 # Constants
 __all__ = [
     "AdminWorker",
+    "BaseWorker",
 ]
@@ -0,0 +1,179 @@
+"""
+Contains the action registry. Worker methods declare the action they handle, with its input and response models, once.
+"""
+
+# Standard Library Imports
+from contextvars import ContextVar, Token
+from time import perf_counter
+from typing import Awaitable, Callable, TypeVar
+
+# Third Party Imports
+from pydantic import TypeAdapter, ValidationError
+
+# Local Imports
+
+# Constants
+__all__ = [
+    "Action",
+    "action",
+    "current_action",
+    "ACTIONS",
+    "action_stats",
+]
+H = TypeVar("H", bound=Callable[..., Awaitable[None]])
+
+# Action being handled by the current task, so responses and errors can be attributed to it
+current_action: ContextVar["Action | None"] = ContextVar("current_action", default=None)
+
+
+class Action:
+    """
+    An action a worker handles, with its validator and serializer compiled once, and its counters.
+    """
+    __slots__ = [
+        "name",
+        "handler",
+        "input_model",
+        "response_model",
+        "response_action",
+        "validate",
+        "serialize",
+        "calls",
+        "invalid",
+        "error_responses",
+        "exceptions",
+        "latency_total",
+        "latency_max",
+    ]
+
+    def __init__(
+            self,
+            name: str,
+            handler: Callable[..., Awaitable[None]],
+            input_model: type | None = None,
+            response_model: type | None = None,
+            response_action: str | None = None
+    ) -> None:
+        """
+        Initialise the action.
+
+        Args:
+            name (str): Action name clients send.
+            handler (Callable[..., Awaitable[None]]): Worker method, called with the validated message.
+            input_model (type | None): Model messages are validated against. None passes the message dict as it is.
+            response_model (type | None): Model of the `data` in the response.
+            response_action (str | None): Action name in the response. Defaults to `name`.
+        """
+        self.name = name
+        self.handler = handler
+        self.input_model = input_model
+        self.response_model = response_model
+        self.response_action = response_action or name
+
+        self.validate: Callable[[dict], any] | None = TypeAdapter(input_model).validate_python if input_model else None
+        self.serialize: Callable[[any], bytes] | None = TypeAdapter(response_model).dump_json if response_model else None
+
+        self.calls: int = 0
+        self.invalid: int = 0
+        self.error_responses: int = 0
+        self.exceptions: int = 0
+        self.latency_total: float = 0
+        self.latency_max: float = 0
+
+    async def __call__(
+            self,
+            worker: any,
+            data: dict
+    ) -> None:
+        """
+        Validate a message and handle it.
+
+        Messages that fail validation are passed to the worker's `invalid_input` instead.
+
+        Args:
+            worker (BaseWorker): Worker handling the message.
+            data (dict): Message.
+        """
+        token: Token = current_action.set(self)
+        started: float = perf_counter()
+        self.calls += 1
+
+        try:
+            if self.validate is None:
+                await self.handler(worker, data)
+                return
+
+            try:
+                message: any = self.validate(data)
+            except ValidationError as error:
+                self.invalid += 1
+                await worker.invalid_input(self, error)
+                return
+
+            await self.handler(worker, message)
+        except BaseException:
+            self.exceptions += 1
+            raise
+        finally:
+            elapsed: float = perf_counter() - started
+            self.latency_total += elapsed
+            self.latency_max = max(self.latency_max, elapsed)
+            current_action.reset(token)
+
+    def stats(self) -> dict[str, int | float]:
+        """
+        Get action statistics.
+
+        Returns:
+            dict[str, int | float]: Statistics. Latencies are in milliseconds.
+        """
+        return {
+            "calls": self.calls,
+            "invalid": self.invalid,
+            "error_responses": self.error_responses,
+            "exceptions": self.exceptions,
+            "latency_mean_ms": self.latency_total / self.calls * 1000 if self.calls else 0,
+            "latency_max_ms": self.latency_max * 1000,
+        }
+
+
+# Actions of every worker class, registered when the class is created
+ACTIONS: dict[str, dict[str, Action]] = {}
+
+
+def action(
+        name: str,
+        input_model: type | None = None,
+        response_model: type | None = None,
+        response_action: str | None = None
+) -> Callable[[H], H]:
+    """
+    Declare the worker method that handles an action. The worker class registers it when it is created.
+
+    Args:
+        name (str): Action name clients send.
+        input_model (type | None): Model messages are validated against. None passes the message dict as it is.
+        response_model (type | None): Model of the `data` in the response.
+        response_action (str | None): Action name in the response. Defaults to `name`.
+
+    Returns:
+        Callable[[H], H]: Decorator.
+    """
+    def decorator(handler: H) -> H:
+        handler.action = Action(name, handler, input_model, response_model, response_action)
+        return handler
+
+    return decorator
+
+
+def action_stats() -> dict[str, dict[str, dict[str, int | float]]]:
+    """
+    Get the statistics of every registered action.
+
+    Returns:
+        dict[str, dict[str, dict[str, int | float]]]: Statistics by worker class and action.
+    """
+    return {
+        worker: {name: registered.stats() for name, registered in actions.items()}
+        for worker, actions in ACTIONS.items()
+    }
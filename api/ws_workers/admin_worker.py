@@ -5,85 +5,81 @@ Contains the WS Admin Worker.
 # Standard Library Imports
 
 # Third Party Imports
-from pydantic import ValidationError
 
 # Local Imports
+from .actions import action
 from .base_worker import BaseWorker
+from .encoding import json_array
+from ..config import CONFIG
+from ..db.cache import PROFILE_JSON_CACHE
 from ..db.exceptions import UserDoesNotExist
 from ..db.types.user import User
 from ..models.user import User as PublicUser
-from ..models.validation.admin import DeleteUserInput, GetUsersInput
+from ..models.validation.admin import DeleteUserInput, DeleteUserOutputData, GetUsersInput, TicketOutputData
+from ..security.tickets import SessionTickets
 
 # Constants
 __all__ = [
     "AdminWorker",
+    "ADMIN_TICKETS",
 ]
 
+# Session tickets, so an authenticated admin can reconnect without the RSA handshake
+ADMIN_TICKETS: SessionTickets = SessionTickets(
+    str(CONFIG.auth.secret_key).encode(),
+    CONFIG.auth.ticket_ttl
+)
+
 
 class AdminWorker(BaseWorker):
     """
     Worker to handle admin WebSocket connections.
     """
+    endpoint = "admin"
 
-    async def handle_message(
-            self,
-            data: dict
-    ) -> None:
-        """
-        Handle a message from the client.
-
-        Args:
-            data (dict): The data to handle.
-        """
-        # Match action
-        action: str = data.get("action")
-
-        match action:
-            case "get_users":
-                await self._get_users(data)
-            case "get_user":
-                await self._get_user(data)
-            case "delete_user":
-                await self._delete_user(data)
-            case _:
-                await self.connection.send_json(
-                    {"error": "Invalid action."}
-                )
-
+    @action("get_users", GetUsersInput, list[PublicUser], response_action="users")
     async def _get_users(
             self,
-            data: dict
+            data: GetUsersInput
     ) -> None:
         """
         Get users.
 
         Args:
-            data (dict): Data.
+            data (GetUsersInput): Data.
         """
-        # Verify input model
+        # Offset pagination, kept for clients that still send page numbers
+        if data.data.page is not None:
+            users: list[User] = await self.database.users.get(
+                data.data.page,
+                data.data.page_size
+            )
+            users: list[PublicUser] = await self.database.users.to_public_many(users)
+
+            # Send users, built from their cached serialized profiles
+            await self.reply(json_array(PROFILE_JSON_CACHE.fragment(user) for user in users))
+            return
+
+        # Keyset pagination
         try:
-            data: GetUsersInput = GetUsersInput(**data)
-        except ValidationError:
-            await self.connection.send_json(
-                {"error": "Invalid data."}
+            users, next_cursor = await self.database.users.get_after(
+                data.data.cursor,
+                data.data.page_size
+            )
+        except ValueError:
+            await self.send(
+                {"error": "Invalid cursor."}
             )
             return
+        users: list[PublicUser] = await self.database.users.to_public_many(users)
 
-        # Get users
-        users: list[User] = await self.database.users.get(
-            data.data.page,
-            data.data.page_size
-        )
-        users: list[PublicUser] = [await user.to_public() for user in users]
-
-        # Send users
-        await self.connection.send_json(
-            {
-                "action": "users",
-                "data": [user.model_dump(mode="json") for user in users]
-            }
+        # Send users along with the token for the next page
+        await self.reply(
+            json_array(PROFILE_JSON_CACHE.fragment(user) for user in users),
+            cursor=next_cursor
         )
 
+    @action("get_user")
     async def _get_user(
             self,
             data: dict
@@ -95,41 +91,45 @@ class AdminWorker(BaseWorker):
             data (dict): Data.
         """
 
+    @action("delete_user", DeleteUserInput, DeleteUserOutputData)
     async def _delete_user(
             self,
-            data: dict
+            data: DeleteUserInput
     ) -> None:
         """
         Delete a user.
 
         Args:
-            data (dict): Data.
+            data (DeleteUserInput): Data.
         """
-        # Verify input model
-        try:
-            data: DeleteUserInput = DeleteUserInput(**data)
-        except ValidationError:
-            await self.connection.send_json(
-                {"error": "Invalid data."}
-            )
-            return
-
         # Delete user
         try:
             await self.database.users.delete(
                 data.data.id
             )
         except UserDoesNotExist:
-            await self.connection.send_json(
+            await self.send(
                 {"error": "User does not exist."}
             )
             return
 
         # Send success
-        await self.connection.send_json(
-            {
-                "action": "delete_user",
-                "data": {"success": True}
-            }
-        )
+        await self.reply(DeleteUserOutputData(success=True))
 
+    @action("ticket", response_model=TicketOutputData)
+    async def _ticket(
+            self,
+            data: dict
+    ) -> None:
+        """
+        Issue a session ticket, which lets the next connection skip the handshake until it expires.
+
+        Args:
+            data (dict): Data.
+        """
+        await self.reply(
+            TicketOutputData(
+                ticket=ADMIN_TICKETS.issue(),
+                expires_in=ADMIN_TICKETS.ttl
+            )
+        )
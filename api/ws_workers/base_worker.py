@@ -3,92 +3,673 @@ Contains the base worker.
 """
 
 # Standard Library Imports
+from asyncio import CancelledError, Event, Lock, Queue, Semaphore, Task, create_task, current_task, gather, wait_for
+from contextvars import ContextVar, Token
+from logging import Logger, getLogger
+from weakref import WeakSet
 
 # Third Party Imports
 from fastapi import WebSocket
+from psycopg_pool import PoolTimeout
+from pydantic import ValidationError
 from starlette.websockets import WebSocketDisconnect
 
 # Local Imports
+from .actions import ACTIONS, Action, current_action
+from .encoding import Codec, DEFAULT_CODEC
+from ..config import CONFIG
 from ..db import Database
 
 # Constants
 __all__ = [
     "BaseWorker",
+    "FrameTooLarge",
 ]
+REQUEST_ID_MAX_LENGTH: int = 64
+SEND_FLUSH_TIMEOUT: float = 5  # Seconds to wait for queued messages to be sent before closing a socket
+SEND_DRAIN_TIMEOUT: float = 1  # Seconds a full send queue waits for the writer to send a frame before the client is dropped
+TOP_SOCKETS: int = 10  # Sockets with the deepest send queues listed in the statistics
+logger: Logger = getLogger(__name__)
+
+# Request ID of the message being handled by the current task, echoed in every response sent while handling it
+_request_id: ContextVar[str | int | None] = ContextVar("request_id", default=None)
+
+
+class FrameTooLarge(ValueError):
+    """
+    Raised when a frame is larger than the endpoint accepts. Raised before the frame is decoded.
+    """
 
 
 class BaseWorker:
     """
     Base worker class.
+
+    Messages are handled one at a time in arrival order, unless they carry a `request_id`. Those are handled as separate tasks,
+    up to `max_in_flight` at once, and every response to them echoes the `request_id` so the client can match them up. Actions
+    in `ordered_actions` are still handled one at a time in arrival order. In-flight messages are cancelled when the socket
+    closes.
+
+    Messages sent are queued and written to the socket by a separate task, so handlers do not wait on slow clients. Up to
+    `send_batch_max` queued messages are sent together in one frame, as an array. A client that lets its queue grow past the
+    limits is disconnected.
+
+    Actions are methods declared with the `action` decorator, registered when the subclass is created and dispatched by name.
     """
     connection: WebSocket
     database: Database
+    codec: Codec
+    max_in_flight: int
+    send_queue_max_messages: int
+    send_queue_max_bytes: int
+    send_batch_max: int
+    max_frame_size: int
+
+    # Endpoint the worker serves, to look up its settings such as `websocket.max_frame_size`
+    endpoint: str = "default"
+
+    # Actions whose messages must be handled in arrival order even when they carry a request ID
+    ordered_actions: frozenset[str] = frozenset()
+
+    # Actions by name, registered from the methods declared with the `action` decorator
+    actions: dict[str, Action] = {}
+
+    # Process wide send statistics
+    _live: WeakSet["BaseWorker"] = WeakSet()
+    frames_sent: int = 0
+    messages_sent: int = 0
+    slow_consumer_disconnects: int = 0
+    writer_errors: int = 0
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        """
+        Register the actions declared by the subclass, on top of those it inherits.
+        """
+        super().__init_subclass__(**kwargs)
+
+        cls.actions = dict(cls.actions)
+        for attribute in vars(cls).values():
+            declared: Action | None = getattr(attribute, "action", None)
+            if isinstance(declared, Action):
+                cls.actions[declared.name] = declared
+
+        if cls.actions:
+            ACTIONS[cls.__name__] = cls.actions
 
     def __init__(
             self,
             connection: WebSocket,
-            database: Database
+            database: Database,
+            codec: Codec = DEFAULT_CODEC
     ) -> None:
         """
         Initialise the worker.
+
+        Args:
+            connection (WebSocket): Accepted connection.
+            database (Database): Database handle.
+            codec (Codec): Codec agreed with the client when the connection was accepted.
         """
         self.connection = connection
         self.database = database
+        self.codec = codec
+        self.max_in_flight = CONFIG.websocket.max_in_flight
+        self.send_queue_max_messages = CONFIG.websocket.send_queue_max_messages
+        self.send_queue_max_bytes = CONFIG.websocket.send_queue_max_bytes
+        self.send_batch_max = CONFIG.websocket.send_batch_max
+        self.max_frame_size = CONFIG.websocket.max_frame_size.get(self.endpoint, CONFIG.websocket.max_frame_size["default"])
+
+        self._in_flight: set[Task] = set()
+        self._slots: Semaphore | None = None
+        self._action_locks: dict[str, Lock] = {}
+        self._reader: Task | None = None
+        self._failure: BaseException | None = None
+
+        self._outbox: Queue[bytes] = Queue()  # Bounded by `_send_frame` rather than the queue, to disconnect instead of wait
+        self._queued_bytes: int = 0
+        self._writer: Task | None = None
+        self._sent: Event = Event()  # Set by the writer whenever it sends a frame
+        self._closed: bool = False
+
+        BaseWorker._live.add(self)
 
     async def run(self) -> None:
         """
         Run the worker.
 
         Starts the event handle loop for the worker and listens for incoming messages. When an incoming message is received, this method fires a callback to `handle_message`.
+
+        A database connection is only leased while a message is being handled, so idle sockets do not hold one.
+
+        Raises:
+            Exception: Any exception raised by `handle_message`, in concurrent mode as well.
+        """
+        self._reader = current_task()
+        self._slots = Semaphore(max(1, self.max_in_flight))
+
+        try:
+            await self._read()
+        except CancelledError:
+            # A concurrent handler failed, so fail the same way a handler run in order would
+            if self._failure is None:
+                raise
+            self._reader.uncancel()
+            raise self._failure
+        finally:
+            await self._cancel_in_flight()
+            await self._stop_writer(flush=not self._closed)
+
+    async def _read(self) -> None:
+        """
+        Read and dispatch messages until the client disconnects.
         """
         while True:
             try:
-                data: dict = await self.connection.receive_json()
+                data: dict = await self.receive()
             except WebSocketDisconnect:
-                await self.connection.close()
+                await self.close(flush=False)
                 return
-            except KeyError:  # This catches the error when the data is not a dictionary.
-                await self.connection.send_json(
+            except FrameTooLarge:
+                await self.send(
                     {
-                        "error": "Invalid data."
+                        "error": "Message too large."
                     }
                 )
                 continue
-
-            if "action" not in data:
-                await self.connection.send_json(
+            except ValueError:  # The frame is of the wrong type for the codec or could not be decoded
+                await self.send(
                     {
-                        "error": "No action provided."
+                        "error": "Invalid data."
                     }
                 )
                 continue
 
-            if not isinstance(data["action"], str):
-                await self.connection.send_json(
+            if not isinstance(data, dict):
+                await self.send(
                     {
-                        "error": "Invalid action type."
+                        "error": "Invalid data."
                     }
                 )
                 continue
 
-            if data["action"] == "ping":
-                await self.connection.send_json(
+            request_id: any = data.get("request_id")
+            if request_id is not None and not self._valid_request_id(request_id):
+                await self.send(
                     {
-                        "action": "pong"
+                        "error": "Invalid request id."
                     }
                 )
                 continue
 
-            await self.handle_message(data)
+            # Echo the request ID in every response to this message, including the errors below
+            token: Token = _request_id.set(request_id)
+            try:
+                await self._dispatch(data, request_id)
+            finally:
+                _request_id.reset(token)
+
+    async def _dispatch(
+            self,
+            data: dict,
+            request_id: str | int | None
+    ) -> None:
+        """
+        Validate a message and handle it, in order or as a separate task.
+
+        Args:
+            data (dict): Message.
+            request_id (str | int | None): Request ID sent by the client.
+        """
+        if "action" not in data:
+            await self.send(
+                {
+                    "error": "No action provided."
+                }
+            )
+            return
+
+        if not isinstance(data["action"], str):
+            await self.send(
+                {
+                    "error": "Invalid action type."
+                }
+            )
+            return
+
+        # Answered straight away, so a ping is never stuck behind a slow message in concurrent mode
+        if data["action"] == "ping":
+            await self.send(
+                {
+                    "action": "pong"
+                }
+            )
+            return
+
+        if request_id is None or self.max_in_flight <= 1:
+            await self._handle(data)
+            return
+
+        # Wait for a free slot, so a client cannot start unbounded work. The task copies the context, request ID included
+        await self._slots.acquire()
+        task: Task = create_task(self._handle(data))
+        self._in_flight.add(task)
+        task.add_done_callback(self._handled)
+
+    async def _handle(
+            self,
+            data: dict
+    ) -> None:
+        """
+        Handle a message on a leased database connection.
+
+        Args:
+            data (dict): Message.
+        """
+        try:
+            if data["action"] in self.ordered_actions:
+                lock: Lock = self._action_locks.setdefault(data["action"], Lock())
+                async with lock:  # Waiters are woken in arrival order
+                    async with self.database.lease():
+                        await self.handle_message(data)
+            else:
+                # Lease a connection for this message only
+                async with self.database.lease():
+                    await self.handle_message(data)
+        except PoolTimeout:
+            await self.send(
+                {
+                    "error": "Server busy."
+                }
+            )
+
+    def _handled(
+            self,
+            task: Task
+    ) -> None:
+        """
+        Release the slot of a finished task and pass its failure, if any, to the reader.
+
+        Args:
+            task (Task): Finished task.
+        """
+        self._in_flight.discard(task)
+        self._slots.release()
+
+        if task.cancelled() or task.exception() is None or self._failure is not None:
+            return
+
+        self._failure = task.exception()
+        self._reader.cancel()
+
+    async def _cancel_in_flight(self) -> None:
+        """
+        Cancel every message still being handled, e.g. because the socket closed.
+        """
+        tasks: list[Task] = list(self._in_flight)
+        for task in tasks:
+            task.cancel()
+
+        await gather(*tasks, return_exceptions=True)
+
+    @staticmethod
+    def _valid_request_id(
+            request_id: any
+    ) -> bool:
+        """
+        Check that a request ID is a short string or an integer.
+
+        Args:
+            request_id (any): Request ID.
+
+        Returns:
+            bool: Request ID is valid.
+        """
+        if isinstance(request_id, str):
+            return len(request_id) <= REQUEST_ID_MAX_LENGTH
+
+        return isinstance(request_id, int) and not isinstance(request_id, bool)
+
+    async def receive(self) -> any:
+        """
+        Receive and decode a message.
+
+        Raises:
+            WebSocketDisconnect: The client disconnected.
+            FrameTooLarge: The frame is larger than `max_frame_size` bytes.
+            ValueError: The frame is of the wrong type for the codec, or could not be decoded.
+
+        Returns:
+            any: Message.
+        """
+        message: dict = await self.connection.receive()
+
+        if message["type"] == "websocket.disconnect":
+            raise WebSocketDisconnect(message.get("code", 1000), message.get("reason"))
+
+        frame: str | bytes | None = message.get("bytes" if self.codec.binary else "text")
+        if frame is None:
+            raise ValueError("Frame type does not match the codec.")
+
+        # Checked before decoding. A text frame longer in characters is longer in bytes, so it is only encoded to count its
+        # bytes when it is short enough and not ASCII
+        if len(frame) > self.max_frame_size or (
+                isinstance(frame, str) and not frame.isascii() and len(frame.encode()) > self.max_frame_size
+        ):
+            raise FrameTooLarge(f"Frame is larger than {self.max_frame_size} bytes.")
+
+        return self.codec.decode(frame)
+
+    async def send(
+            self,
+            message: any
+    ) -> None:
+        """
+        Encode and send a message.
+
+        Args:
+            message (any): Message.
+        """
+        request_id: str | int | None = _request_id.get()
+        if isinstance(message, dict):
+            if request_id is not None:
+                message = message | {"request_id": request_id}
+            if "error" in message:
+                self._count_error()
+
+        await self._send_frame(self.codec.encode(message))
+
+    async def send_message(
+            self,
+            message: dict[str, any],
+            **fragments: bytes
+    ) -> None:
+        """
+        Encode and send a message with some values already encoded as UTF-8 JSON, e.g. cached profiles.
+
+        Args:
+            message (dict[str, any]): Fields to encode.
+            **fragments (bytes): Fields whose values are already UTF-8 JSON.
+        """
+        request_id: str | int | None = _request_id.get()
+        if request_id is not None:
+            message = message | {"request_id": request_id}
+        if "error" in message:
+            self._count_error()
+
+        await self._send_frame(self.codec.encode_message(message, **fragments))
+
+    async def reply(
+            self,
+            data: any,
+            **fields: any
+    ) -> None:
+        """
+        Send the response of the action being handled, with its `data` serialized by the action's response model.
+
+        Actions without a response model send `data` as it is, encoded by the codec.
+
+        Args:
+            data (any): Response data, or bytes already serialized as UTF-8 JSON, e.g. cached profiles.
+            **fields (any): Other fields of the response.
+
+        Raises:
+            RuntimeError: No action is being handled.
+        """
+        handling: Action | None = current_action.get()
+        if handling is None:
+            raise RuntimeError("reply called outside an action handler, use send instead.")
+
+        if not isinstance(data, bytes):
+            if handling.serialize is None:
+                await self.send({"action": handling.response_action, **fields, "data": data})
+                return
+
+            data = handling.serialize(data)
+
+        await self.send_message(
+            {"action": handling.response_action, **fields},
+            data=data
+        )
+
+    @staticmethod
+    def _count_error() -> None:
+        """
+        Count an error response against the action being handled, if any.
+        """
+        handling: Action | None = current_action.get()
+        if handling is not None:
+            handling.error_responses += 1
+
+    async def _send_frame(
+            self,
+            payload: bytes
+    ) -> None:
+        """
+        Queue an encoded message to be sent, disconnecting the client if it is not keeping up.
+
+        Returns without waiting for the message to be sent. Messages queued after the socket closed are dropped.
+
+        Args:
+            payload (bytes): Encoded message.
+        """
+        if self._closed:
+            return
+
+        # A handler sending in a loop never yields to the writer, so a full queue first waits for the writer to send something.
+        # Only a client that accepts nothing for `SEND_DRAIN_TIMEOUT` seconds is disconnected
+        if self._queue_full(payload):
+            self._sent.clear()
+            try:
+                await wait_for(self._sent.wait(), SEND_DRAIN_TIMEOUT)
+            except TimeoutError:
+                pass
+
+            if self._closed:
+                return
+
+            if self._queue_full(payload):
+                BaseWorker.slow_consumer_disconnects += 1
+                await self.close(1008, "Slow consumer.", flush=False)
+                return
+
+        self._queued_bytes += len(payload)
+        self._outbox.put_nowait(payload)
+
+        if self._writer is None:
+            self._writer = create_task(self._write())
+
+    def _queue_full(
+            self,
+            payload: bytes
+    ) -> bool:
+        """
+        Check whether queueing a message would take the send queue past its limits.
+
+        A single message is always let through, however large, so a backlog is needed for the queue to be full.
+
+        Args:
+            payload (bytes): Encoded message.
+
+        Returns:
+            bool: The queue is full.
+        """
+        return bool(self._outbox.qsize()) and (
+                self._outbox.qsize() >= self.send_queue_max_messages
+                or self._queued_bytes + len(payload) > self.send_queue_max_bytes
+        )
+
+    async def _write(self) -> None:
+        """
+        Write queued messages to the socket until the worker stops it or the client disconnects.
+
+        Any other failure is logged and closes the socket with 1011, so the client is not left waiting on a dead writer.
+        """
+        while True:
+            payloads: list[bytes] = [await self._outbox.get()]
+            while len(payloads) < self.send_batch_max and not self._outbox.empty():
+                payloads.append(self._outbox.get_nowait())
+
+            # Set when the socket can take nothing else, with the close code to send if it is still open
+            stopped: bool = False
+            close_code: int | None = None
+            try:
+                frame: bytes = payloads[0] if len(payloads) == 1 else self.codec.encode_batch(payloads)
+
+                if self.codec.binary:
+                    await self.connection.send_bytes(frame)
+                else:
+                    await self.connection.send_text(frame.decode())
+            except (WebSocketDisconnect, RuntimeError, OSError):
+                # The client is gone, so nothing else can be sent
+                stopped = True
+            except Exception:
+                BaseWorker.writer_errors += 1
+                logger.exception("Failed to write to %s socket, closing it.", type(self).__name__)
+                stopped = True
+                close_code = 1011
+            finally:
+                self._queued_bytes -= sum(len(payload) for payload in payloads)
+                for _ in payloads:
+                    self._outbox.task_done()
+
+            if stopped:
+                self._closed = True
+                self._drop_queued()
+
+                if close_code is not None:
+                    try:
+                        await self.connection.close(close_code, "Internal error.")
+                    except (RuntimeError, OSError):
+                        pass
+                return
+
+            BaseWorker.frames_sent += 1
+            BaseWorker.messages_sent += len(payloads)
+            self._sent.set()
+
+    async def _stop_writer(
+            self,
+            flush: bool
+    ) -> None:
+        """
+        Stop the writer and drop anything still queued.
+
+        Args:
+            flush (bool): Give the writer up to `SEND_FLUSH_TIMEOUT` seconds to send what is queued first.
+        """
+        if self._writer is None:
+            return
+
+        if flush and not self._writer.done():
+            try:
+                await wait_for(self._outbox.join(), SEND_FLUSH_TIMEOUT)
+            except TimeoutError:
+                pass
+
+        self._writer.cancel()
+        await gather(self._writer, return_exceptions=True)
+        self._writer = None
+        self._drop_queued()
+
+    def _drop_queued(self) -> None:
+        """
+        Drop every queued message, releasing anything waiting for the queue to be sent.
+        """
+        while not self._outbox.empty():
+            self._outbox.get_nowait()
+            self._outbox.task_done()
+        self._queued_bytes = 0
+        self._sent.set()
+
+    async def close(
+            self,
+            code: int = 1000,
+            reason: str | None = None,
+            flush: bool = True
+    ) -> None:
+        """
+        Close the socket. Does nothing if it is already closed.
+
+        Args:
+            code (int): Close code.
+            reason (str | None): Close reason.
+            flush (bool): Send what is queued before closing, waiting up to `SEND_FLUSH_TIMEOUT` seconds.
+        """
+        if self._closed:
+            return
+
+        self._closed = True
+        await self._stop_writer(flush)
+        await self.connection.close(code, reason)
+
+    @property
+    def queue_depth(self) -> int:
+        """
+        Number of messages waiting to be sent.
+        """
+        return self._outbox.qsize()
+
+    @classmethod
+    def stats(cls) -> dict[str, int | list[dict[str, str | int]]]:
+        """
+        Get send queue statistics for every open socket in the process.
+
+        Returns:
+            dict[str, int | list[dict[str, str | int]]]: Statistics, including the sockets with the deepest send queues.
+        """
+        workers: list[BaseWorker] = [worker for worker in cls._live if not worker._closed]
+        deepest: list[BaseWorker] = sorted(workers, key=lambda worker: worker.queue_depth, reverse=True)[:TOP_SOCKETS]
+
+        return {
+            "sockets": len(workers),
+            "queued_messages": sum(worker.queue_depth for worker in workers),
+            "queued_bytes": sum(worker._queued_bytes for worker in workers),
+            "frames_sent": cls.frames_sent,
+            "messages_sent": cls.messages_sent,
+            "slow_consumer_disconnects": cls.slow_consumer_disconnects,
+            "writer_errors": cls.writer_errors,
+            "deepest": [
+                {
+                    "worker": type(worker).__name__,
+                    "client": f"{worker.connection.client.host}:{worker.connection.client.port}" if worker.connection.client else None,
+                    "messages": worker.queue_depth,
+                    "bytes": worker._queued_bytes,
+                }
+                for worker in deepest
+            ],
+        }
 
     async def handle_message(
             self,
             data: dict
     ) -> None:
         """
-        Handle a message.
+        Handle a message by dispatching it to its action.
 
         Args:
             data (dict): The incoming message data.
         """
-        raise NotImplementedError("The `handle_message` method must be implemented in the child class.")
+        handler: Action | None = self.actions.get(data["action"])
+        if handler is None:
+            await self.send(
+                {"error": "Invalid action."}
+            )
+            return
+
+        await handler(self, data)
+
+    async def invalid_input(
+            self,
+            handling: Action,
+            error: ValidationError
+    ) -> None:
+        """
+        Respond to a message that does not match the input model of its action.
+
+        Args:
+            handling (Action): Action the message was for.
+            error (ValidationError): Validation error.
+        """
+        await self.send(
+            {"error": "Invalid data."}
+        )
@@ -0,0 +1,317 @@
+"""
+Contains the WebSocket message codecs, negotiated per connection through the WebSocket subprotocol.
+"""
+
+# Standard Library Imports
+from json import dumps, loads
+from typing import Iterable
+
+# Third Party Imports
+import orjson
+from fastapi import WebSocket
+
+try:
+    import msgpack
+except ImportError:  # MessagePack is optional, clients can only negotiate it when it is installed
+    msgpack = None
+
+# Local Imports
+
+# Constants
+__all__ = [
+    "Codec",
+    "JsonCodec",
+    "OrjsonCodec",
+    "MsgPackCodec",
+    "CODECS",
+    "DEFAULT_CODEC",
+    "negotiate_codec",
+    "accept",
+    "json_array",
+]
+
+
+class Codec:
+    """
+    Base codec. Converts messages to and from WebSocket frames.
+    """
+    __slots__ = []
+
+    # Subprotocol clients request to use this codec. None for the default protocol
+    subprotocol: str | None = None
+
+    # Whether messages travel in binary frames rather than text frames
+    binary: bool = False
+
+    def encode(
+            self,
+            message: any
+    ) -> bytes:
+        """
+        Encode a message.
+
+        Args:
+            message (any): Message.
+
+        Returns:
+            bytes: Encoded message.
+        """
+        raise NotImplementedError("The `encode` method must be implemented in the child class.")
+
+    def decode(
+            self,
+            frame: str | bytes
+    ) -> any:
+        """
+        Decode a message.
+
+        Args:
+            frame (str | bytes): Frame payload.
+
+        Raises:
+            ValueError: The frame is not a valid message.
+
+        Returns:
+            any: Message.
+        """
+        raise NotImplementedError("The `decode` method must be implemented in the child class.")
+
+    def encode_message(
+            self,
+            message: dict[str, any],
+            **fragments: bytes
+    ) -> bytes:
+        """
+        Encode a message with some values already encoded as UTF-8 JSON (e.g. cached profiles).
+
+        Codecs that cannot splice JSON decode the fragments and encode the whole message.
+
+        Args:
+            message (dict[str, any]): Fields to encode.
+            **fragments (bytes): Fields whose values are already UTF-8 JSON.
+
+        Returns:
+            bytes: Encoded message.
+        """
+        return self.encode(message | {key: orjson.loads(value) for key, value in fragments.items()})
+
+    def encode_batch(
+            self,
+            payloads: list[bytes]
+    ) -> bytes:
+        """
+        Join encoded messages into one encoded array of messages, so they can be sent in a single frame.
+
+        Args:
+            payloads (list[bytes]): Encoded messages.
+
+        Returns:
+            bytes: Encoded array.
+        """
+        return self.encode([self.decode(payload) for payload in payloads])
+
+
+class JsonCodec(Codec):
+    """
+    Standard library JSON on text frames. Matches Starlette's `send_json` / `receive_json` byte for byte.
+    """
+    __slots__ = []
+
+    subprotocol = "echo.json"
+
+    def _encode_value(
+            self,
+            value: any
+    ) -> bytes:
+        """
+        Encode a single value.
+
+        Args:
+            value (any): Value.
+
+        Returns:
+            bytes: UTF-8 JSON.
+        """
+        return dumps(value, separators=(",", ":"), ensure_ascii=False).encode()
+
+    def encode(
+            self,
+            message: any
+    ) -> bytes:
+        """
+        Encode a message.
+        """
+        return self._encode_value(message)
+
+    def decode(
+            self,
+            frame: str | bytes
+    ) -> any:
+        """
+        Decode a message.
+        """
+        return loads(frame)  # JSONDecodeError is a ValueError
+
+    def encode_message(
+            self,
+            message: dict[str, any],
+            **fragments: bytes
+    ) -> bytes:
+        """
+        Encode a message, splicing the fragments in instead of decoding and encoding them again.
+        """
+        parts: list[bytes] = [self._encode_value(key) + b":" + self._encode_value(value) for key, value in message.items()]
+        parts.extend(self._encode_value(key) + b":" + value for key, value in fragments.items())
+
+        return b"{" + b",".join(parts) + b"}"
+
+    def encode_batch(
+            self,
+            payloads: list[bytes]
+    ) -> bytes:
+        """
+        Join encoded messages into one encoded array of messages, without decoding them.
+        """
+        return json_array(payloads)
+
+
+class OrjsonCodec(JsonCodec):
+    """
+    JSON on text frames, encoded and decoded by orjson. The wire format is the same as `JsonCodec`.
+    """
+    __slots__ = []
+
+    def _encode_value(
+            self,
+            value: any
+    ) -> bytes:
+        """
+        Encode a single value.
+        """
+        return orjson.dumps(value)
+
+    def decode(
+            self,
+            frame: str | bytes
+    ) -> any:
+        """
+        Decode a message.
+        """
+        return orjson.loads(frame)  # JSONDecodeError is a ValueError
+
+
+class MsgPackCodec(Codec):
+    """
+    MessagePack on binary frames.
+    """
+    __slots__ = []
+
+    subprotocol = "echo.msgpack"
+    binary = True
+
+    def encode(
+            self,
+            message: any
+    ) -> bytes:
+        """
+        Encode a message.
+        """
+        return msgpack.packb(message)
+
+    def decode(
+            self,
+            frame: str | bytes
+    ) -> any:
+        """
+        Decode a message.
+        """
+        try:
+            return msgpack.unpackb(frame)  # Malformed data raises ValueError subclasses
+        except TypeError as error:
+            raise ValueError("MessagePack frames must be binary.") from error
+
+    def encode_batch(
+            self,
+            payloads: list[bytes]
+    ) -> bytes:
+        """
+        Join encoded messages into one encoded array of messages. A MessagePack array is its header followed by its items, so
+        the messages are not decoded.
+        """
+        count: int = len(payloads)
+        if count < 16:
+            header: bytes = bytes((0x90 | count,))  # fixarray
+        elif count < 1 << 16:
+            header: bytes = b"\xdc" + count.to_bytes(2, "big")  # array 16
+        else:
+            header: bytes = b"\xdd" + count.to_bytes(4, "big")  # array 32
+
+        return header + b"".join(payloads)
+
+
+# Codec used when the client does not request a subprotocol, i.e. the original JSON text protocol
+DEFAULT_CODEC: Codec = OrjsonCodec()
+
+# Codecs clients can request by subprotocol
+CODECS: dict[str, Codec] = {
+    DEFAULT_CODEC.subprotocol: DEFAULT_CODEC,
+}
+if msgpack is not None:
+    CODECS[MsgPackCodec.subprotocol] = MsgPackCodec()
+
+
+def negotiate_codec(
+        requested: Iterable[str]
+) -> Codec:
+    """
+    Pick the codec for a connection from the subprotocols the client offered, in the client's order of preference.
+
+    Args:
+        requested (Iterable[str]): Subprotocols offered by the client.
+
+    Returns:
+        Codec: First supported codec, or the default codec if none is supported.
+    """
+    for subprotocol in requested:
+        codec: Codec | None = CODECS.get(subprotocol)
+        if codec is not None:
+            return codec
+
+    return DEFAULT_CODEC
+
+
+async def accept(
+        websocket: WebSocket
+) -> Codec:
+    """
+    Accept a WebSocket connection, agreeing on a codec through the subprotocol.
+
+    Clients that offer no supported subprotocol get the default JSON text protocol, and no subprotocol is echoed back.
+
+    Args:
+        websocket (WebSocket): Connection to accept.
+
+    Returns:
+        Codec: Codec for the connection.
+    """
+    requested: list[str] = websocket.scope.get("subprotocols", [])
+    codec: Codec = negotiate_codec(requested)
+
+    await websocket.accept(subprotocol=codec.subprotocol if codec.subprotocol in requested else None)
+
+    return codec
+
+
+def json_array(
+        fragments: Iterable[bytes]
+) -> bytes:
+    """
+    Join encoded values into an encoded JSON array.
+
+    Args:
+        fragments (Iterable[bytes]): UTF-8 JSON values.
+
+    Returns:
+        bytes: UTF-8 JSON array.
+    """
+    return b"[" + b",".join(fragments) + b"]"
@@ -9,173 +9,121 @@ from fastapi import WebSocket
 from pydantic import ValidationError
 
 # Local Imports
+from .actions import Action, action
 from .base_worker import BaseWorker
+from .encoding import Codec, DEFAULT_CODEC
 from ..config import CONFIG
 from ..db import Database
-from ..db.exceptions import UserAlreadyExists
+from ..db.cache import PROFILE_JSON_CACHE
+from ..db.exceptions import UserAlreadyExists, UsernameUnavailable
 from ..db.types.user import User
 from ..models import User as PublicUser
-from ..models.validation import RegisterInput, RegisterInputData
+from ..models.validation import LoginInput, RegisterInput, RegisterInputData
+from ..security.hashing import HasherBusy
+from ..security.password_policy import PasswordPolicy
 
 # Constants
 __all__ = [
     "UsersWorker"
 ]
+PASSWORD_POLICY: PasswordPolicy = PasswordPolicy(
+    CONFIG.user_security.password_minimum_length,
+    CONFIG.user_security.password_maximum_length,
+    CONFIG.user_security.password_require_uppercase,
+    CONFIG.user_security.password_require_lowercase,
+    CONFIG.user_security.password_require_number,
+    CONFIG.user_security.password_require_special_character
+)
 
 
 class UsersWorker(BaseWorker):
     """
     Worker to handle user WebSocket connections.
     """
+    endpoint = "users"
+
+    # Session changes must apply in the order the client sent them
+    ordered_actions = frozenset({"login", "logout"})
 
     def __init__(
             self,
             connection: WebSocket,
-            database: Database
+            database: Database,
+            codec: Codec = DEFAULT_CODEC
     ) -> None:
         """
         Initialise the worker.
         """
-        super().__init__(connection, database)
+        super().__init__(connection, database, codec)
 
-    async def handle_message(
+    async def invalid_input(
             self,
-            data: dict
+            handling: Action,
+            error: ValidationError
     ) -> None:
         """
-        Handle a message from the client.
-
-        Args:
-            data (dict): The data to handle.
+        Respond to a message that does not match the input model of its action, listing what is wrong.
         """
-        action: str = data["action"]
-
-        match action:
-            case "new":
-                await self.new_user(data)
-            case "login":
-                await self.login_user(data)
-            case "logout":
-                await self.logout_user(data)
-            case "me":
-                await self.me(data)
-            case "details":
-                await self.details(data)
+        await self.send(
+            {
+                "action": handling.name,
+                "error": error.errors()
+            }
+        )
 
+    @action("new", RegisterInput, PublicUser)
     async def new_user(
             self,
-            data: dict
+            data: RegisterInput
     ) -> None:
         """
         Create a new user.
 
         Args:
-            data (dict): The data to create the user with.
+            data (RegisterInput): The data to create the user with.
 
         Returns:
             None
         """
-        # Validate data
-        try:
-            data: RegisterInput = RegisterInput(**data)
-        except ValidationError as e:
-            await self.connection.send_json(
-                {
-                    "action": "new",
-                    "error": e.errors()
-                }
-            )
-            return
-
         # Strip the action from the data
         data: RegisterInputData = data.data
 
-        # Do user password checks before anything else to minimise in-flight time for password
-        if len(data.password) > CONFIG.user_security.password_maximum_length or len(data.password) < CONFIG.user_security.password_minimum_length:
-            await self.connection.send_json(
+        # Do user password checks before anything else to minimise in-flight time for password. The length is checked first
+        failures: list[dict] = PASSWORD_POLICY.check(data.password)
+        for failure in failures:
+            await self.send(
                 {
                     "action": "new",
-                    "error": "password_length_invalid",
-                    "data": {
-                        "max_len": CONFIG.user_security.password_maximum_length,
-                        "min_len": CONFIG.user_security.password_minimum_length
-                    }
+                    **failure
                 }
             )
+        if failures:
             return
 
-        # Count numbers of each character type
-        uppercase: int = 0
-        lowercase: int = 0
-        number: int = 0
-        special: int = 0
-
-        for char in data.password:
-            if char.isupper():
-                uppercase += 1
-            elif char.islower():
-                lowercase += 1
-            elif char.isdigit():
-                number += 1
-            else:
-                special += 1
-
-        if uppercase < CONFIG.user_security.password_require_uppercase:
-            await self.connection.send_json(
-                {
-                    "action": "new",
-                    "error": "password_uppercase_invalid",
-                    "data": {
-                        "condition": "uppercase_count",
-                        "minimum_value": CONFIG.user_security.password_require_uppercase
-                    }
-                }
-            )
-
-        if lowercase < CONFIG.user_security.password_require_lowercase:
-            await self.connection.send_json(
-                {
-                    "action": "new",
-                    "error": "password_lowercase_invalid",
-                    "data": {
-                        "condition": "lowercase_count",
-                        "minimum_value": CONFIG.user_security.password_require_lowercase
-                    }
-                }
-            )
-
-        if number < CONFIG.user_security.password_require_number:
-            await self.connection.send_json(
+        try:
+            # Create user
+            user: User = await self.database.users.new(data.email, data.username, data.password)
+        except UserAlreadyExists:
+            await self.send(
                 {
                     "action": "new",
-                    "error": "password_number_invalid",
-                    "data": {
-                        "condition": "number_count",
-                        "minimum_value": CONFIG.user_security.password_require_number
-                    }
+                    "error": "user_exists"
                 }
             )
-
-        if special < CONFIG.user_security.password_require_special_character:
-            await self.connection.send_json(
+            return
+        except UsernameUnavailable:
+            await self.send(
                 {
                     "action": "new",
-                    "error": "password_special_invalid",
-                    "data": {
-                        "condition": "special_count",
-                        "minimum_value": CONFIG.user_security.password_require_special_character
-                    }
+                    "error": "username_unavailable"
                 }
             )
-
-        try:
-            # Create user
-            user: User = await self.database.users.new(data.email, data.username, data.password)
-        except UserAlreadyExists:
-            await self.connection.send_json(
+            return
+        except HasherBusy:
+            await self.send(
                 {
                     "action": "new",
-                    "error": "user_exists"
+                    "error": "server_busy"
                 }
             )
             return
@@ -184,27 +132,24 @@ class UsersWorker(BaseWorker):
         user_data: PublicUser = await user.to_public()
 
         # Construct the response
-        await self.connection.send_json(
-            {
-                "action": "new",
-                "data": user_data.model_dump(mode="json")
-            }
-        )
+        await self.reply(PROFILE_JSON_CACHE.fragment(user_data))
 
+    @action("login", LoginInput)
     async def login_user(
             self,
-            data: dict
+            data: LoginInput
     ) -> None:
         """
         Log a user in.
 
         Args:
-            data (dict): The data to log the user in with.
+            data (LoginInput): The data to log the user in with.
 
         Returns:
             None
         """
 
+    @action("logout")
     async def logout_user(
             self,
             data: dict
@@ -219,6 +164,7 @@ class UsersWorker(BaseWorker):
             None
         """
 
+    @action("me")
     async def me(
             self,
             data: dict
@@ -233,6 +179,7 @@ class UsersWorker(BaseWorker):
             None
         """
 
+    @action("details")
     async def details(
             self,
             data: dict
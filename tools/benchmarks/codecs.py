@@ -0,0 +1,88 @@
+"""
+Benchmarks the WebSocket message codecs, encoding and decoding a small message and a user listing.
+
+Run from the repository root with `python -m tools.benchmarks.codecs`. MessagePack is included when msgpack is installed.
+"""
+
+# Standard Library Imports
+from argparse import ArgumentParser, Namespace
+from time import perf_counter
+
+# Third Party Imports
+
+# Local Imports
+from api.ws_workers.encoding import Codec, JsonCodec, MsgPackCodec, OrjsonCodec, msgpack
+from tools.benchmarks.profile_serialization import build_users
+
+# Constants
+__all__ = [
+    "messages_per_second",
+    "main",
+]
+
+
+def messages_per_second(
+        codec: Codec,
+        message: dict,
+        rounds: int
+) -> tuple[float, float, int]:
+    """
+    Measures how many messages a single core can encode, and decode, per second.
+
+    Args:
+        codec (Codec): Codec.
+        message (dict): Message.
+        rounds (int): Number of messages to encode and decode.
+
+    Returns:
+        tuple[float, float, int]: Encoded messages per second, decoded messages per second, and the encoded size in bytes.
+    """
+    started: float = perf_counter()
+    for _ in range(rounds):
+        frame: bytes = codec.encode(message)
+    encoded: float = rounds / (perf_counter() - started)
+
+    # Text codecs receive text frames
+    payload: str | bytes = frame if codec.binary else frame.decode()
+
+    started = perf_counter()
+    for _ in range(rounds):
+        codec.decode(payload)
+    decoded: float = rounds / (perf_counter() - started)
+
+    return encoded, decoded, len(frame)
+
+
+def main() -> None:
+    """
+    Run the benchmark and print the results.
+    """
+    parser: ArgumentParser = ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=20000, help="Messages per measurement.")
+    parser.add_argument("--page-size", type=int, default=50, help="Users in the listing message.")
+    arguments: Namespace = parser.parse_args()
+
+    messages: dict[str, dict] = {
+        "ping": {"action": "ping"},
+        "listing": {
+            "action": "users",
+            "data": [user.model_dump(mode="json") for user in build_users(arguments.page_size)],
+            "cursor": None,
+        },
+    }
+
+    codecs: list[Codec] = [JsonCodec(), OrjsonCodec()]
+    if msgpack is not None:
+        codecs.append(MsgPackCodec())
+
+    for name, message in messages.items():
+        print(f"{name}:")
+        rounds: int = arguments.rounds if name == "ping" else max(1, arguments.rounds // arguments.page_size)
+
+        for codec in codecs:
+            encoded, decoded, size = messages_per_second(codec, message, rounds)
+            print(f"  {type(codec).__name__:<12} encode {encoded:>12,.0f} msg/s  decode {decoded:>12,.0f} msg/s  {size:>6} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Benchmarks building public user models from profile rows, before and after moving to `from_row`, against the trusted
+`model_construct` path it was chosen over.
+
+Run from the repository root with `python -m tools.benchmarks.model_construction`.
+"""
+
+# Standard Library Imports
+from argparse import ArgumentParser, Namespace
+from datetime import datetime, timezone
+from time import perf_counter
+from typing import Callable
+from uuid import uuid4
+
+# Third Party Imports
+from pydantic import BaseModel
+
+# Local Imports
+from api.db.types.user import User
+from api.models.base import from_row
+from api.models.user import Status, StatusType, User as PublicUser
+
+# Constants
+__all__ = [
+    "keyword_user",
+    "constructed_user",
+    "row_user",
+    "models_per_second",
+    "main",
+]
+NOW: datetime = datetime.now(timezone.utc)
+ROW: dict = {
+    "id": uuid4(),
+    "created_at": NOW,
+    "email": "benchmark@example.com",
+    "username": "benchmark",
+    "icon": uuid4(),
+    "bio": "Benchmark bio",
+    "status": {"type": 1, "text": "Benchmarking"},
+    "last_online": NOW,
+    "is_online": True,
+    "is_banned": False,
+    "is_verified": True,
+}
+
+
+def keyword_user(
+        row: dict
+) -> PublicUser:
+    """
+    Build a user the way rows were built before the change, with a nested `Status` and keyword arguments.
+
+    Args:
+        row (dict): Profile row.
+
+    Returns:
+        PublicUser: User model.
+    """
+    return PublicUser(
+        id=row["id"],
+        created_at=row["created_at"],
+        email=row["email"],
+        username=row["username"],
+        icon=row["icon"],
+        bio=row["bio"],
+        status=Status(**row["status"]),
+        last_online=row["last_online"],
+        is_online=row["is_online"],
+        is_banned=row["is_banned"],
+        is_verified=row["is_verified"]
+    )
+
+
+def constructed_user(
+        row: dict
+) -> PublicUser:
+    """
+    Build a user without validation, with `model_construct` and the nested `Status` built explicitly.
+
+    Args:
+        row (dict): Profile row.
+
+    Returns:
+        PublicUser: User model.
+    """
+    status: dict = row["status"]
+
+    return PublicUser.model_construct(
+        **{
+            **row,
+            "status": Status.model_construct(type=StatusType(status["type"]), text=status["text"]),
+        }
+    )
+
+
+def row_user(
+        row: dict
+) -> PublicUser:
+    """
+    Build a user the way rows are built after the change.
+
+    Args:
+        row (dict): Profile row.
+
+    Returns:
+        PublicUser: User model.
+    """
+    return User.public_from_row(row)
+
+
+def models_per_second(
+        build: Callable[[dict], BaseModel],
+        row: dict,
+        rounds: int
+) -> float:
+    """
+    Measures how many models a single core can build per second.
+
+    Args:
+        build (Callable[[dict], BaseModel]): Model builder.
+        row (dict): Row to build from.
+        rounds (int): Number of models to build.
+
+    Returns:
+        float: Models per second.
+    """
+    started: float = perf_counter()
+    for _ in range(rounds):
+        build(row)
+
+    return rounds / (perf_counter() - started)
+
+
+def main() -> None:
+    """
+    Run the benchmark and print the results.
+    """
+    parser: ArgumentParser = ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=100000, help="Models per measurement.")
+    arguments: Namespace = parser.parse_args()
+
+    before: float = models_per_second(keyword_user, ROW, arguments.rounds)
+    constructed: float = models_per_second(constructed_user, ROW, arguments.rounds)
+    after: float = models_per_second(row_user, ROW, arguments.rounds)
+
+    print(f"before:          {before:,.0f} models/s/core")
+    print(f"model_construct: {constructed:,.0f} models/s/core")
+    print(f"after:           {after:,.0f} models/s/core")
+    print(f"speedup: {after / before:.2f}x over before, {after / constructed:.2f}x over model_construct")
+
+
+if __name__ == "__main__":
+    main()
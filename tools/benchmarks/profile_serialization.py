@@ -0,0 +1,151 @@
+"""
+Benchmarks encoding user listings, before and after serving them from cached serialized profiles.
+
+Run from the repository root with `python -m tools.benchmarks.profile_serialization`.
+"""
+
+# Standard Library Imports
+from argparse import ArgumentParser, Namespace
+from datetime import datetime, timezone
+from json import dumps
+from time import perf_counter
+from typing import Callable
+from uuid import uuid4
+
+# Third Party Imports
+
+# Local Imports
+from api.db.cache import FragmentCache
+from api.db.types.user import User
+from api.models.user import User as PublicUser
+from api.ws_workers.encoding import JsonCodec, json_array
+
+# Constants
+__all__ = [
+    "dumped_listing",
+    "spliced_listing",
+    "listings_per_second",
+    "main",
+]
+
+
+def build_users(
+        count: int
+) -> list[PublicUser]:
+    """
+    Build public user models shaped like a listing page.
+
+    Args:
+        count (int): Number of users.
+
+    Returns:
+        list[PublicUser]: Users.
+    """
+    now: datetime = datetime.now(timezone.utc)
+
+    return [
+        User.public_from_row(
+            {
+                "id": uuid4(),
+                "created_at": now,
+                "email": f"user{index}@example.com",
+                "username": f"user{index}",
+                "icon": uuid4(),
+                "bio": "Benchmark bio",
+                "status": {"type": 1, "text": "Benchmarking"},
+                "last_online": now,
+                "is_online": True,
+                "is_banned": False,
+                "is_verified": True,
+            }
+        ) for index in range(count)
+    ]
+
+
+def dumped_listing(
+        users: list[PublicUser],
+        cache: FragmentCache
+) -> bytes:
+    """
+    Encode a listing the way it was sent before the change: dump every model, then encode the whole message.
+
+    Args:
+        users (list[PublicUser]): Users.
+        cache (FragmentCache): Unused.
+
+    Returns:
+        bytes: Message.
+    """
+    return dumps(
+        {"action": "users", "data": [user.model_dump(mode="json") for user in users], "cursor": None},
+        separators=(",", ":"),
+        ensure_ascii=False
+    ).encode()
+
+
+def spliced_listing(
+        users: list[PublicUser],
+        cache: FragmentCache
+) -> bytes:
+    """
+    Encode a listing the way it is sent after the change: concatenate the cached fragments.
+
+    Args:
+        users (list[PublicUser]): Users.
+        cache (FragmentCache): Fragment cache.
+
+    Returns:
+        bytes: Message.
+    """
+    return JsonCodec().encode_message(
+        {"action": "users", "cursor": None},
+        data=json_array(cache.fragment(user) for user in users)
+    )
+
+
+def listings_per_second(
+        encode: Callable[[list[PublicUser], FragmentCache], bytes],
+        users: list[PublicUser],
+        rounds: int
+) -> tuple[float, int]:
+    """
+    Measures how many listings a single core can encode per second when the same profiles are read over and over.
+
+    Args:
+        encode (Callable[[list[PublicUser], FragmentCache], bytes]): Listing encoder.
+        users (list[PublicUser]): Users on the page.
+        rounds (int): Number of listings to encode.
+
+    Returns:
+        tuple[float, int]: Listings per second, and the number of profile serializations done by the cache.
+    """
+    cache: FragmentCache = FragmentCache(len(users), 60)
+
+    started: float = perf_counter()
+    for _ in range(rounds):
+        encode(users, cache)
+
+    return rounds / (perf_counter() - started), cache.serializations
+
+
+def main() -> None:
+    """
+    Run the benchmark and print the results.
+    """
+    parser: ArgumentParser = ArgumentParser(description=__doc__)
+    parser.add_argument("--page-size", type=int, default=50, help="Users per listing.")
+    parser.add_argument("--rounds", type=int, default=2000, help="Listings per measurement.")
+    arguments: Namespace = parser.parse_args()
+
+    users: list[PublicUser] = build_users(arguments.page_size)
+
+    before, _ = listings_per_second(dumped_listing, users, arguments.rounds)
+    after, serializations = listings_per_second(spliced_listing, users, arguments.rounds)
+
+    print(f"before: {before:,.0f} listings/s/core ({arguments.page_size * arguments.rounds} profile serializations)")
+    print(f"after:  {after:,.0f} listings/s/core ({serializations} profile serializations)")
+    print(f"speedup: {after / before:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmarks the password hashing cost of a registration, before and after removing the double hash.
+
+Run from the repository root with `python -m tools.benchmarks.registration`.
+"""
+
+# Standard Library Imports
+from argparse import ArgumentParser, Namespace
+from time import perf_counter
+from typing import Callable
+
+# Third Party Imports
+
+# Local Imports
+from api.security.scheme import crypt_context
+
+# Constants
+__all__ = [
+    "double_hash_registration",
+    "single_hash_registration",
+    "registrations_per_second",
+    "main",
+]
+PASSWORD: str = "Benchmark.Password.12"
+
+
+def double_hash_registration(
+        password: str
+) -> str:
+    """
+    Hashing done by a registration before the fix: `UsersHandler.new` hashed and `set_password` hashed the hash again.
+
+    Args:
+        password (str): Password.
+
+    Returns:
+        str: Stored hash.
+    """
+    return crypt_context.hash(crypt_context.hash(password))
+
+
+def single_hash_registration(
+        password: str
+) -> str:
+    """
+    Hashing done by a registration after the fix.
+
+    Args:
+        password (str): Password.
+
+    Returns:
+        str: Stored hash.
+    """
+    return crypt_context.hash(password)
+
+
+def registrations_per_second(
+        registration: Callable[[str], str],
+        rounds: int
+) -> float:
+    """
+    Measures how many registrations a single core can hash per second.
+
+    Args:
+        registration (Callable[[str], str]): Registration hashing function.
+        rounds (int): Number of registrations to run.
+
+    Returns:
+        float: Registrations per second.
+    """
+    started: float = perf_counter()
+    for _ in range(rounds):
+        registration(PASSWORD)
+
+    return rounds / (perf_counter() - started)
+
+
+def main() -> None:
+    """
+    Run the benchmark and print the results.
+    """
+    parser: ArgumentParser = ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=20, help="Registrations per measurement.")
+    arguments: Namespace = parser.parse_args()
+
+    before: float = registrations_per_second(double_hash_registration, arguments.rounds)
+    after: float = registrations_per_second(single_hash_registration, arguments.rounds)
+
+    print(f"before: {before:.2f} registrations/s/core")
+    print(f"after:  {after:.2f} registrations/s/core")
+    print(f"speedup: {after / before:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
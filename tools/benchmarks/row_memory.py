@@ -0,0 +1,101 @@
+"""
+Benchmarks the memory held by the row objects of a large user listing, before and after moving them to `__slots__`.
+
+Run from the repository root with `python -m tools.benchmarks.row_memory`.
+"""
+
+# Standard Library Imports
+from argparse import ArgumentParser, Namespace
+from datetime import datetime, timezone
+from gc import collect
+from tracemalloc import get_traced_memory, start, stop
+from typing import Callable
+from uuid import UUID, uuid4
+
+# Third Party Imports
+from psycopg.sql import Identifier
+
+# Local Imports
+from api.db.types.user import User
+
+# Constants
+__all__ = [
+    "LegacyUser",
+    "bytes_per_user",
+    "main",
+]
+
+
+class LegacyUser:
+    """
+    Layout of a user row object before the change: a per-instance `__dict__` holding the connection, the row fields and an
+    `Identifier` built in `__init__`.
+    """
+
+    def __init__(
+            self,
+            connection: None,
+            row: dict
+    ) -> None:
+        """
+        Initialize LegacyUser.
+
+        Args:
+            connection (None): Connection (unused by the benchmark).
+            row (dict): Row.
+        """
+        self.connection = connection
+        self.id: UUID = row["id"]
+        self.created_at: datetime = row["created_at"]
+        self._table_name: Identifier = Identifier("users")
+
+
+def bytes_per_user(
+        factory: Callable[[None, dict], object],
+        rows: list[dict]
+) -> float:
+    """
+    Measures the memory allocated per row object when a listing is materialized. The rows themselves are allocated beforehand,
+    so only the row objects are counted.
+
+    Args:
+        factory (Callable[[None, dict], object]): Row object class.
+        rows (list[dict]): Rows to materialize.
+
+    Returns:
+        float: Bytes allocated per row object.
+    """
+    collect()
+    start()
+    try:
+        before: int = get_traced_memory()[0]
+        objects: list[object] = [factory(None, row) for row in rows]
+        after: int = get_traced_memory()[0]
+    finally:
+        stop()
+
+    # Do not count the list holding the objects
+    return (after - before - objects.__sizeof__()) / len(rows)
+
+
+def main() -> None:
+    """
+    Run the benchmark and print the results.
+    """
+    parser: ArgumentParser = ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100000, help="Users in the listing.")
+    arguments: Namespace = parser.parse_args()
+
+    now: datetime = datetime.now(timezone.utc)
+    rows: list[dict] = [{"id": uuid4(), "created_at": now} for _ in range(arguments.rows)]
+
+    before: float = bytes_per_user(LegacyUser, rows)
+    after: float = bytes_per_user(User, rows)
+
+    print(f"before: {before:.1f} bytes/user ({before * arguments.rows / 2 ** 20:.1f} MiB for {arguments.rows} users)")
+    print(f"after:  {after:.1f} bytes/user ({after * arguments.rows / 2 ** 20:.1f} MiB for {arguments.rows} users)")
+    print(f"saving: {1 - after / before:.0%}")
+
+
+if __name__ == "__main__":
+    main()